@@ -0,0 +1,339 @@
+"""Reference small-file bundling for `session_archiver` (`bundle_small_files`).
+
+On SMB shares every file costs several round trips (create, write, close, set times),
+so archiving thousands of metadata, notes and stimulus-log files is dominated by
+latency, not bytes. With `bundle_small_files` the archiver:
+
+- streams files of at least `bundle_threshold_kb` straight to `network_dir`, as before;
+- packs smaller files, in path order, into sequential uncompressed tar bundles of up to
+  `bundle_target_mb` each (`<bundle_dir>/bundle_00000.tar`, written as `.partial` and
+  renamed when complete), so N small files cost one remote file per bundle;
+- records a `bundles` index in the manifest: each bundle's name, size, sha256 and
+  members, plus `direct` for the files copied as-is. A resumed or repeated run merges
+  its bundles into the existing index (`merge_bundle_index`), so `unbundle()` restores
+  the whole tree.
+
+With a destination index (`archive_index.ArchiveIndex`), already-archived files are
+skipped and new bundles are numbered after the existing ones.
+
+The destination is opened through `open_dest(path)` so the benchmark can substitute a
+simulated high-latency filesystem (`bench_archive_bundling.py`).
+
+This module is dependency-free (stdlib only).
+
+Run from repo root:
+    python ./tooling/archive_bundler.py plan <session_dir> --threshold-kb 256
+    python ./tooling/archive_bundler.py archive <session_dir> <dest_dir> --manifest <dest_dir>/archive_manifest.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tarfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+from archive_index import ArchiveIndex, scan_source
+from archive_patterns import PatternMatcher
+
+
+DEFAULT_THRESHOLD_KB = 256
+DEFAULT_TARGET_MB = 512
+DEFAULT_BUNDLE_DIR = "_bundles"
+DEFAULT_CHECKPOINT_EVERY = 500
+COPY_CHUNK_BYTES = 4 * 1024 * 1024
+
+OpenDest = Callable[[Path], BinaryIO]
+
+
+def _open_local(path: Path) -> BinaryIO:
+    return path.open("wb")
+
+
+@dataclass
+class BundlePlan:
+    direct: list[str] = field(default_factory=list)
+    bundles: list[list[str]] = field(default_factory=list)
+    sizes: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def remote_files(self) -> int:
+        return len(self.direct) + len(self.bundles)
+
+
+def plan_bundles(files: list[tuple[str, int]], *, threshold_bytes: int, target_bytes: int) -> BundlePlan:
+    """Split (rel_path, size) pairs into direct copies and sequential bundles."""
+
+    plan = BundlePlan(sizes=dict(files))
+    current: list[str] = []
+    current_bytes = 0
+    for rel, size in sorted(files):
+        if size >= threshold_bytes:
+            plan.direct.append(rel)
+            continue
+        # 512-byte header + data padded to 512 bytes per tar member.
+        member_bytes = 512 + (size + 511) // 512 * 512
+        if current and current_bytes + member_bytes > target_bytes:
+            plan.bundles.append(current)
+            current, current_bytes = [], 0
+        current.append(rel)
+        current_bytes += member_bytes
+    if current:
+        plan.bundles.append(current)
+    return plan
+
+
+class _HashingWriter:
+    """Write-through file wrapper that hashes and counts what tarfile writes."""
+
+    def __init__(self, raw: BinaryIO) -> None:
+        self.raw = raw
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        self.size += len(data)
+        return self.raw.write(data)
+
+    def tell(self) -> int:
+        return self.size
+
+
+class _HashingReader:
+    """Read-through file wrapper that hashes what tarfile reads from a member."""
+
+    def __init__(self, raw: BinaryIO, algo: str) -> None:
+        self.raw = raw
+        self.digest = hashlib.new(algo)
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.digest.update(data)
+        return data
+
+
+def write_bundle(
+    session_dir: Path,
+    members: list[str],
+    out_path: Path,
+    *,
+    open_dest: OpenDest = _open_local,
+    hash_algo: str | None = None,
+) -> dict[str, Any]:
+    """Write one tar bundle; with hash_algo, also returns each member's digest."""
+
+    partial = out_path.with_name(out_path.name + ".partial")
+    digests: dict[str, str] = {}
+    with open_dest(partial) as raw:
+        writer = _HashingWriter(raw)
+        with tarfile.open(fileobj=writer, mode="w", format=tarfile.PAX_FORMAT) as tar:  # type: ignore[arg-type]
+            for rel in members:
+                src = session_dir / rel
+                info = tar.gettarinfo(src, arcname=rel)
+                with src.open("rb") as f:
+                    reader = _HashingReader(f, hash_algo) if hash_algo else f
+                    tar.addfile(info, reader)  # type: ignore[arg-type]
+                if hash_algo:
+                    digests[rel] = reader.digest.hexdigest()  # type: ignore[union-attr]
+    os.replace(partial, out_path)
+    bundle: dict[str, Any] = {"name": out_path.name, "size": writer.size, "sha256": writer.digest.hexdigest(), "members": members}
+    if hash_algo:
+        bundle["digests"] = digests
+    return bundle
+
+
+def copy_direct(src: Path, dest: Path, *, open_dest: OpenDest = _open_local, hash_algo: str | None = None) -> str | None:
+    """Stream one file to dest; returns the source digest when hash_algo is given."""
+
+    digest = hashlib.new(hash_algo) if hash_algo else None
+    with src.open("rb") as fin, open_dest(dest) as fout:
+        for chunk in iter(lambda: fin.read(COPY_CHUNK_BYTES), b""):
+            if digest is not None:
+                digest.update(chunk)
+            fout.write(chunk)
+    shutil.copystat(src, dest)
+    return digest.hexdigest() if digest is not None else None
+
+
+def archive_session(
+    session_dir: Path,
+    dest_dir: Path,
+    *,
+    matcher: PatternMatcher | None = None,
+    bundle_small_files: bool = True,
+    threshold_bytes: int = DEFAULT_THRESHOLD_KB * 1024,
+    target_bytes: int = DEFAULT_TARGET_MB * 1024 * 1024,
+    bundle_dir: str = DEFAULT_BUNDLE_DIR,
+    open_dest: OpenDest = _open_local,
+    index: ArchiveIndex | None = None,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+) -> dict[str, Any]:
+    """Copy a session to dest_dir; returns the bundle index written into the manifest.
+
+    With a destination `index`, files it already records (same size and mtime) are
+    skipped, and every copy is recorded and checkpointed into it.
+    """
+
+    files = scan_source(session_dir, matcher)
+    skipped = 0
+    if index is not None:
+        pending = index.pending(files)
+        skipped, files = len(files) - len(pending), pending
+    stats = {rel: (size, mtime_ns) for rel, size, mtime_ns in files}
+    hash_algo = index.hash_algo if index is not None else None
+    plan = plan_bundles(
+        [(rel, size) for rel, size, _ in files],
+        threshold_bytes=threshold_bytes if bundle_small_files else 0,
+        target_bytes=target_bytes,
+    )
+
+    made_dirs: set[Path] = set()
+    for rel in plan.direct:
+        dest = dest_dir / rel
+        if dest.parent not in made_dirs:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            made_dirs.add(dest.parent)
+        digest = copy_direct(session_dir / rel, dest, open_dest=open_dest, hash_algo=hash_algo)
+        if index is not None:
+            index.record(rel, *stats[rel], digest)
+            index.checkpoint(checkpoint_every)
+
+    bundles: list[dict[str, Any]] = []
+    if plan.bundles:
+        (dest_dir / bundle_dir).mkdir(parents=True, exist_ok=True)
+        first = index.next_bundle_number() if index is not None else 0
+        for number, members in enumerate(plan.bundles, start=first):
+            out_path = dest_dir / bundle_dir / f"bundle_{number:05d}.tar"
+            bundle = write_bundle(session_dir, members, out_path, open_dest=open_dest, hash_algo=hash_algo)
+            bundles.append(bundle)
+            if index is not None:
+                index.record_bundle(bundle["name"], bundle["size"], bundle["sha256"])
+                for rel in members:
+                    index.record(rel, *stats[rel], bundle.get("digests", {}).get(rel), bundle["name"])
+                index.checkpoint(checkpoint_every)
+    if index is not None:
+        index.save()
+
+    return {
+        "bundle_dir": bundle_dir,
+        "threshold_bytes": threshold_bytes,
+        "skipped": skipped,
+        "direct": plan.direct,
+        "bundles": bundles,
+    }
+
+
+def merge_bundle_index(previous: dict[str, Any] | None, current: dict[str, Any]) -> dict[str, Any]:
+    """Combine the bundle index of earlier runs with this run's.
+
+    A resumed or repeated run only reports what it copied, so earlier bundles and direct
+    files are kept. A file copied again now is dropped from the older entries, which
+    keeps `unbundle()` from restoring a stale version over it.
+    """
+
+    if not isinstance(previous, dict) or previous.get("bundle_dir", current["bundle_dir"]) != current["bundle_dir"]:
+        return current
+    recopied = set(current["direct"]) | {rel for bundle in current["bundles"] for rel in bundle["members"]}
+    current_names = {bundle["name"] for bundle in current["bundles"]}
+    bundles: list[dict[str, Any]] = []
+    for bundle in previous.get("bundles") or []:
+        if bundle["name"] in current_names:
+            continue
+        members = [rel for rel in bundle["members"] if rel not in recopied]
+        kept = {**bundle, "members": members}
+        if "digests" in bundle:
+            kept["digests"] = {rel: digest for rel, digest in bundle["digests"].items() if rel not in recopied}
+        bundles.append(kept)
+    direct = sorted({rel for rel in previous.get("direct") or [] if rel not in recopied} | set(current["direct"]))
+    return {**current, "direct": direct, "bundles": bundles + current["bundles"]}
+
+
+def write_manifest(manifest_path: Path, index: dict[str, Any]) -> None:
+    """Merge the bundle index into a JSON manifest under the `bundles` key."""
+
+    manifest: dict[str, Any] = {}
+    if manifest_path.exists():
+        loaded = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest = loaded if isinstance(loaded, dict) else {"files": loaded}
+    manifest["bundles"] = merge_bundle_index(manifest.get("bundles"), index)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = manifest_path.with_suffix(manifest_path.suffix + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, manifest_path)
+
+
+def unbundle(dest_dir: Path, index: dict[str, Any], out_dir: Path | None = None) -> int:
+    """Extract every bundle (checking its sha256) back into the session layout; returns member count."""
+
+    out_dir = out_dir or dest_dir
+    count = 0
+    for bundle in index.get("bundles") or []:
+        path = dest_dir / index.get("bundle_dir", DEFAULT_BUNDLE_DIR) / bundle["name"]
+        digest = hashlib.sha256()
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(COPY_CHUNK_BYTES), b""):
+                digest.update(chunk)
+        if digest.hexdigest() != bundle["sha256"]:
+            raise RuntimeError(f"{path}: sha256 mismatch")
+        with tarfile.open(path, mode="r") as tar:
+            expected = set(bundle["members"])
+            members = [m for m in tar.getmembers() if m.name in expected and m.isfile()]
+            tar.extractall(out_dir, members=members, filter="data")
+            count += len(members)
+    return count
+
+
+def _cmd_plan(args: argparse.Namespace) -> int:
+    session_dir = Path(args.session_dir)
+    files = [(rel, size) for rel, size, _ in scan_source(session_dir)]
+    plan = plan_bundles(files, threshold_bytes=args.threshold_kb * 1024, target_bytes=args.target_mb * 1024 * 1024)
+    bundled = sum(len(members) for members in plan.bundles)
+    print(f"{len(files):,} files -> {len(plan.direct):,} direct + {bundled:,} in {len(plan.bundles)} bundle(s)")
+    print(f"remote files: {len(files):,} -> {plan.remote_files:,}")
+    return 0
+
+
+def _cmd_archive(args: argparse.Namespace) -> int:
+    index = archive_session(
+        Path(args.session_dir),
+        Path(args.dest_dir),
+        threshold_bytes=args.threshold_kb * 1024,
+        target_bytes=args.target_mb * 1024 * 1024,
+    )
+    if args.manifest:
+        write_manifest(Path(args.manifest), index)
+    bundled = sum(len(b["members"]) for b in index["bundles"])
+    print(f"{len(index['direct']):,} direct, {bundled:,} bundled into {len(index['bundles'])} bundle(s)")
+    return 0
+
+
+def main(argv=None) -> int:
+    sizes = argparse.ArgumentParser(add_help=False)
+    sizes.add_argument("--threshold-kb", type=int, default=DEFAULT_THRESHOLD_KB, help="Bundle files smaller than this")
+    sizes.add_argument("--target-mb", type=int, default=DEFAULT_TARGET_MB, help="Target size per bundle")
+
+    parser = argparse.ArgumentParser(description="Plan or run small-file bundling for session archiving")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    plan = sub.add_parser("plan", parents=[sizes], help="Show how a session would be split into direct files and bundles")
+    plan.add_argument("session_dir")
+    plan.set_defaults(func=_cmd_plan)
+
+    archive = sub.add_parser("archive", parents=[sizes], help="Copy a session, bundling small files")
+    archive.add_argument("session_dir")
+    archive.add_argument("dest_dir")
+    archive.add_argument("--manifest", type=str, default=None, help="JSON manifest to record the bundle index in")
+    archive.set_defaults(func=_cmd_archive)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,255 @@
+"""Destination-side archive index for `session_archiver` (`skip_completed`).
+
+Instead of stat-ing (or checksumming) every file on `network_dir` to decide what a
+resumed or repeated archive still has to copy, the archiver can keep one index file
+next to the archive. This is opt-in (`destination_index`, conventionally
+`.archive_index.json` in `network_dir`):
+
+    {"index_version": 1, "hash_algo": "sha256", "updated_at": "...",
+     "files":   {"<rel path>": {"size": ..., "mtime_ns": ..., "digest": ..., "location": "direct" | "<bundle>"}},
+     "bundles": {"bundle_00000.tar": {"size": ..., "sha256": ...}}}
+
+A source file is complete when the index has the same size and mtime for it, so what
+is left to copy is one remote read plus local stats. The index is rewritten atomically
+(temp file + rename in the same directory) after every `checkpoint_every` copies and at
+the end of a run, so an interrupted archive resumes from its last checkpoint and a
+reader never sees a half-written index.
+
+The index is trusted, not re-checked. `reconcile` walks `network_dir` once to repair
+it after files were removed or copied by other means. It drops entries whose file or
+bundle is missing or has a different size, and adds untracked files.
+
+This module is dependency-free (stdlib only).
+
+Run from repo root:
+    python ./tooling/archive_index.py pending <session_dir> <network_dir>
+    python ./tooling/archive_index.py reconcile <network_dir>
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple
+
+from archive_patterns import PatternMatcher
+
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_NAME = ".archive_index.json"
+DIRECT = "direct"
+HASH_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+class IndexEntry(NamedTuple):
+    size: int
+    mtime_ns: int
+    digest: str | None
+    location: str
+
+
+class ArchiveIndex:
+    def __init__(self, path: Path, *, hash_algo: str | None = None) -> None:
+        self.path = path
+        self.hash_algo = hash_algo
+        self.files: dict[str, IndexEntry] = {}
+        self.bundles: dict[str, dict[str, Any]] = {}
+        self.problem: str | None = None
+        self._dirty = 0
+
+    @classmethod
+    def load(cls, path: Path, *, hash_algo: str | None = None) -> "ArchiveIndex":
+        """Read the index (one remote read); a missing or unreadable index starts empty."""
+
+        index = cls(path, hash_algo=hash_algo)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return index
+        except (OSError, ValueError) as exc:
+            index.problem = f"{path}: unreadable index ({exc}); starting empty"
+            return index
+        if not isinstance(data, dict) or data.get("index_version") != INDEX_VERSION:
+            index.problem = f"{path}: unsupported index_version; starting empty"
+            return index
+        stored_algo = data.get("hash_algo")
+        index.hash_algo = hash_algo or stored_algo
+        keep_digests = stored_algo == index.hash_algo
+        for rel, entry in (data.get("files") or {}).items():
+            index.files[rel] = IndexEntry(
+                size=int(entry["size"]),
+                mtime_ns=int(entry["mtime_ns"]),
+                digest=entry.get("digest") if keep_digests else None,
+                location=entry.get("location") or DIRECT,
+            )
+        index.bundles = dict(data.get("bundles") or {})
+        return index
+
+    def is_current(self, rel: str, size: int, mtime_ns: int) -> bool:
+        entry = self.files.get(rel)
+        return entry is not None and entry.size == size and entry.mtime_ns == mtime_ns
+
+    def pending(self, files: Iterable[tuple[str, int, int]]) -> list[tuple[str, int, int]]:
+        """The (rel, size, mtime_ns) source files the index does not already cover."""
+
+        return [f for f in files if not self.is_current(*f)]
+
+    def record(self, rel: str, size: int, mtime_ns: int, digest: str | None, location: str = DIRECT) -> None:
+        self.files[rel] = IndexEntry(size, mtime_ns, digest, location)
+        self._dirty += 1
+
+    def record_bundle(self, name: str, size: int, sha256: str) -> None:
+        self.bundles[name] = {"size": size, "sha256": sha256}
+
+    def next_bundle_number(self) -> int:
+        numbers = [int(name.split("_")[-1].split(".")[0]) for name in self.bundles if name.split("_")[-1].split(".")[0].isdigit()]
+        return max(numbers) + 1 if numbers else 0
+
+    def checkpoint(self, every: int) -> None:
+        if self._dirty >= every:
+            self.save()
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "index_version": INDEX_VERSION,
+            "hash_algo": self.hash_algo,
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "files": {rel: entry._asdict() for rel, entry in sorted(self.files.items())},
+            "bundles": dict(sorted(self.bundles.items())),
+        }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(self.to_json(), separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = 0
+
+
+def index_path_for(network_dir: Path, destination_index: str | None = DEFAULT_INDEX_NAME) -> Path | None:
+    if not destination_index:
+        return None
+    path = Path(destination_index)
+    return path if path.is_absolute() else network_dir / path
+
+
+def scan_source(session_dir: Path, matcher: PatternMatcher | None = None) -> list[tuple[str, int, int]]:
+    """(rel, size, mtime_ns) for every file the archiver would consider; local stats only."""
+
+    matcher = matcher or PatternMatcher()
+    files: list[tuple[str, int, int]] = []
+    for rel in matcher.walk(session_dir):
+        st = (session_dir / rel).stat()
+        files.append((rel, st.st_size, st.st_mtime_ns))
+    return files
+
+
+def _file_digest(path: Path, algo: str) -> str:
+    digest = hashlib.new(algo)
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def reconcile(index: ArchiveIndex, network_dir: Path, *, bundle_dir: str, digest: bool = False) -> dict[str, int]:
+    """Repair the index against the files actually in network_dir (one full remote walk)."""
+
+    present: dict[str, os.stat_result] = {}
+    for root, _, names in os.walk(network_dir):
+        for name in names:
+            path = Path(root) / name
+            rel = path.relative_to(network_dir).as_posix()
+            if name.endswith((".tmp", ".partial")) or path == index.path:
+                continue
+            present[rel] = path.stat()
+
+    stats = {"dropped": 0, "added": 0, "bundles_dropped": 0, "bundles_added": 0}
+    for name in list(index.bundles):
+        st = present.get(f"{bundle_dir}/{name}")
+        if st is None or st.st_size != index.bundles[name].get("size"):
+            del index.bundles[name]
+            stats["bundles_dropped"] += 1
+    for rel, st in present.items():
+        name = rel[len(bundle_dir) + 1 :] if rel.startswith(f"{bundle_dir}/") else None
+        if name is not None and name not in index.bundles:
+            index.record_bundle(name, st.st_size, _file_digest(network_dir / rel, "sha256"))
+            stats["bundles_added"] += 1
+
+    for rel, entry in list(index.files.items()):
+        if entry.location == DIRECT:
+            st = present.get(rel)
+            ok = st is not None and st.st_size == entry.size
+        else:
+            ok = entry.location in index.bundles
+        if not ok:
+            del index.files[rel]
+            stats["dropped"] += 1
+    for rel, st in present.items():
+        if rel.startswith(f"{bundle_dir}/") or rel in index.files:
+            continue
+        algo = index.hash_algo or "sha256"
+        index.record(rel, st.st_size, st.st_mtime_ns, _file_digest(network_dir / rel, algo) if digest else None)
+        stats["added"] += 1
+    return stats
+
+
+def _cmd_pending(args: argparse.Namespace) -> int:
+    network_dir = Path(args.network_dir)
+    index = ArchiveIndex.load(index_path_for(network_dir, args.index) or network_dir / DEFAULT_INDEX_NAME)
+    if index.problem:
+        print(f"WARN {index.problem}")
+    files = scan_source(Path(args.session_dir))
+    pending = index.pending(files)
+    size = sum(f[1] for f in pending)
+    print(f"{len(files) - len(pending):,} of {len(files):,} file(s) already archived; {len(pending):,} pending ({size / 1024 / 1024:,.1f} MiB)")
+    for rel, _, _ in pending[: args.limit]:
+        print(f"  {rel}")
+    return 0
+
+
+def _cmd_reconcile(args: argparse.Namespace) -> int:
+    network_dir = Path(args.network_dir)
+    index = ArchiveIndex.load(index_path_for(network_dir, args.index) or network_dir / DEFAULT_INDEX_NAME)
+    if index.problem:
+        print(f"WARN {index.problem}")
+    stats = reconcile(index, network_dir, bundle_dir=args.bundle_dir, digest=args.digest)
+    if not args.dry_run:
+        index.save()
+    print(
+        f"{len(index.files):,} file(s), {len(index.bundles)} bundle(s) indexed; "
+        f"dropped {stats['dropped']}, added {stats['added']}, "
+        f"bundles dropped {stats['bundles_dropped']}, added {stats['bundles_added']}"
+        + (" (dry run)" if args.dry_run else "")
+    )
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect and reconcile the destination-side archive index")
+    parser.add_argument("--index", type=str, default=DEFAULT_INDEX_NAME, help="Index path, relative to network_dir")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pending = sub.add_parser("pending", help="List source files the index does not cover yet")
+    pending.add_argument("session_dir")
+    pending.add_argument("network_dir")
+    pending.add_argument("--limit", type=int, default=20)
+    pending.set_defaults(func=_cmd_pending)
+
+    rec = sub.add_parser("reconcile", help="Repair the index from a walk of network_dir")
+    rec.add_argument("network_dir")
+    rec.add_argument("--bundle-dir", type=str, default="_bundles")
+    rec.add_argument("--digest", action="store_true", help="Hash files added to the index")
+    rec.add_argument("--dry-run", action="store_true")
+    rec.set_defaults(func=_cmd_reconcile)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,228 @@
+"""Include/exclude pattern contract and reference matcher for `session_archiver`.
+
+`include_patterns` / `exclude_patterns` are globs (a string or a list) matched against
+each file's path relative to `session_dir`:
+
+- Paths and patterns use `/` as the separator; `\\` in a pattern is read as `/`
+  (there is no escape character, use `[*]` to match a literal `*`).
+- A pattern without a `/` matches the file name at any depth (`*.tif`). A pattern with
+  a `/` is anchored at `session_dir` (`slap2/*.tif`); a leading `/` anchors explicitly.
+- `*` and `?` never cross a `/`; `[...]` is a character class (`[!...]` negates).
+- `**` must be a whole segment and matches zero or more directories (`**/ref/*.tif`);
+  a trailing `/` means everything below that directory (`tmp/` == `tmp/**`).
+- `pattern_case`: `sensitive`, `insensitive`, or `auto` (default), which folds case on
+  Windows, where archiving runs against NTFS/SMB paths, and is case-sensitive elsewhere.
+- A file is archived when it matches any include (no includes: every file) and no
+  exclude. Empty patterns, `..` segments, drive letters, a `**` mixed with other
+  characters and unclosed `[` are errors; `validate.py` reports them for every pack.
+
+`PatternMatcher` compiles all includes into one regex and all excludes into another, so
+a file costs two `fullmatch` calls however many patterns there are, and `walk()` skips
+directories an exclude covers entirely instead of listing them.
+
+This module is dependency-free (stdlib only); see `bench_archive_patterns.py`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from pack_entries import iter_pipeline_entries
+
+
+ARCHIVER_MODULE = "session_archiver"
+PATTERN_FIELDS = ("include_patterns", "exclude_patterns")
+PATTERN_CASES = ("auto", "sensitive", "insensitive")
+
+_DRIVE_RE = re.compile(r"^[A-Za-z]:")
+
+
+class PatternError(ValueError):
+    pass
+
+
+def _segment_regex(segment: str, pattern: str) -> str:
+    out: list[str] = []
+    i = 0
+    while i < len(segment):
+        c = segment[i]
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            negate = segment[i + 1 : i + 2] in ("!", "^")
+            start = i + 2 if negate else i + 1
+            # As in fnmatch, a `]` right after the opening bracket is a literal.
+            end = segment.find("]", start + 1)
+            if end == -1:
+                raise PatternError(f"{pattern!r}: unclosed '['")
+            body = segment[start:end]
+            body = body.replace("\\", "\\\\").replace("^", "\\^").replace("[", "\\[").replace("]", "\\]")
+            out.append(f"[^/{body}]" if negate else f"[{body}]")
+            i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _split(pattern: str) -> tuple[bool, list[str]]:
+    """(anchored, segments) for one pattern, enforcing the contract."""
+
+    if not isinstance(pattern, str) or not pattern.strip():
+        raise PatternError(f"{pattern!r}: pattern must be a non-empty string")
+    text = pattern.strip().replace("\\", "/")
+    if _DRIVE_RE.match(text):
+        raise PatternError(f"{pattern!r}: patterns are relative to session_dir, not absolute paths")
+    if text.endswith("/"):
+        text = text.rstrip("/") + "/**"
+    anchored = "/" in text.rstrip("/")
+    segments = text.lstrip("/").split("/")
+    for segment in segments:
+        if segment == "":
+            raise PatternError(f"{pattern!r}: empty path segment")
+        if segment in (".", ".."):
+            raise PatternError(f"{pattern!r}: '.' and '..' segments are not allowed")
+        if "**" in segment and segment != "**":
+            raise PatternError(f"{pattern!r}: '**' must be a whole path segment")
+    return anchored, segments
+
+
+def _segments_regex(anchored: bool, segments: list[str], pattern: str) -> str:
+    out = [] if anchored else ["(?:.*/)?"]
+    for i, segment in enumerate(segments):
+        last = i == len(segments) - 1
+        if segment == "**":
+            out.append(".*" if last else "(?:.*/)?")
+        else:
+            out.append(_segment_regex(segment, pattern) + ("" if last else "/"))
+    return "".join(out)
+
+
+def compile_pattern(pattern: str) -> str:
+    """Regex source for one pattern (to be used with fullmatch); raises PatternError."""
+
+    anchored, segments = _split(pattern)
+    source = _segments_regex(anchored, segments, pattern)
+    try:
+        re.compile(source)
+    except re.error as exc:
+        raise PatternError(f"{pattern!r}: {exc}") from None
+    return source
+
+
+def as_pattern_list(value: Any) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return list(value)
+    raise PatternError(f"expected a string or a list of strings, got {type(value).__name__}")
+
+
+def case_sensitive(pattern_case: str | None) -> bool:
+    if pattern_case in (None, "auto"):
+        return os.name != "nt"
+    if pattern_case not in PATTERN_CASES:
+        raise PatternError(f"pattern_case must be one of {list(PATTERN_CASES)}, got {pattern_case!r}")
+    return pattern_case == "sensitive"
+
+
+def _combine(sources: list[str], flags: int) -> re.Pattern[str] | None:
+    if not sources:
+        return None
+    return re.compile("|".join(f"(?:{source})" for source in dict.fromkeys(sources)), flags)
+
+
+class PatternMatcher:
+    def __init__(self, include: Any = None, exclude: Any = None, *, pattern_case: str | None = "auto") -> None:
+        flags = 0 if case_sensitive(pattern_case) else re.IGNORECASE
+        self.include = as_pattern_list(include)
+        self.exclude = as_pattern_list(exclude)
+        self._include_re = _combine([compile_pattern(p) for p in self.include], flags)
+        self._exclude_re = _combine([compile_pattern(p) for p in self.exclude], flags)
+        # Excludes ending in `**` cover whole directories; match their prefix against dirs.
+        prune: list[str] = []
+        for pattern in self.exclude:
+            anchored, segments = _split(pattern)
+            if segments[-1] == "**":
+                prefix = segments[:-1]
+                prune.append(_segments_regex(anchored, prefix, pattern) if prefix else ".*")
+        self._prune_re = _combine(prune, flags)
+
+    @classmethod
+    def from_params(cls, params: dict[str, Any]) -> "PatternMatcher":
+        return cls(params.get("include_patterns"), params.get("exclude_patterns"), pattern_case=params.get("pattern_case"))
+
+    def matches(self, rel_path: str) -> bool:
+        rel_path = rel_path.replace("\\", "/")
+        if self._include_re is not None and self._include_re.fullmatch(rel_path) is None:
+            return False
+        return self._exclude_re is None or self._exclude_re.fullmatch(rel_path) is None
+
+    def filter(self, rel_paths: Iterable[str]) -> list[str]:
+        return [path for path in rel_paths if self.matches(path)]
+
+    def prunes(self, rel_dir: str) -> bool:
+        """True when an exclude covers everything below `rel_dir`."""
+
+        return self._prune_re is not None and self._prune_re.fullmatch(rel_dir.replace("\\", "/")) is not None
+
+    def walk(self, session_dir: str | os.PathLike[str]) -> Iterator[str]:
+        """Relative paths of the files to archive under session_dir."""
+
+        stack = [("", os.fspath(session_dir))]
+        while stack:
+            prefix, directory = stack.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    rel = f"{prefix}{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        if not self.prunes(rel):
+                            stack.append((f"{rel}/", entry.path))
+                    elif self.matches(rel):
+                        yield rel
+
+
+def pattern_problems(params: dict[str, Any]) -> list[str]:
+    problems: list[str] = []
+    for field in PATTERN_FIELDS:
+        try:
+            patterns = as_pattern_list(params.get(field))
+        except PatternError as exc:
+            problems.append(f"{field}: {exc}")
+            continue
+        for pattern in patterns:
+            try:
+                compile_pattern(pattern)
+            except PatternError as exc:
+                problems.append(f"{field}: {exc}")
+    if params.get("pattern_case") is not None and params["pattern_case"] not in PATTERN_CASES:
+        problems.append(f"pattern_case must be one of {list(PATTERN_CASES)}, got {params['pattern_case']!r}")
+    return problems
+
+
+def check_archive_patterns(payload: dict[str, Any]) -> list[str]:
+    """Validation rules for session_archiver include/exclude patterns; returns a list of problems."""
+
+    problems: list[str] = []
+    for pipeline_name, idx, entry in iter_pipeline_entries(payload, module_path=ARCHIVER_MODULE):
+        params = entry.get("module_parameters")
+        if isinstance(params, dict):
+            problems.extend(f"{pipeline_name}[{idx}].module_parameters.{p}" for p in pattern_problems(params))
+    return problems
+
+
+def archiver_params(pack_path: Path) -> dict[str, Any]:
+    """module_parameters of a pack's session_archiver step (archive_queue enqueue, backup_store gc)."""
+
+    payload = json.loads(pack_path.read_text(encoding="utf-8"))
+    for _, _, entry in iter_pipeline_entries(payload, module_path=ARCHIVER_MODULE, pipelines=("post_acquisition_pipeline",)):
+        return dict(entry.get("module_parameters") or {})
+    raise ValueError(f"{pack_path}: no session_archiver step in post_acquisition_pipeline")
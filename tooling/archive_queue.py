@@ -0,0 +1,523 @@
+"""Queued archiving for `session_archiver` (`archive_mode: "queued"`).
+
+With `archive_mode: "queued"` the post-acquisition step only writes a job file
+(`model_archive_job.schema.json`) into `archive_queue_dir` and returns, so the rig can
+start the next session while a separate worker copies the previous one:
+
+    <archive_queue_dir>/queued/<job_id>.json
+                        running/<job_id>.json
+                        done/<job_id>.json
+                        failed/<job_id>.json
+
+A job's state is the directory holding it. Workers claim a job by renaming it from
+`queued/` to `running/` (atomic, so two workers never run the same job), lowest
+`priority` first and oldest first within a priority. A failed attempt is re-queued with
+exponential backoff (`next_attempt_at`) until `max_retries` is used up, then moved to
+`failed/`; `retry` puts it back. Running jobs refresh `heartbeat_at`; a job whose worker
+died is re-queued once its heartbeat (or, right after the claim, the file's mtime) is
+older than `--stale-after-s`, and moved to `failed/` if that used up its attempts. The
+heartbeat only rewrites the job while it is still in `running/`, so it never resurrects
+a job another worker has moved.
+
+The worker copies with `archive_bundler.archive_session` (include/exclude patterns and
+small-file bundling from the job's parameters) and skips files the destination index
+(`archive_index.py`) already records, throttled to `archive_max_mb_per_s` so
+archiving does not starve acquisition disk and network I/O. With `backup_dir` the
+session is also copied there (unthrottled, local), files whose size and mtime already
+match are skipped; with `backup_dedup` the backup goes through the content-addressed
+store (`backup_store.py`) instead.
+
+This module is dependency-free (stdlib only).
+
+Run from repo root:
+    python ./tooling/archive_queue.py enqueue --pack ./packs/projects/scbc/imaging/matlab_slave_archiver.json --var output_session_folder=D:/session --var subject_id=123456 --var session_uuid=abc
+    python ./tooling/archive_queue.py worker --queue-dir C:/ArchiveQueue
+    python ./tooling/archive_queue.py status --queue-dir C:/ArchiveQueue
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+from archive_patterns import ARCHIVER_MODULE, PatternMatcher, archiver_params
+from pack_entries import iter_pipeline_entries
+
+
+JOB_VERSION = 1
+STATES = ("queued", "running", "done", "failed")
+DEFAULT_PRIORITY = 100
+DEFAULT_POLL_S = 10.0
+DEFAULT_STALE_AFTER_S = 600.0
+HEARTBEAT_S = 30.0
+RETRY_BASE_S = 60.0
+
+PLACEHOLDER_RE = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _iso(value: datetime) -> str:
+    return value.isoformat(timespec="seconds")
+
+
+def _parse_iso(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def check_archive_queue(payload: dict[str, Any]) -> list[str]:
+    """Validation rules for queued session_archiver entries; returns a list of problems."""
+
+    problems: list[str] = []
+    for pipeline_name, idx, entry in iter_pipeline_entries(payload, module_path=ARCHIVER_MODULE):
+        params = entry.get("module_parameters")
+        if isinstance(params, dict) and params.get("archive_mode") == "queued" and not params.get("archive_queue_dir"):
+            problems.append(f"{pipeline_name}[{idx}].module_parameters: archive_mode 'queued' requires archive_queue_dir")
+    return problems
+
+
+# -- spool ---------------------------------------------------------------------
+
+
+def _job_path(queue_dir: Path, state: str, job_id: str) -> Path:
+    return queue_dir / state / f"{job_id}.json"
+
+
+def _write_job(path: Path, job: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(job, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_job(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _move(queue_dir: Path, job: dict[str, Any], to_state: str) -> Path:
+    src = _job_path(queue_dir, job["state"], job["job_id"])
+    dest = _job_path(queue_dir, to_state, job["job_id"])
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(src, dest)
+    job["state"] = to_state
+    _write_job(dest, job)
+    return dest
+
+
+def list_jobs(queue_dir: Path, states: tuple[str, ...] = STATES) -> list[dict[str, Any]]:
+    jobs: list[dict[str, Any]] = []
+    for state in states:
+        for path in sorted((queue_dir / state).glob("*.json")):
+            try:
+                jobs.append(_read_job(path))
+            except (OSError, ValueError):
+                # Being renamed or rewritten by a worker right now.
+                continue
+    return jobs
+
+
+def enqueue(
+    module_parameters: dict[str, Any],
+    *,
+    queue_dir: Path | None = None,
+    pack: str | None = None,
+    priority: int | None = None,
+) -> Path:
+    """Write a queued job for resolved session_archiver parameters; returns the job file."""
+
+    queue_dir = Path(queue_dir or module_parameters.get("archive_queue_dir") or "")
+    if not str(queue_dir) or str(queue_dir) == ".":
+        raise ValueError("archive_queue_dir is required to enqueue an archive job")
+    created = _now()
+    job_id = f"{created.strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}"
+    job = {
+        "job_version": JOB_VERSION,
+        "job_id": job_id,
+        "created_at": _iso(created),
+        "pack": pack,
+        "priority": int(priority if priority is not None else module_parameters.get("archive_priority", DEFAULT_PRIORITY)),
+        "state": "queued",
+        "attempts": 0,
+        "max_retries": int(module_parameters.get("max_retries", 3)),
+        "module_parameters": module_parameters,
+    }
+    path = _job_path(queue_dir, "queued", job_id)
+    _write_job(path, job)
+    return path
+
+
+def claim_next(queue_dir: Path, worker: str) -> dict[str, Any] | None:
+    """Move the next due queued job to running/ and return it (None when nothing is due)."""
+
+    now = _now()
+    due = [
+        job
+        for job in list_jobs(queue_dir, ("queued",))
+        if (_parse_iso(job.get("next_attempt_at")) or now) <= now
+    ]
+    (queue_dir / "running").mkdir(parents=True, exist_ok=True)
+    for job in sorted(due, key=lambda j: (j.get("priority", DEFAULT_PRIORITY), j["created_at"], j["job_id"])):
+        queued = _job_path(queue_dir, "queued", job["job_id"])
+        try:
+            # Touch before the rename so requeue_stale sees a fresh claim until the
+            # heartbeat is written (utime never re-creates a job already claimed).
+            os.utime(queued)
+            os.replace(queued, _job_path(queue_dir, "running", job["job_id"]))
+        except FileNotFoundError:
+            continue  # claimed by another worker
+        job.update(state="running", worker=worker, heartbeat_at=_iso(_now()), attempts=job.get("attempts", 0) + 1)
+        _write_job(_job_path(queue_dir, "running", job["job_id"]), job)
+        return job
+    return None
+
+
+def _last_seen(queue_dir: Path, job: dict[str, Any]) -> datetime | None:
+    heartbeat = _parse_iso(job.get("heartbeat_at"))
+    if heartbeat is not None:
+        return heartbeat
+    try:
+        mtime = _job_path(queue_dir, "running", job["job_id"]).stat().st_mtime
+    except FileNotFoundError:
+        return None
+    return datetime.fromtimestamp(mtime, timezone.utc)
+
+
+def requeue_stale(queue_dir: Path, stale_after_s: float) -> list[tuple[str, str]]:
+    """Re-queue (or fail, once attempts are used up) running jobs whose worker stopped
+    sending heartbeats; returns (job_id, new state) pairs."""
+
+    cutoff = _now() - timedelta(seconds=stale_after_s)
+    moved: list[tuple[str, str]] = []
+    for job in list_jobs(queue_dir, ("running",)):
+        last_seen = _last_seen(queue_dir, job)
+        if last_seen is None or last_seen >= cutoff:
+            continue
+        job["last_error"] = f"worker {job.get('worker')} stopped responding"
+        if job.get("attempts", 0) <= job.get("max_retries", 3):
+            job.update(heartbeat_at=None, worker=None)
+            to_state = "queued"
+        else:
+            job["finished_at"] = _iso(_now())
+            to_state = "failed"
+        try:
+            _move(queue_dir, job, to_state)
+        except FileNotFoundError:
+            continue
+        moved.append((job["job_id"], to_state))
+    return moved
+
+
+def retry(queue_dir: Path, job_id: str) -> Path:
+    job = _read_job(_job_path(queue_dir, "failed", job_id))
+    job.update(attempts=0, next_attempt_at=None, finished_at=None, heartbeat_at=None, worker=None)
+    return _move(queue_dir, job, "queued")
+
+
+# -- worker --------------------------------------------------------------------
+
+
+class Throttle:
+    """Shared write budget in bytes per second (None = unlimited)."""
+
+    def __init__(self, mb_per_s: float | None) -> None:
+        self.bytes_per_s = mb_per_s * 1024 * 1024 if mb_per_s else None
+        self.written = 0
+        self._start = time.monotonic()
+
+    def consume(self, n: int) -> None:
+        self.written += n
+        if self.bytes_per_s:
+            ahead = self.written / self.bytes_per_s - (time.monotonic() - self._start)
+            if ahead > 0:
+                time.sleep(ahead)
+
+
+class _ThrottledFile:
+    def __init__(self, path: Path, throttle: Throttle) -> None:
+        self._f = path.open("wb")
+        self._throttle = throttle
+
+    def write(self, data: bytes) -> int:
+        self._throttle.consume(len(data))
+        return self._f.write(data)
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "_ThrottledFile":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def run_job(job: dict[str, Any], throttle: Throttle) -> None:
+    # Worker-only imports: validate.py imports this module for check_archive_queue.
+    from archive_bundler import DEFAULT_BUNDLE_DIR, DEFAULT_TARGET_MB, DEFAULT_THRESHOLD_KB, archive_session, write_manifest
+    from archive_index import ArchiveIndex, index_path_for
+    from backup_store import BackupStore
+
+    params = job["module_parameters"]
+    if not params.get("session_dir") or not params.get("network_dir"):
+        raise ValueError("queued archive jobs need session_dir and network_dir")
+    unresolved = sorted({m for k in ("session_dir", "network_dir") for m in PLACEHOLDER_RE.findall(str(params[k]))})
+    if unresolved:
+        raise ValueError(f"unresolved placeholders {unresolved}")
+    session_dir = Path(params["session_dir"])
+    if not session_dir.is_dir():
+        raise FileNotFoundError(f"session_dir {session_dir} does not exist")
+    if params.get("dry_run"):
+        return
+
+    def open_dest(path: Path) -> BinaryIO:
+        return _ThrottledFile(path, throttle)  # type: ignore[return-value]
+
+    network_dir = Path(params["network_dir"])
+    index_path = index_path_for(network_dir, params.get("destination_index"))
+    index = None
+    if index_path is not None:
+        # Without skip_completed the index is still maintained, just not used to skip.
+        index = ArchiveIndex.load(index_path, hash_algo=params.get("checksum_algo"))
+        if params.get("skip_completed") is False:
+            index.files.clear()
+    bundle_index = archive_session(
+        session_dir,
+        network_dir,
+        matcher=PatternMatcher.from_params(params),
+        bundle_small_files=bool(params.get("bundle_small_files", False)),
+        threshold_bytes=int(params.get("bundle_threshold_kb", DEFAULT_THRESHOLD_KB)) * 1024,
+        target_bytes=int(params.get("bundle_target_mb", DEFAULT_TARGET_MB)) * 1024 * 1024,
+        bundle_dir=params.get("bundle_dir") or DEFAULT_BUNDLE_DIR,
+        open_dest=open_dest,
+        index=index,
+    )
+    if params.get("manifest_path"):
+        write_manifest(Path(params["manifest_path"]), bundle_index)
+    if params.get("backup_dir"):
+        matcher = PatternMatcher.from_params(params)
+        if params.get("backup_dedup"):
+            BackupStore(Path(params["backup_store_dir"])).backup(session_dir, Path(params["backup_dir"]), matcher=matcher)
+        else:
+            copy_backup(session_dir, Path(params["backup_dir"]), matcher=matcher)
+
+
+def copy_backup(session_dir: Path, backup_dir: Path, *, matcher: PatternMatcher | None = None) -> int:
+    """Copy the session into backup_dir as sync mode does; returns the number of files copied.
+
+    Files already in backup_dir with the same size and mtime are skipped.
+    """
+
+    from archive_bundler import copy_direct
+    from archive_index import scan_source
+
+    copied = 0
+    made_dirs: set[Path] = set()
+    for rel, size, mtime_ns in scan_source(session_dir, matcher):
+        dest = backup_dir / rel
+        try:
+            st = dest.stat()
+            if st.st_size == size and st.st_mtime_ns == mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+        if dest.parent not in made_dirs:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            made_dirs.add(dest.parent)
+        copy_direct(session_dir / rel, dest)
+        copied += 1
+    return copied
+
+
+def _write_heartbeat(queue_dir: Path, job: dict[str, Any]) -> bool:
+    """Rewrite running/<job_id>.json in place; False once the job is no longer there.
+
+    The file is first renamed aside, which fails if another worker moved the job, so the
+    heartbeat never re-creates it.
+    """
+
+    path = _job_path(queue_dir, "running", job["job_id"])
+    aside = path.with_suffix(".json.heartbeat")
+    try:
+        os.replace(path, aside)
+    except FileNotFoundError:
+        return False
+    try:
+        aside.write_text(json.dumps(job, indent=2) + "\n", encoding="utf-8")
+    finally:
+        os.replace(aside, path)
+    return True
+
+
+def _heartbeat(queue_dir: Path, job: dict[str, Any], lock: threading.Lock, stop: threading.Event) -> None:
+    while not stop.wait(HEARTBEAT_S):
+        with lock:
+            job["heartbeat_at"] = _iso(_now())
+            try:
+                if not _write_heartbeat(queue_dir, job):
+                    return
+            except OSError:
+                continue
+
+
+def process_one(
+    queue_dir: Path,
+    worker: str,
+    *,
+    max_mb_per_s: float | None = None,
+    runner: Callable[[dict[str, Any], Throttle], None] = run_job,
+) -> dict[str, Any] | None:
+    """Claim and run one job; returns it in its final state (None when the queue is idle)."""
+
+    job = claim_next(queue_dir, worker)
+    if job is None:
+        return None
+    throttle = Throttle(job["module_parameters"].get("archive_max_mb_per_s") or max_mb_per_s)
+    lock, stop = threading.Lock(), threading.Event()
+    beat = threading.Thread(target=_heartbeat, args=(queue_dir, job, lock, stop), daemon=True)
+    beat.start()
+    error: str | None = None
+    try:
+        runner(job, throttle)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    finally:
+        stop.set()
+        beat.join()
+
+    with lock:
+        job["bytes_copied"] = throttle.written
+        job["heartbeat_at"] = _iso(_now())
+        if error is None:
+            job.update(last_error=None, finished_at=_iso(_now()))
+            to_state = "done"
+        elif job["attempts"] <= job.get("max_retries", 3):
+            backoff = RETRY_BASE_S * 2 ** (job["attempts"] - 1)
+            job.update(last_error=error, next_attempt_at=_iso(_now() + timedelta(seconds=backoff)), heartbeat_at=None)
+            to_state = "queued"
+        else:
+            job.update(last_error=error, finished_at=_iso(_now()))
+            to_state = "failed"
+        try:
+            _move(queue_dir, job, to_state)
+        except FileNotFoundError:
+            # Re-queued by another worker after a missed heartbeat; its state wins.
+            job.update(state="lost", last_error=f"job was taken over by another worker; this attempt ended {to_state}")
+    return job
+
+
+# -- CLI -----------------------------------------------------------------------
+
+
+def _substitute(value: Any, variables: dict[str, str]) -> Any:
+    if isinstance(value, dict):
+        return {k: _substitute(v, variables) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_substitute(v, variables) for v in value]
+    if isinstance(value, str):
+        return PLACEHOLDER_RE.sub(lambda m: variables.get(m.group(1), m.group(0)), value)
+    return value
+
+
+def _cmd_enqueue(args: argparse.Namespace) -> int:
+    variables = dict(item.split("=", 1) for item in args.var or [])
+    params = _substitute(archiver_params(Path(args.pack)), variables)
+    if args.queue_dir:
+        params["archive_queue_dir"] = args.queue_dir
+    path = enqueue(params, pack=Path(args.pack).as_posix(), priority=args.priority)
+    print(f"Queued {path}")
+    return 0
+
+
+def _cmd_worker(args: argparse.Namespace) -> int:
+    import socket
+
+    queue_dir = Path(args.queue_dir)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    print(f"Archive worker {worker} on {queue_dir}")
+    while True:
+        for job_id, state in requeue_stale(queue_dir, args.stale_after_s):
+            print(f"{'REQUEUE' if state == 'queued' else 'FAILED '} {job_id} (stale heartbeat)")
+        job = process_one(queue_dir, worker, max_mb_per_s=args.max_mb_per_s)
+        if job is not None:
+            mb = (job.get("bytes_copied") or 0) / 1024 / 1024
+            suffix = f": {job['last_error']}" if job.get("last_error") else ""
+            print(f"{job['state'].upper():<7} {job['job_id']} attempt {job['attempts']} ({mb:,.1f} MiB){suffix}")
+            continue
+        if args.once:
+            return 0
+        time.sleep(args.poll_s)
+
+
+def _cmd_status(args: argparse.Namespace) -> int:
+    jobs = list_jobs(Path(args.queue_dir))
+    if args.json:
+        print(json.dumps(jobs, indent=2))
+        return 0
+    counts = {state: sum(1 for job in jobs if job.get("state") == state) for state in STATES}
+    print("  ".join(f"{state} {count}" for state, count in counts.items()))
+    for job in jobs:
+        params = job.get("module_parameters") or {}
+        line = (
+            f"{job.get('state', '?'):<7} {job['job_id']}  p{job.get('priority', DEFAULT_PRIORITY):<4} "
+            f"attempts {job.get('attempts', 0)}/{job.get('max_retries', 3) + 1}  {params.get('session_dir')}"
+        )
+        if job.get("state") == "running":
+            line += f"  [{job.get('worker')}, heartbeat {job.get('heartbeat_at')}]"
+        if job.get("next_attempt_at") and job.get("state") == "queued":
+            line += f"  (not before {job['next_attempt_at']})"
+        print(line)
+        if job.get("last_error") and job.get("state") != "done":
+            print(f"        {job['last_error']}")
+    return 0
+
+
+def _cmd_retry(args: argparse.Namespace) -> int:
+    print(f"Queued {retry(Path(args.queue_dir), args.job_id)}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Queue and drain background session_archiver jobs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enqueue_cmd = sub.add_parser("enqueue", help="Queue the session_archiver step of a pack")
+    enqueue_cmd.add_argument("--pack", type=str, required=True)
+    enqueue_cmd.add_argument("--var", action="append", help="Placeholder value, e.g. output_session_folder=D:/session")
+    enqueue_cmd.add_argument("--queue-dir", type=str, default=None, help="Override archive_queue_dir")
+    enqueue_cmd.add_argument("--priority", type=int, default=None, help="Override archive_priority")
+    enqueue_cmd.set_defaults(func=_cmd_enqueue)
+
+    worker_cmd = sub.add_parser("worker", help="Drain the queue")
+    worker_cmd.add_argument("--queue-dir", type=str, required=True)
+    worker_cmd.add_argument("--max-mb-per-s", type=float, default=None, help="Default throttle for jobs without archive_max_mb_per_s")
+    worker_cmd.add_argument("--poll-s", type=float, default=DEFAULT_POLL_S)
+    worker_cmd.add_argument("--stale-after-s", type=float, default=DEFAULT_STALE_AFTER_S)
+    worker_cmd.add_argument("--once", action="store_true", help="Exit when no job is due")
+    worker_cmd.set_defaults(func=_cmd_worker)
+
+    status_cmd = sub.add_parser("status", help="Show queued, running, done and failed jobs")
+    status_cmd.add_argument("--queue-dir", type=str, required=True)
+    status_cmd.add_argument("--json", action="store_true")
+    status_cmd.set_defaults(func=_cmd_status)
+
+    retry_cmd = sub.add_parser("retry", help="Move a failed job back to the queue")
+    retry_cmd.add_argument("--queue-dir", type=str, required=True)
+    retry_cmd.add_argument("job_id")
+    retry_cmd.set_defaults(func=_cmd_retry)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,420 @@
+"""Content-addressed backup store for `session_archiver` (`backup_dedup`).
+
+With `backup_dedup`, files are not copied into each session's `backup_dir` tree.
+Each file is written once to an object store keyed by its SHA-256, and the session tree
+gets a hardlink to that object:
+
+    <backup_store_dir>/objects/ab/abcdef...        (read-only, one per distinct content)
+    <backup_store_dir>/sessions/<session_key>.json (tree path, created_at, rel path -> sha256)
+    <backup_dir>/<rel path>                        (hardlink to the object)
+
+Byte-identical files across sessions (stimulus tables generated with the same seed,
+`instrument.json`, repository snapshots) therefore take disk space once. Objects are
+made read-only because every linked tree shares them. Where hardlinks are not possible
+(the store on another volume, or a filesystem without links), the file is copied and
+counted in `copied`. The store must be on the same volume as `backup_dir` to save space.
+
+`gc` applies the retention policy (`backup_retention_days`, always keeping the newest
+`backup_keep_sessions`; read from a pack with `--pack` or given on the command line),
+deletes the expired session trees and records, then removes objects no remaining
+session references.
+
+A session's record is written when its backup finishes, so `gc` must not run while a
+backup is storing objects. `StoreLock` keeps them apart with plain files under
+`<backup_store_dir>/locks/` (they work on network shares, unlike OS locks). Backups
+hold shared leases and run concurrently; gc holds the exclusive lock and waits for
+running backups to finish.
+
+This module is dependency-free (stdlib only).
+
+Run from repo root:
+    python ./tooling/backup_store.py backup <session_dir> <backup_dir> --store C:/BonsaiData/archive/.store
+    python ./tooling/backup_store.py stats --store C:/BonsaiData/archive/.store
+    python ./tooling/backup_store.py gc --store C:/BonsaiData/archive/.store --retention-days 90 --keep-sessions 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import stat
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from archive_index import scan_source
+from archive_patterns import ARCHIVER_MODULE, PatternMatcher, archiver_params
+from pack_entries import iter_pipeline_entries
+
+
+STORE_VERSION = 1
+HASH_CHUNK_BYTES = 4 * 1024 * 1024
+LOCK_STALE_S = 3600.0
+LOCK_REFRESH_S = 30.0
+LOCK_POLL_S = 0.5
+
+
+def check_backup_store(payload: dict[str, Any]) -> list[str]:
+    """Validation rules for session_archiver backup_dedup; returns a list of problems."""
+
+    problems: list[str] = []
+    for pipeline_name, idx, entry in iter_pipeline_entries(payload, module_path=ARCHIVER_MODULE):
+        params = entry.get("module_parameters")
+        if not isinstance(params, dict) or not params.get("backup_dedup"):
+            continue
+        where = f"{pipeline_name}[{idx}].module_parameters"
+        if not params.get("backup_dir"):
+            problems.append(f"{where}: backup_dedup requires backup_dir")
+        if not params.get("backup_store_dir"):
+            problems.append(f"{where}: backup_dedup requires backup_store_dir")
+    return problems
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class BackupResult:
+    files: int = 0
+    bytes: int = 0
+    new_objects: int = 0
+    new_bytes: int = 0
+    linked: int = 0
+    copied: int = 0
+
+    @property
+    def deduplicated_bytes(self) -> int:
+        return self.bytes - self.new_bytes
+
+
+class StoreLock:
+    """Shared (backup) / exclusive (gc) lock on a store, made of plain files.
+
+    A backup holds `locks/backup-<id>` and gc holds `locks/gc`. Each side creates its own
+    file before looking for the other's, so they never both proceed: a backup that finds
+    gc backs off and retries, and gc waits until no backup holds a lease. Holders refresh
+    their file's mtime; a file not refreshed for `stale_after_s` was left by a dead
+    process and is removed.
+    """
+
+    def __init__(self, root: Path, *, stale_after_s: float = LOCK_STALE_S, poll_s: float = LOCK_POLL_S) -> None:
+        self.dir = root / "locks"
+        self.stale_after_s = stale_after_s
+        self.poll_s = poll_s
+
+    def _held(self, path: Path) -> bool:
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        if age > self.stale_after_s:
+            path.unlink(missing_ok=True)
+            return False
+        return True
+
+    @staticmethod
+    def _refresher(path: Path) -> Callable[[], None]:
+        last = [time.monotonic()]
+
+        def refresh() -> None:
+            if time.monotonic() - last[0] >= LOCK_REFRESH_S:
+                os.utime(path)
+                last[0] = time.monotonic()
+
+        return refresh
+
+    @contextmanager
+    def shared(self) -> Iterator[Callable[[], None]]:
+        """Hold a backup lease; yields a callable that keeps it fresh (call it per file)."""
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        lease = self.dir / f"backup-{uuid.uuid4().hex}"
+        while True:
+            lease.touch()
+            if not self._held(self.dir / "gc"):
+                break
+            lease.unlink(missing_ok=True)
+            time.sleep(self.poll_s)
+        try:
+            yield self._refresher(lease)
+        finally:
+            lease.unlink(missing_ok=True)
+
+    @contextmanager
+    def exclusive(self) -> Iterator[Callable[[], None]]:
+        """Hold the gc lock once no backup holds a lease; yields a refresh callable."""
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        lock = self.dir / "gc"
+        while True:
+            try:
+                os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                if self._held(lock):
+                    time.sleep(self.poll_s)
+        try:
+            while any(self._held(lease) for lease in self.dir.glob("backup-*")):
+                os.utime(lock)
+                time.sleep(self.poll_s)
+            os.utime(lock)
+            yield self._refresher(lock)
+        finally:
+            lock.unlink(missing_ok=True)
+
+
+class BackupStore:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.objects = root / "objects"
+        self.sessions = root / "sessions"
+        self.lock = StoreLock(root)
+
+    def object_path(self, sha256: str) -> Path:
+        return self.objects / sha256[:2] / sha256
+
+    def session_key(self, backup_dir: Path) -> str:
+        return hashlib.sha256(os.path.normcase(os.path.abspath(backup_dir)).encode("utf-8")).hexdigest()[:20]
+
+    def put(self, src: Path, sha256: str) -> bool:
+        """Store src under its digest unless already present; returns True when written."""
+
+        obj = self.object_path(sha256)
+        if obj.exists():
+            return False
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        tmp = obj.with_name(f"{obj.name}.{os.getpid()}.tmp")
+        shutil.copyfile(src, tmp)
+        shutil.copystat(src, tmp)
+        os.chmod(tmp, stat.S_IREAD | stat.S_IRGRP | stat.S_IROTH)
+        try:
+            os.replace(tmp, obj)
+        except OSError:
+            # Another writer stored the same content first.
+            os.chmod(tmp, stat.S_IWRITE | stat.S_IREAD)
+            tmp.unlink(missing_ok=True)
+            return False
+        return True
+
+    def link(self, sha256: str, dest: Path) -> bool:
+        """Hardlink the object to dest (copying when links are unavailable); returns True if linked."""
+
+        obj = self.object_path(sha256)
+        if dest.exists():
+            if os.path.samefile(obj, dest):
+                return True
+            os.chmod(dest, stat.S_IWRITE | stat.S_IREAD)
+            dest.unlink()
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(obj, dest)
+            return True
+        except OSError:
+            shutil.copy2(obj, dest)
+            return False
+
+    def backup(self, session_dir: Path, backup_dir: Path, *, matcher: PatternMatcher | None = None) -> BackupResult:
+        """Store and link a session; holds a shared lease so gc cannot drop its objects meanwhile."""
+
+        result = BackupResult()
+        files: dict[str, str] = {}
+        with self.lock.shared() as refresh:
+            for rel, size, _ in scan_source(session_dir, matcher):
+                refresh()
+                sha256 = _sha256(session_dir / rel)
+                if self.put(session_dir / rel, sha256):
+                    result.new_objects += 1
+                    result.new_bytes += size
+                if self.link(sha256, backup_dir / rel):
+                    result.linked += 1
+                else:
+                    result.copied += 1
+                result.files += 1
+                result.bytes += size
+                files[rel] = sha256
+            self._write_record(backup_dir, files)
+        return result
+
+    def _write_record(self, backup_dir: Path, files: dict[str, str]) -> None:
+        self.sessions.mkdir(parents=True, exist_ok=True)
+        key = self.session_key(backup_dir)
+        path = self.sessions / f"{key}.json"
+        record = {
+            "store_version": STORE_VERSION,
+            "session_key": key,
+            "backup_dir": os.path.abspath(backup_dir),
+            "created_at": _now().isoformat(timespec="seconds"),
+            "files": dict(sorted(files.items())),
+        }
+        if path.exists():
+            previous = json.loads(path.read_text(encoding="utf-8"))
+            record["created_at"] = previous.get("created_at", record["created_at"])
+            record["files"] = dict(sorted({**previous.get("files", {}), **files}.items()))
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(record, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+
+    def records(self) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        for path in sorted(self.sessions.glob("*.json")):
+            try:
+                records.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        return records
+
+    def iter_objects(self):
+        for path in self.objects.glob("*/*"):
+            if len(path.name) == 64 and path.is_file():
+                yield path
+
+    def gc(
+        self,
+        *,
+        retention_days: float | None,
+        keep_sessions: int = 0,
+        delete_trees: bool = True,
+        dry_run: bool = False,
+    ) -> dict[str, int]:
+        """Expire sessions past retention (keeping the newest keep_sessions), then drop unreferenced objects.
+
+        Runs under the store's exclusive lock, after any running backup has written its record.
+        """
+
+        with self.lock.exclusive() as refresh:
+            return self._gc(retention_days, keep_sessions, delete_trees, dry_run, refresh)
+
+    def _gc(
+        self,
+        retention_days: float | None,
+        keep_sessions: int,
+        delete_trees: bool,
+        dry_run: bool,
+        refresh: Callable[[], None],
+    ) -> dict[str, int]:
+        records = sorted(self.records(), key=lambda r: r.get("created_at", ""), reverse=True)
+        cutoff = _now() - timedelta(days=retention_days) if retention_days is not None else None
+        expired = [
+            record
+            for position, record in enumerate(records)
+            if position >= keep_sessions and cutoff is not None and datetime.fromisoformat(record["created_at"]) < cutoff
+        ]
+        expired_keys = {record["session_key"] for record in expired}
+        stats = {"sessions_expired": len(expired), "objects_removed": 0, "bytes_freed": 0}
+        for record in expired:
+            if dry_run:
+                continue
+            refresh()
+            tree = Path(record["backup_dir"])
+            if delete_trees and tree.is_dir():
+                shutil.rmtree(tree, onerror=_force_remove)
+            (self.sessions / f"{record['session_key']}.json").unlink(missing_ok=True)
+
+        referenced = {sha for record in records if record["session_key"] not in expired_keys for sha in record["files"].values()}
+        for obj in list(self.iter_objects()):
+            refresh()
+            if obj.name in referenced:
+                continue
+            stats["objects_removed"] += 1
+            stats["bytes_freed"] += obj.stat().st_size
+            if not dry_run:
+                os.chmod(obj, stat.S_IWRITE | stat.S_IREAD)
+                obj.unlink()
+        return stats
+
+
+def _force_remove(func, path, _exc) -> None:
+    # Hardlinks to read-only objects are read-only too; make them writable and retry.
+    os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+    func(path)
+
+
+def _cmd_backup(args: argparse.Namespace) -> int:
+    store = BackupStore(Path(args.store))
+    result = store.backup(Path(args.session_dir), Path(args.backup_dir))
+    print(
+        f"{result.files:,} file(s), {result.bytes / 1024 / 1024:,.1f} MiB: {result.new_objects:,} new object(s) "
+        f"({result.new_bytes / 1024 / 1024:,.1f} MiB written), {result.deduplicated_bytes / 1024 / 1024:,.1f} MiB deduplicated; "
+        f"{result.linked:,} linked, {result.copied:,} copied"
+    )
+    return 0
+
+
+def _cmd_stats(args: argparse.Namespace) -> int:
+    store = BackupStore(Path(args.store))
+    records = store.records()
+    sizes = {obj.name: obj.stat().st_size for obj in store.iter_objects()}
+    logical = sum(sizes.get(sha, 0) for record in records for sha in record["files"].values())
+    physical = sum(sizes.values())
+    ratio = logical / physical if physical else 1.0
+    print(f"{len(records)} session(s), {len(sizes):,} object(s)")
+    print(f"logical {logical / 1024 / 1024:,.1f} MiB, stored {physical / 1024 / 1024:,.1f} MiB ({ratio:.2f}x)")
+    return 0
+
+
+def _cmd_gc(args: argparse.Namespace) -> int:
+    params = archiver_params(Path(args.pack)) if args.pack else {}
+    store_dir = args.store or params.get("backup_store_dir")
+    if not store_dir:
+        raise SystemExit("gc needs --store or a --pack with backup_store_dir")
+    retention_days = args.retention_days if args.retention_days is not None else params.get("backup_retention_days")
+    keep_sessions = args.keep_sessions if args.keep_sessions is not None else params.get("backup_keep_sessions", 0)
+    store = BackupStore(Path(store_dir))
+    stats = store.gc(
+        retention_days=retention_days,
+        keep_sessions=keep_sessions,
+        delete_trees=not args.keep_trees,
+        dry_run=args.dry_run,
+    )
+    print(
+        f"{stats['sessions_expired']} session(s) expired, {stats['objects_removed']:,} object(s) removed, "
+        f"{stats['bytes_freed'] / 1024 / 1024:,.1f} MiB freed" + (" (dry run)" if args.dry_run else "")
+    )
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Content-addressed, deduplicated session backups")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    backup = sub.add_parser("backup", help="Back up a session into the store and link it into backup_dir")
+    backup.add_argument("session_dir")
+    backup.add_argument("backup_dir")
+    backup.add_argument("--store", type=str, required=True)
+    backup.set_defaults(func=_cmd_backup)
+
+    stats_cmd = sub.add_parser("stats", help="Show sessions, objects and the deduplication ratio")
+    stats_cmd.add_argument("--store", type=str, required=True)
+    stats_cmd.set_defaults(func=_cmd_stats)
+
+    gc = sub.add_parser("gc", help="Expire old sessions and remove unreferenced objects")
+    gc.add_argument("--store", type=str, default=None)
+    gc.add_argument("--pack", type=str, default=None, help="Take the store and retention policy from a pack's session_archiver step")
+    gc.add_argument("--retention-days", type=float, default=None, help="Expire sessions older than this")
+    gc.add_argument("--keep-sessions", type=int, default=None, help="Always keep the newest N sessions")
+    gc.add_argument("--keep-trees", action="store_true", help="Only forget expired sessions; leave their trees")
+    gc.add_argument("--dry-run", action="store_true")
+    gc.set_defaults(func=_cmd_gc)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
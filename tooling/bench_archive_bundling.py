@@ -0,0 +1,121 @@
+"""Benchmark per-file vs bundled session archiving over a simulated high-latency share.
+
+Creates a synthetic session locally (many small metadata/notes/stimulus-log files and a
+few large acquisition files) and archives it twice with `archive_bundler.archive_session`:
+once with every file copied individually and once with `bundle_small_files`. The
+destination is a local temp directory opened through a wrapper that adds a fixed
+latency per remote file (open + close round trips) and a bandwidth cap, approximating
+an SMB share such as `\\\\allen\\aind\\scratch`.
+
+Run from repo root:
+    python ./tooling/bench_archive_bundling.py --small-files 2000 --latency-ms 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import BinaryIO
+
+from archive_bundler import archive_session, unbundle
+
+
+class LatencyFile:
+    """Local file that sleeps like a remote one: per-open/close latency plus a bandwidth cap."""
+
+    def __init__(self, path: Path, latency_s: float, bytes_per_s: float) -> None:
+        time.sleep(latency_s)
+        self._f = path.open("wb")
+        self._latency_s = latency_s
+        self._bytes_per_s = bytes_per_s
+
+    def write(self, data: bytes) -> int:
+        if self._bytes_per_s:
+            time.sleep(len(data) / self._bytes_per_s)
+        return self._f.write(data)
+
+    def close(self) -> None:
+        self._f.close()
+        time.sleep(self._latency_s)
+
+    def __enter__(self) -> "LatencyFile":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def make_session(root: Path, small_files: int, small_kb: int, large_files: int, large_mb: int) -> int:
+    total = 0
+    chunk = os.urandom(1024)
+    for n in range(small_files):
+        sub = ("launcher_metadata", "notes", "stimulus_logs", "behavior")[n % 4]
+        path = root / sub / f"file_{n:05d}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(chunk * small_kb)
+        total += small_kb * 1024
+    for n in range(large_files):
+        path = root / "slap2" / f"acquisition_{n:02d}.dat"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            for _ in range(large_mb):
+                f.write(chunk * 1024)
+        total += large_mb * 1024 * 1024
+    return total
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-file vs bundled archiving over a simulated share")
+    parser.add_argument("--small-files", type=int, default=2000)
+    parser.add_argument("--small-kb", type=int, default=4)
+    parser.add_argument("--large-files", type=int, default=4)
+    parser.add_argument("--large-mb", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=4.0, help="Simulated latency per remote open and close")
+    parser.add_argument("--bandwidth-mb-s", type=float, default=200.0, help="Simulated bandwidth (0 = unlimited)")
+    parser.add_argument("--threshold-kb", type=int, default=256)
+    parser.add_argument("--target-mb", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    latency_s = args.latency_ms / 1000
+    bytes_per_s = args.bandwidth_mb_s * 1024 * 1024
+
+    def open_dest(path: Path) -> BinaryIO:
+        return LatencyFile(path, latency_s, bytes_per_s)  # type: ignore[return-value]
+
+    with tempfile.TemporaryDirectory(prefix="bench_bundling_") as tmp:
+        session = Path(tmp) / "session"
+        total = make_session(session, args.small_files, args.small_kb, args.large_files, args.large_mb)
+        print(
+            f"session: {args.small_files:,} x {args.small_kb} KiB + {args.large_files} x {args.large_mb} MiB "
+            f"({total / 1024 / 1024:,.1f} MiB); latency {args.latency_ms} ms/open+close, {args.bandwidth_mb_s} MB/s"
+        )
+        results = {}
+        for label, bundle in (("per-file", False), ("bundled", True)):
+            dest = Path(tmp) / label
+            start = time.perf_counter()
+            index = archive_session(
+                session,
+                dest,
+                bundle_small_files=bundle,
+                threshold_bytes=args.threshold_kb * 1024,
+                target_bytes=args.target_mb * 1024 * 1024,
+                open_dest=open_dest,
+            )
+            elapsed = time.perf_counter() - start
+            remote = len(index["direct"]) + len(index["bundles"])
+            results[label] = elapsed
+            print(f"{label:<9} {elapsed:8.2f} s  {remote:,} remote file(s)")
+            if bundle:
+                restored = unbundle(dest, index, Path(tmp) / "restored")
+                if restored != sum(len(b["members"]) for b in index["bundles"]):
+                    print("FAIL unbundle restored the wrong number of members")
+                    return 1
+        print(f"speedup   {results['per-file'] / results['bundled']:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
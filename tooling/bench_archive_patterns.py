@@ -0,0 +1,140 @@
+"""Benchmark for session_archiver include/exclude matching on large synthetic sessions.
+
+Builds a synthetic SLAP2 session tree (frames per acquisition, reference stacks,
+behavior videos, logs, temp files) and compares:
+
+- fnmatch:   `fnmatch.fnmatch` per pattern per file (the naive approach; its `*`
+             crosses `/`, so its selection is reported but not compared)
+- per-pattern: one compiled contract regex per pattern, looped in Python
+- combined:  `archive_patterns.PatternMatcher` (one regex for includes, one for excludes)
+
+The per-pattern and combined selections must be identical. `--materialize` also writes
+the tree as empty files to a temporary directory and times `PatternMatcher.walk()`
+(which skips excluded directories) against `os.walk` + filtering.
+
+Run from repo root:
+    python ./tooling/bench_archive_patterns.py --frames 100000
+    python ./tooling/bench_archive_patterns.py --frames 20000 --materialize
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+
+from archive_patterns import PatternMatcher, as_pattern_list, case_sensitive, compile_pattern
+
+
+DEFAULT_INCLUDE = ["slap2/**", "behavior-videos/*.avi", "*.json", "*.log", "notes/*.txt"]
+DEFAULT_EXCLUDE = ["tmp/", "*.tmp", "**/ref/*.tif", "Thumbs.db", "slap2/**/scratch/"]
+
+
+def synthetic_session(frames: int, acquisitions: int) -> list[str]:
+    paths: list[str] = []
+    per_acq = max(1, frames // max(1, acquisitions))
+    for acq in range(acquisitions):
+        base = f"slap2/acq_{acq:03d}"
+        paths.extend(f"{base}/frames/frame_{n:06d}.tif" for n in range(per_acq))
+        paths.extend(f"{base}/ref/ref_{n:03d}.tif" for n in range(20))
+        paths.extend(f"{base}/scratch/part_{n:04d}.bin" for n in range(per_acq // 10))
+        paths.append(f"{base}/acquisition.json")
+        paths.append(f"{base}/Thumbs.db")
+    paths.extend(f"behavior-videos/{camera}.avi" for camera in ("Body", "Face", "Eye"))
+    paths.extend(f"behavior-videos/{camera}.csv" for camera in ("Body", "Face", "Eye"))
+    paths.extend(f"tmp/chunk_{n:05d}.tmp" for n in range(frames // 20))
+    paths.extend(f"logs/launcher_{n}.log" for n in range(10))
+    paths.extend(["notes/experiment_notes.txt", "session.json", "subject.json", "stim.pkl"])
+    return paths
+
+
+def _time(fn) -> tuple[object, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def _per_pattern(paths: list[str], include: list[str], exclude: list[str], flags: int) -> list[str]:
+    inc = [re.compile(compile_pattern(p), flags) for p in include]
+    exc = [re.compile(compile_pattern(p), flags) for p in exclude]
+    return [
+        path
+        for path in paths
+        if (not inc or any(r.fullmatch(path) for r in inc)) and not any(r.fullmatch(path) for r in exc)
+    ]
+
+
+def _fnmatch(paths: list[str], include: list[str], exclude: list[str]) -> list[str]:
+    return [
+        path
+        for path in paths
+        if (not include or any(fnmatch(path, p) for p in include)) and not any(fnmatch(path, p) for p in exclude)
+    ]
+
+
+def _materialize(paths: list[str], root: Path) -> None:
+    for rel in paths:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+
+def _os_walk(root: Path, matcher: PatternMatcher) -> list[str]:
+    selected: list[str] = []
+    for dirpath, _, filenames in os.walk(root):
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        prefix = "" if rel_dir == "." else f"{rel_dir}/"
+        selected.extend(f"{prefix}{name}" for name in filenames if matcher.matches(f"{prefix}{name}"))
+    return selected
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark session_archiver include/exclude matching")
+    parser.add_argument("--frames", type=int, default=100_000, help="Total SLAP2 frame files")
+    parser.add_argument("--acquisitions", type=int, default=8)
+    parser.add_argument("--include", type=str, default=None, help="JSON list of include patterns")
+    parser.add_argument("--exclude", type=str, default=None, help="JSON list of exclude patterns")
+    parser.add_argument("--pattern-case", type=str, default="auto", choices=["auto", "sensitive", "insensitive"])
+    parser.add_argument("--materialize", action="store_true", help="Also time directory walks over real files")
+    args = parser.parse_args(argv)
+
+    include = as_pattern_list(json.loads(args.include)) if args.include else DEFAULT_INCLUDE
+    exclude = as_pattern_list(json.loads(args.exclude)) if args.exclude else DEFAULT_EXCLUDE
+    flags = 0 if case_sensitive(args.pattern_case) else re.IGNORECASE
+    paths = synthetic_session(args.frames, args.acquisitions)
+    print(f"{len(paths):,} files, {len(include)} include / {len(exclude)} exclude patterns")
+
+    matcher, compile_s = _time(lambda: PatternMatcher(include, exclude, pattern_case=args.pattern_case))
+    combined, combined_s = _time(lambda: matcher.filter(paths))
+    reference, reference_s = _time(lambda: _per_pattern(paths, include, exclude, flags))
+    naive, naive_s = _time(lambda: _fnmatch(paths, include, exclude))
+
+    print(f"fnmatch      {naive_s * 1000:9.1f} ms  {len(naive):,} selected (different '*' semantics)")
+    print(f"per-pattern  {reference_s * 1000:9.1f} ms  {len(reference):,} selected")
+    print(f"combined     {combined_s * 1000:9.1f} ms  {len(combined):,} selected (compile {compile_s * 1000:.2f} ms)")
+    if combined != reference:
+        print("FAIL combined matcher disagrees with the per-pattern reference")
+        return 1
+
+    if args.materialize:
+        with tempfile.TemporaryDirectory(prefix="bench_archive_") as tmp:
+            root = Path(tmp)
+            _, make_s = _time(lambda: _materialize(paths, root))
+            walked, walk_s = _time(lambda: sorted(matcher.walk(root)))
+            listed, listed_s = _time(lambda: sorted(_os_walk(root, matcher)))
+            print(f"materialized in {make_s:.1f} s")
+            print(f"os.walk      {listed_s * 1000:9.1f} ms  {len(listed):,} selected")
+            print(f"walk (prune) {walk_s * 1000:9.1f} ms  {len(walked):,} selected")
+            if walked != listed:
+                print("FAIL pruned walk disagrees with os.walk")
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
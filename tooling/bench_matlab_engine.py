@@ -0,0 +1,84 @@
+"""Benchmark attach-vs-cold-start latency for the MATLAB shared engine, using a stub engine.
+
+Runs `--sessions` consecutive sessions twice:
+
+- cold: `matlab_engine_policy: "start"`, a fresh engine per session
+- warm: the pack's policy (default `attach_or_start`), reusing one shared engine
+
+and reports how long each session waited for an engine. The stub engine
+(`matlab_engine.py`) sleeps `--startup-s` (+ `--warmup-s` for the warm-up script)
+before it is shared, so pick values close to what the rig's MATLAB shows.
+
+Run from repo root:
+    python ./tooling/bench_matlab_engine.py --pack ./packs/shared/matlab/matlab_slap2.json --startup-s 20 --sessions 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from matlab_engine import DEFAULT_POLICY, acquire_engine, find_engine
+
+
+def _run(policy: str, *, name: str, registry_dir: Path, sessions: int, max_sessions: int | None, start_kwargs: dict) -> list[float]:
+    waits: list[float] = []
+    for _ in range(sessions):
+        start = time.perf_counter()
+        engine = acquire_engine(name, policy=policy, registry_dir=registry_dir, max_sessions=max_sessions, **start_kwargs)
+        waits.append(time.perf_counter() - start)
+        engine.run_session()
+    engine = find_engine(name, registry_dir)
+    if engine is not None:
+        engine.shutdown()
+    return waits
+
+
+def _fmt(waits: list[float]) -> str:
+    return f"total={sum(waits):7.2f} s  first={waits[0]:6.2f} s  median={statistics.median(waits):6.3f} s"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark MATLAB engine attach vs cold start with a stub engine")
+    parser.add_argument("--pack", type=str, default=None, help="MATLAB pack to read matlab_* settings from")
+    parser.add_argument("--sessions", type=int, default=5, help="Consecutive sessions per mode")
+    parser.add_argument("--startup-s", type=float, default=2.0, help="Simulated engine start-up time")
+    parser.add_argument("--warmup-s", type=float, default=None, help="Simulated warm-up script time (default: 0, or 1 if the pack sets one)")
+    parser.add_argument("--session-s", type=float, default=0.0, help="Simulated session run time")
+    args = parser.parse_args(argv)
+
+    pack: dict = {}
+    if args.pack:
+        pack = json.loads(Path(args.pack).read_text(encoding="utf-8"))
+    name = pack.get("matlab_engine_name") or "bench_engine"
+    policy = pack.get("matlab_engine_policy") or DEFAULT_POLICY
+    if policy == "start":
+        print("Pack policy is 'start'; comparing against 'attach_or_start'.")
+        policy = "attach_or_start"
+    warmup_s = args.warmup_s if args.warmup_s is not None else (1.0 if pack.get("matlab_warmup_script") else 0.0)
+    start_kwargs = {
+        "startup_s": args.startup_s,
+        "warmup_s": warmup_s,
+        "session_s": args.session_s,
+        "idle_timeout_s": pack.get("matlab_engine_idle_timeout_s"),
+    }
+    max_sessions = pack.get("matlab_max_sessions_per_engine")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry_dir = Path(tmp)
+        cold = _run("start", name=name, registry_dir=registry_dir, sessions=args.sessions, max_sessions=None, start_kwargs=start_kwargs)
+        warm = _run(policy, name=name, registry_dir=registry_dir, sessions=args.sessions, max_sessions=max_sessions, start_kwargs=start_kwargs)
+
+    print(f"engine {name!r}, {args.sessions} session(s), startup={args.startup_s}s warmup={warmup_s}s")
+    print(f"cold  (start)      {_fmt(cold)}")
+    print(f"warm  ({policy}) {_fmt(warm)}")
+    print(f"saved {sum(cold) - sum(warm):.2f} s over {args.sessions} session(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
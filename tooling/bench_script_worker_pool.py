@@ -0,0 +1,134 @@
+"""Benchmark cold vs warm script_module calls using the example packs.
+
+For every script_module entry found in the packs, writes a stand-in script (same
+relative `module_path` and `function`) under a temporary repository. The stand-in
+imports the pool's preload modules and writes a small CSV to `output_path`, which is
+enough to exercise interpreter start-up and import cost without the real project
+repositories. Each entry is then called:
+
+- cold: a fresh `python -c` subprocess per call (what `execution: "subprocess"` pays)
+- warm: through `ScriptWorkerPool` (`execution: "pooled"`), after one warm-up call
+
+Run from repo root:
+    python ./tooling/bench_script_worker_pool.py
+    python ./tooling/bench_script_worker_pool.py --preload numpy pandas --calls 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from pack_entries import SCRIPT_MODULE, iter_pipeline_entries
+from script_worker_pool import ScriptWorkerPool
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+STUB_TEMPLATE = '''\
+import csv
+import random
+{imports}
+
+
+def {function}(output_path=None, seed=0, session_type="", **kwargs):
+    rng = random.Random(seed)
+    rows = [(i, session_type, rng.random()) for i in range(1000)]
+    if output_path:
+        with open(output_path, "w", newline="") as f:
+            csv.writer(f).writerows(rows)
+    return len(rows)
+'''
+
+COLD_TEMPLATE = (
+    "import importlib.util, json, sys\n"
+    "sys.path.insert(0, {repo!r})\n"
+    "spec = importlib.util.spec_from_file_location('m', {script!r})\n"
+    "m = importlib.util.module_from_spec(spec); spec.loader.exec_module(m)\n"
+    "getattr(m, {function!r})(**json.loads({kwargs!r}))\n"
+)
+
+
+def _iter_script_entries(packs_root: Path):
+    for path in sorted(packs_root.rglob("*.json")):
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            continue
+        for _, _, entry in iter_pipeline_entries(payload, module_type=SCRIPT_MODULE):
+            params = entry.get("module_parameters") or {}
+            if params.get("function"):
+                yield path, payload, entry["module_path"], params["function"], dict(params.get("function_args") or {})
+
+
+def _stub_kwargs(function_args: dict[str, Any], out_dir: Path) -> dict[str, Any]:
+    kwargs = dict(function_args)
+    # Placeholders are resolved by the launcher at runtime; point outputs at a scratch file.
+    kwargs["output_path"] = str(out_dir / "out.csv")
+    return kwargs
+
+
+def _fmt(values: list[float]) -> str:
+    return f"p50={statistics.median(values) * 1000:8.1f} ms  min={min(values) * 1000:8.1f} ms"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark cold vs warm (pooled) script_module calls")
+    parser.add_argument("--root", type=str, default=str(REPO_ROOT / "packs"), help="Packs root to take entries from")
+    parser.add_argument("--calls", type=int, default=5, help="Calls per entry and mode")
+    parser.add_argument("--preload", nargs="*", default=[], help="Modules the stand-in imports and the pool preloads")
+    args = parser.parse_args(argv)
+
+    entries = list(_iter_script_entries(Path(args.root)))
+    if not entries:
+        print("No script_module entries found.")
+        return 0
+
+    imports = "\n".join(f"import {name}" for name in args.preload)
+    with tempfile.TemporaryDirectory() as tmp, ScriptWorkerPool(preload_modules=args.preload) as pool:
+        tmp_dir = Path(tmp)
+        cold_all: list[float] = []
+        warm_all: list[float] = []
+        for pack_path, payload, module_path, function, function_args in entries:
+            commit = str(payload.get("repository_commit_hash") or "unpinned")
+            repo = tmp_dir / "repos" / commit
+            script = repo / module_path
+            script.parent.mkdir(parents=True, exist_ok=True)
+            script.write_text(STUB_TEMPLATE.format(imports=imports, function=function), encoding="utf-8")
+            kwargs = _stub_kwargs(function_args, tmp_dir)
+
+            cold: list[float] = []
+            code = COLD_TEMPLATE.format(repo=str(repo), script=str(script), function=function, kwargs=json.dumps(kwargs))
+            for _ in range(args.calls):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, "-c", code], check=True)
+                cold.append(time.perf_counter() - start)
+
+            pool.call(str(repo), commit, module_path, function, kwargs)  # warm-up
+            warm: list[float] = []
+            for _ in range(args.calls):
+                start = time.perf_counter()
+                pool.call(str(repo), commit, module_path, function, kwargs)
+                warm.append(time.perf_counter() - start)
+
+            cold_all.extend(cold)
+            warm_all.extend(warm)
+            rel = pack_path.relative_to(REPO_ROOT) if pack_path.is_relative_to(REPO_ROOT) else pack_path
+            print(f"{rel.as_posix()}: {function}")
+            print(f"    cold {_fmt(cold)}")
+            print(f"    warm {_fmt(warm)}")
+
+    speedup = statistics.median(cold_all) / statistics.median(warm_all)
+    print(f"Overall: cold {_fmt(cold_all)} | warm {_fmt(warm_all)} | {speedup:.1f}x faster warm")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
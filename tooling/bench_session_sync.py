@@ -0,0 +1,199 @@
+"""Localhost benchmark for the session sync handshake.
+
+Simulates one master and N slaves in a single process (asyncio over TCP on
+127.0.0.1) and measures, per round:
+
+- handshake latency: slave connect -> master acknowledgement
+- start skew: spread between the first and last slave receiving the start signal
+- clock offset: slave-estimated offset to the master clock (NTP-style midpoint)
+
+Optional heartbeats and CPU-bound background threads add load. Settings can be
+seeded from a master pack (`--pack`): expected slaves, heartbeat interval and
+clock-offset tolerance are taken from its `session_sync_*` keys.
+
+The wire format is newline-delimited JSON and only approximates the launcher's
+protocol; use the numbers to compare settings and machines, not as absolute truth.
+
+Run from repo root:
+    python ./tooling/bench_session_sync.py --slaves 4 --rounds 20
+    python ./tooling/bench_session_sync.py --pack ./packs/shared/core/session_sync_master.json --cpu-load 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class RoundResult:
+    handshake_ms: list[float] = field(default_factory=list)
+    start_receipt: list[float] = field(default_factory=list)
+    clock_offset_ms: list[float] = field(default_factory=list)
+
+    @property
+    def start_skew_ms(self) -> float:
+        return (max(self.start_receipt) - min(self.start_receipt)) * 1000 if self.start_receipt else 0.0
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict) -> None:
+    writer.write((json.dumps(message) + "\n").encode("utf-8"))
+    await writer.drain()
+
+
+async def _recv(reader: asyncio.StreamReader) -> dict:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("peer closed connection")
+    return json.loads(line)
+
+
+async def _run_round(*, slaves: int, heartbeat_interval_s: float | None, heartbeats: int, timeout_s: float) -> RoundResult:
+    result = RoundResult()
+    connected: list[asyncio.StreamWriter] = []
+    all_connected = asyncio.Event()
+
+    async def handle_slave(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        hello = await _recv(reader)
+        await _send(writer, {"type": "ack", "slave_id": hello.get("slave_id"), "master_time": time.perf_counter()})
+        connected.append(writer)
+        if len(connected) == slaves:
+            all_connected.set()
+        # Drain heartbeats until the slave hangs up.
+        while await reader.readline():
+            pass
+
+    server = await asyncio.start_server(handle_slave, host="127.0.0.1", port=0)
+    port = server.sockets[0].getsockname()[1]
+
+    async def slave(slave_id: int) -> None:
+        t_connect = time.perf_counter()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await _send(writer, {"type": "hello", "slave_id": slave_id})
+        ack = await _recv(reader)
+        t_ack = time.perf_counter()
+        result.handshake_ms.append((t_ack - t_connect) * 1000)
+        result.clock_offset_ms.append((ack["master_time"] - (t_connect + t_ack) / 2) * 1000)
+
+        async def heartbeat() -> None:
+            if not heartbeat_interval_s:
+                return
+            for _ in range(heartbeats):
+                await _send(writer, {"type": "heartbeat", "slave_id": slave_id})
+                await asyncio.sleep(heartbeat_interval_s)
+
+        hb = asyncio.create_task(heartbeat())
+        start = await _recv(reader)
+        result.start_receipt.append(time.perf_counter())
+        if start.get("type") != "start":
+            raise RuntimeError(f"slave {slave_id}: expected start message, got {start!r}")
+        await hb
+        writer.close()
+        await writer.wait_closed()
+
+    async with server:
+        tasks = [asyncio.create_task(slave(i)) for i in range(slaves)]
+        await asyncio.wait_for(all_connected.wait(), timeout=timeout_s)
+        for writer in list(connected):
+            await _send(writer, {"type": "start", "master_time": time.perf_counter()})
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=timeout_s)
+    return result
+
+
+def _spin(stop: threading.Event) -> None:
+    x = 0
+    while not stop.is_set():
+        x = (x * 31 + 7) % 1_000_003
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _summary(label: str, values: list[float]) -> str:
+    return (
+        f"{label:<18} p50={_percentile(values, 50):8.3f} ms  p95={_percentile(values, 95):8.3f} ms  "
+        f"max={max(values, default=0.0):8.3f} ms  mean={statistics.fmean(values) if values else 0.0:8.3f} ms"
+    )
+
+
+def _first_set(*values):
+    """First value that is not None, so an explicit 0 is kept rather than replaced by a default."""
+
+    return next((v for v in values if v is not None), None)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark session sync handshake latency and start skew on localhost")
+    parser.add_argument("--pack", type=str, default=None, help="Master pack to read session_sync_* settings from")
+    parser.add_argument("--slaves", type=int, default=None, help="Number of simulated slaves (default: pack value or 2)")
+    parser.add_argument("--rounds", type=int, default=10, help="Handshake rounds to run")
+    parser.add_argument("--heartbeat-interval", type=float, default=None, help="Heartbeat interval (s) during each round")
+    parser.add_argument("--heartbeats", type=int, default=3, help="Heartbeats per slave per round")
+    parser.add_argument("--cpu-load", type=int, default=0, help="Number of CPU-spinning background threads")
+    parser.add_argument("--timeout", type=float, default=None, help="Handshake timeout (s)")
+    args = parser.parse_args(argv)
+
+    pack: dict = {}
+    if args.pack:
+        pack = json.loads(Path(args.pack).read_text(encoding="utf-8"))
+        if pack.get("session_sync_role") != "master":
+            parser.error(f"{args.pack} is not a session sync master pack")
+
+    slaves = _first_set(args.slaves, pack.get("session_sync_expected_slaves"), 2)
+    heartbeat_interval = _first_set(args.heartbeat_interval, pack.get("session_sync_heartbeat_interval_s"))
+    timeout = _first_set(args.timeout, pack.get("session_sync_timeout_s"), 30.0)
+    if slaves < 1:
+        parser.error(f"need at least one slave, got {slaves}")
+    if timeout <= 0:
+        parser.error(f"handshake timeout must be positive, got {timeout}")
+    tolerance_ms = pack.get("session_sync_clock_offset_tolerance_ms")
+
+    stop = threading.Event()
+    load_threads = [threading.Thread(target=_spin, args=(stop,), daemon=True) for _ in range(args.cpu_load)]
+    for t in load_threads:
+        t.start()
+
+    handshake: list[float] = []
+    skew: list[float] = []
+    offsets: list[float] = []
+    try:
+        for _ in range(args.rounds):
+            result = asyncio.run(
+                _run_round(
+                    slaves=slaves,
+                    heartbeat_interval_s=heartbeat_interval,
+                    heartbeats=args.heartbeats,
+                    timeout_s=timeout,
+                )
+            )
+            handshake.extend(result.handshake_ms)
+            skew.append(result.start_skew_ms)
+            offsets.extend(abs(o) for o in result.clock_offset_ms)
+    finally:
+        stop.set()
+
+    print(f"master + {slaves} slave(s), {args.rounds} round(s), cpu_load={args.cpu_load}")
+    print(_summary("handshake", handshake))
+    print(_summary("start skew", skew))
+    print(_summary("|clock offset|", offsets))
+    if tolerance_ms is not None:
+        worst = max(offsets, default=0.0)
+        verdict = "within" if worst <= tolerance_ms else "EXCEEDS"
+        print(f"worst clock offset {worst:.3f} ms {verdict} tolerance {tolerance_ms} ms")
+        return 0 if worst <= tolerance_ms else 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
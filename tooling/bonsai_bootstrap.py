@@ -0,0 +1,231 @@
+"""Reference Bonsai environment bootstrap with a commit-keyed stamp (`bonsai_bootstrap_cache`).
+
+`bonsai_setup_script` (typically `bonsai/setup.cmd`) downloads Bonsai and restores the
+packages listed in `Bonsai.config` into the `Packages` folder next to `Bonsai.exe`.
+That only needs to happen when the checkout or the package list changes, so the bootstrap
+key is
+
+    sha256(repository_commit_hash, sha256(Bonsai.config))
+
+and a stamp file recording the key is written after a successful setup. On the next
+launch setup is skipped when the stamp matches and `Bonsai.exe` exists. With
+`package_cache_dir` set, restored `Packages` folders are also kept per Bonsai.config hash,
+so a fresh checkout with the same package list is seeded by copying instead of restoring.
+
+This module is dependency-free (stdlib only).
+
+Run from repo root:
+    python ./tooling/bonsai_bootstrap.py status --param ./packs/projects/predictive_processing/behavior/day1.json
+    python ./tooling/bonsai_bootstrap.py run --param ./packs/projects/predictive_processing/behavior/day1.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pack_entries import is_pinned_commit
+
+
+CONFIG_NAME = "Bonsai.config"
+STAMP_NAME = ".bootstrap_stamp.json"
+PACKAGES_DIR = "Packages"
+
+
+def check_bonsai_settings(payload: dict[str, Any]) -> list[str]:
+    """Per-pack rules for bonsai_bootstrap_cache; returns a list of problems."""
+
+    cache = payload.get("bonsai_bootstrap_cache")
+    if cache is None:
+        return []
+    if not isinstance(cache, dict):
+        return ["bonsai_bootstrap_cache must be an object"]
+    if cache.get("enabled", True) is False:
+        return []
+    problems: list[str] = []
+    if not payload.get("bonsai_setup_script"):
+        problems.append("bonsai_bootstrap_cache requires bonsai_setup_script")
+    if not is_pinned_commit(payload.get("repository_commit_hash")):
+        problems.append(
+            "bonsai_bootstrap_cache requires a pinned 40-character repository_commit_hash, "
+            f"got {payload.get('repository_commit_hash')!r}"
+        )
+    return problems
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bootstrap_key(commit: str, config_hash: str) -> str:
+    return hashlib.sha256(f"{commit.lower()}\n{config_hash}".encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class BootstrapPlan:
+    repo_path: Path
+    exe_path: Path
+    setup_script: Path
+    config_path: Path
+    stamp_path: Path
+    package_cache_dir: Path | None
+    commit: str
+
+    @classmethod
+    def from_params(cls, payload: dict[str, Any], repo_path: Path | None = None) -> "BootstrapPlan":
+        repo = Path(repo_path or payload.get("local_repository_path") or ".")
+        cache = payload.get("bonsai_bootstrap_cache") or {}
+
+        def _resolve(value: str) -> Path:
+            path = Path(value)
+            return path if path.is_absolute() else repo / path
+
+        exe = _resolve(str(payload.get("bonsai_exe_path") or "bonsai/Bonsai.exe"))
+        package_cache = cache.get("package_cache_dir")
+        return cls(
+            repo_path=repo,
+            exe_path=exe,
+            setup_script=_resolve(str(payload.get("bonsai_setup_script") or "bonsai/setup.cmd")),
+            config_path=_resolve(cache["config_path"]) if cache.get("config_path") else exe.parent / CONFIG_NAME,
+            stamp_path=_resolve(cache["stamp_path"]) if cache.get("stamp_path") else exe.parent / STAMP_NAME,
+            package_cache_dir=Path(package_cache) if package_cache else None,
+            commit=str(payload.get("repository_commit_hash") or ""),
+        )
+
+    def config_hash(self) -> str:
+        return _file_sha256(self.config_path) if self.config_path.is_file() else ""
+
+    def key(self) -> str:
+        return bootstrap_key(self.commit, self.config_hash())
+
+    def is_current(self) -> bool:
+        """True when the stamp records the current key and Bonsai.exe is present."""
+
+        if not self.exe_path.is_file():
+            return False
+        try:
+            stamp = json.loads(self.stamp_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        return stamp.get("key") == self.key()
+
+
+def _write_stamp(plan: BootstrapPlan, *, source: str) -> None:
+    stamp = {
+        "key": plan.key(),
+        "repository_commit_hash": plan.commit,
+        "config_sha256": plan.config_hash(),
+        "source": source,
+        "created_at": time.time(),
+    }
+    plan.stamp_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = plan.stamp_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(stamp, indent=2), encoding="utf-8")
+    os.replace(tmp, plan.stamp_path)
+
+
+def _cached_packages(plan: BootstrapPlan) -> Path | None:
+    config_hash = plan.config_hash()
+    if plan.package_cache_dir is None or not config_hash:
+        return None
+    return plan.package_cache_dir / config_hash / PACKAGES_DIR
+
+
+def _run_setup(plan: BootstrapPlan) -> None:
+    script = plan.setup_script
+    cmd = ["cmd", "/c", str(script)] if script.suffix.lower() in (".cmd", ".bat") else [str(script)]
+    subprocess.run(cmd, cwd=script.parent, check=True)
+
+
+def bootstrap(plan: BootstrapPlan, *, force: bool = False) -> str:
+    """Bootstrap the Bonsai environment if needed; returns 'current', 'cache' or 'setup'."""
+
+    if not force and plan.is_current():
+        return "current"
+
+    packages = plan.exe_path.parent / PACKAGES_DIR
+    cached = _cached_packages(plan)
+    if not force and cached is not None and cached.is_dir() and plan.exe_path.is_file():
+        shutil.rmtree(packages, ignore_errors=True)
+        shutil.copytree(cached, packages)
+        _write_stamp(plan, source="cache")
+        return "cache"
+
+    _run_setup(plan)
+    if cached is not None and packages.is_dir() and not cached.is_dir():
+        # Copy into a staging sibling and rename, so concurrent launches never see a partial cache.
+        staging = cached.parent / f".{PACKAGES_DIR}.{os.getpid()}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        shutil.copytree(packages, staging)
+        try:
+            os.replace(staging, cached)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+    _write_stamp(plan, source="setup")
+    return "setup"
+
+
+def _load_plan(args: argparse.Namespace) -> tuple[dict[str, Any], BootstrapPlan]:
+    payload = json.loads(Path(args.param).read_text(encoding="utf-8"))
+    return payload, BootstrapPlan.from_params(payload, Path(args.repo_path) if args.repo_path else None)
+
+
+def _cmd_status(args: argparse.Namespace) -> int:
+    payload, plan = _load_plan(args)
+    for problem in check_bonsai_settings(payload):
+        print(f"WARN {problem}")
+    print(f"key     {plan.key()}")
+    print(f"config  {plan.config_path} ({'found' if plan.config_path.is_file() else 'missing'})")
+    print(f"stamp   {plan.stamp_path}: {'current' if plan.is_current() else 'stale or missing'}")
+    cached = _cached_packages(plan)
+    if cached is not None:
+        print(f"cache   {cached}: {'present' if cached.is_dir() else 'empty'}")
+    return 0
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    payload, plan = _load_plan(args)
+    problems = check_bonsai_settings(payload)
+    if problems:
+        print("FAIL " + "; ".join(problems), file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    outcome = bootstrap(plan, force=args.force)
+    print(f"{outcome}: {plan.exe_path.parent} ({time.perf_counter() - start:.1f}s)")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bootstrap a Bonsai environment, skipping setup when the stamp matches")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    status = sub.add_parser("status", help="Show the bootstrap key and whether the stamp is current")
+    status.add_argument("--param", type=str, required=True)
+    status.add_argument("--repo-path", type=str, default=None, help="Override local_repository_path")
+    status.set_defaults(func=_cmd_status)
+
+    run = sub.add_parser("run", help="Run bonsai_setup_script unless the stamp or package cache makes it unnecessary")
+    run.add_argument("--param", type=str, required=True)
+    run.add_argument("--repo-path", type=str, default=None, help="Override local_repository_path")
+    run.add_argument("--force", action="store_true", help="Run setup even if the stamp is current")
+    run.set_defaults(func=_cmd_run)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
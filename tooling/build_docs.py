@@ -20,6 +20,8 @@ from pathlib import Path
 from typing import Any, Iterable
 from urllib.parse import urlparse
 
+from module_registry import load_registry
+
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 PACKS_DIR = REPO_ROOT / "packs"
@@ -312,7 +314,7 @@ def main() -> int:
     packs_md = _render_packs_md(packs_dir=PACKS_DIR, repo_url=repo_url, repo_ref=repo_ref, repo_subdir=repo_subdir)
 
     schemas: list[DocItem] = []
-    schema_paths = sorted(TOOLING_DIR.glob("*.schema.json"))
+    schema_paths = [TOOLING_DIR / name for name in load_registry(TOOLING_DIR).schema_files()]
     for s in schema_paths:
         data = _read_json(s)
         title, desc = _extract_title_and_description(data, fallback_title=s.stem)
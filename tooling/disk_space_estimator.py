@@ -0,0 +1,167 @@
+"""Shared estimator for `disk_space_check` free-space requirements.
+
+A `disk_space_check` entry is either static (`required_free_gb` only) or
+rate-based (`data_rates_mb_per_s` declared). In rate-based mode:
+
+    required = sum(rates) [MB/s] * duration [s] * safety_factor
+
+(converted from MB to GiB). The estimate replaces `required_free_gb`, which is
+optional in this mode and only used when no session duration can be found.
+
+The duration comes from the entry's `session_duration`, falling back to the
+pack's `script_parameters` (`stimulus_table_duration`, then `DueTime`).
+Durations must be finite and non-negative.
+
+This module is dependency-free so the launcher and tooling can share it.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from pack_entries import LAUNCHER_MODULE, iter_pipeline_entries
+
+
+BYTES_PER_MB = 1_000_000
+BYTES_PER_GIB = 1024**3
+
+DEFAULT_SAFETY_FACTOR = 1.25
+
+# script_parameters keys that carry the expected session length, in priority order.
+DURATION_KEYS = ("stimulus_table_duration", "DueTime")
+
+
+@dataclass(frozen=True)
+class DiskSpaceEstimate:
+    pipeline_index: int
+    static_gb: float | None
+    duration_s: float | None
+    rates_mb_per_s: dict[str, float] = field(default_factory=dict)
+    safety_factor: float = DEFAULT_SAFETY_FACTOR
+    estimated_gb: float | None = None
+    notes: tuple[str, ...] = ()
+
+    @property
+    def rate_based(self) -> bool:
+        return bool(self.rates_mb_per_s)
+
+    @property
+    def required_gb(self) -> float | None:
+        """Effective requirement: the rate estimate, else the static value."""
+
+        return self.estimated_gb if self.estimated_gb is not None else self.static_gb
+
+
+def parse_duration_s(value: Any) -> float | None:
+    """Parse seconds (number or numeric string) or `[HH:]MM:SS[.fff]` into seconds.
+
+    Returns None for anything that is not a finite, non-negative duration.
+    """
+
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if math.isfinite(value) and value >= 0 else None
+    text = str(value).strip()
+    if not text or "{" in text:
+        # Unresolved placeholder; cannot be estimated statically.
+        return None
+    try:
+        numbers = [float(p) for p in text.split(":")]
+    except ValueError:
+        return None
+    if len(numbers) > 3 or not all(math.isfinite(n) and n >= 0 for n in numbers):
+        return None
+    seconds = 0.0
+    for number in numbers:
+        seconds = seconds * 60 + number
+    return seconds
+
+
+def session_duration_s(payload: dict[str, Any], params: dict[str, Any]) -> float | None:
+    """Resolve the expected session duration for a disk_space_check entry."""
+
+    declared = parse_duration_s(params.get("session_duration"))
+    if declared is not None:
+        return declared
+    script_parameters = payload.get("script_parameters")
+    if isinstance(script_parameters, dict):
+        for key in DURATION_KEYS:
+            duration = parse_duration_s(script_parameters.get(key))
+            if duration is not None:
+                return duration
+    return None
+
+
+def estimate_gb(rates_mb_per_s: dict[str, float], duration_s: float, safety_factor: float) -> float:
+    total_bytes = sum(rates_mb_per_s.values()) * BYTES_PER_MB * duration_s * safety_factor
+    return total_bytes / BYTES_PER_GIB
+
+
+def _disk_space_check_entries(payload: dict[str, Any]) -> Iterable[tuple[int, dict[str, Any]]]:
+    for _, idx, entry in iter_pipeline_entries(
+        payload, module_path="disk_space_check", module_type=LAUNCHER_MODULE, pipelines=("pre_acquisition_pipeline",)
+    ):
+        params = entry.get("module_parameters")
+        yield idx, params if isinstance(params, dict) else {}
+
+
+def estimate_entry(payload: dict[str, Any], params: dict[str, Any], *, pipeline_index: int = 0) -> DiskSpaceEstimate:
+    """Estimate the requirement for one disk_space_check `module_parameters` object."""
+
+    static = params.get("required_free_gb")
+    static_gb = float(static) if isinstance(static, (int, float)) and not isinstance(static, bool) else None
+    safety_factor = params.get("safety_factor", DEFAULT_SAFETY_FACTOR)
+    if not isinstance(safety_factor, (int, float)) or safety_factor < 1:
+        safety_factor = DEFAULT_SAFETY_FACTOR
+
+    raw_rates = params.get("data_rates_mb_per_s")
+    rates: dict[str, float] = {}
+    if isinstance(raw_rates, dict):
+        rates = {str(k): float(v) for k, v in raw_rates.items() if isinstance(v, (int, float)) and not isinstance(v, bool)}
+
+    duration = session_duration_s(payload, params)
+    notes: list[str] = []
+    estimated: float | None = None
+    if rates:
+        if duration is None:
+            notes.append("data rates declared but no session duration found; using required_free_gb")
+        else:
+            estimated = estimate_gb(rates, duration, float(safety_factor))
+
+    return DiskSpaceEstimate(
+        pipeline_index=pipeline_index,
+        static_gb=static_gb,
+        duration_s=duration,
+        rates_mb_per_s=rates,
+        safety_factor=float(safety_factor),
+        estimated_gb=estimated,
+        notes=tuple(notes),
+    )
+
+
+def estimate_pack(payload: dict[str, Any]) -> list[DiskSpaceEstimate]:
+    """Estimate every disk_space_check entry in a pack's pre-acquisition pipeline."""
+
+    return [estimate_entry(payload, params, pipeline_index=idx) for idx, params in _disk_space_check_entries(payload)]
+
+
+def check_disk_space_check(payload: dict[str, Any]) -> list[str]:
+    """Per-pack rules for disk_space_check entries; returns a list of problems."""
+
+    problems: list[str] = []
+    for idx, params in _disk_space_check_entries(payload):
+        where = f"pre_acquisition_pipeline[{idx}].module_parameters"
+        declared = params.get("session_duration")
+        placeholder = isinstance(declared, str) and "{" in declared
+        if declared is not None and not placeholder and parse_duration_s(declared) is None:
+            problems.append(f"{where}.session_duration: {declared!r} is not a finite, non-negative duration")
+        estimate = estimate_entry(payload, params, pipeline_index=idx)
+        if estimate.required_gb is None:
+            if estimate.rate_based:
+                problems.append(f"{where}: data_rates_mb_per_s without a session duration requires required_free_gb")
+            else:
+                problems.append(f"{where}: requires required_free_gb or data_rates_mb_per_s")
+    return problems
@@ -12,9 +12,51 @@ from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
 from typing import Any, Type
 
+from module_registry import ModuleRegistry, build_registry, write_registry
+
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
+# Non-module models exported alongside the launcher/module schemas:
+# (model file, model class, schema file, title, description)
+SUPPORT_MODELS: list[tuple[str, str, str, str, str]] = [
+    (
+        "model_routing_manifest.py",
+        "RoutingManifest",
+        "model_routing_manifest.schema.json",
+        "Routing Manifest (Pydantic)",
+        "SLAP2 routing manifest handed from slap2_meta_annotator and the slap2_*_annotator modules to session_archiver.",
+    ),
+    (
+        "model_routing_manifest.py",
+        "RoutingManifestRecord",
+        "model_routing_manifest_record.schema.json",
+        "Routing Manifest Record (Pydantic)",
+        "One routed file in a SLAP2 routing manifest; each line of a JSON Lines manifest is one record.",
+    ),
+    (
+        "model_rig.py",
+        "RigParams",
+        "model_rig.schema.json",
+        "Rig Parameters (Pydantic)",
+        "Rig registry file (rigs/<rig_id>.json) providing values for {rig_param:...} placeholders in packs.",
+    ),
+    (
+        "model_archive_job.py",
+        "ArchiveJob",
+        "model_archive_job.schema.json",
+        "Archive Job (Pydantic)",
+        "Queued session_archiver job in an archive spool directory, drained by tooling/archive_queue.py.",
+    ),
+    (
+        "model_module_telemetry.py",
+        "ModuleTelemetryRecord",
+        "model_module_telemetry.schema.json",
+        "Module Telemetry Record (Pydantic)",
+        "One pipeline module run; each line of launcher_metadata/module_telemetry.jsonl is one record.",
+    ),
+]
+
 
 def _load_module(py_path: Path):
     spec = spec_from_file_location(py_path.stem, py_path)
@@ -25,43 +67,6 @@ def _load_module(py_path: Path):
     return module
 
 
-def _iter_module_model_files(*, tooling_dir: Path) -> list[Path]:
-    """Discover module model files.
-
-    Convention:
-    - Launcher model: tooling/model_launcher.py
-    - Module models: tooling/model_*.py defining a `Parameters` Pydantic model
-    """
-
-    paths = sorted(tooling_dir.glob("model_*.py"))
-    return [p for p in paths if p.name != "model_launcher.py" and p.is_file()]
-
-
-def _infer_module_name(py_path: Path) -> str:
-    stem = py_path.stem
-    if stem.startswith("model_"):
-        return stem[len("model_") :]
-    return stem
-
-
-def _module_description(module: Any, fallback: str) -> str:
-    # Optional per-module constant
-    desc = getattr(module, "MODULE_DESCRIPTION", None)
-    if isinstance(desc, str) and desc.strip():
-        return desc.strip()
-
-    # Else, module docstring (first paragraph)
-    doc = getattr(module, "__doc__", None)
-    if isinstance(doc, str):
-        doc = doc.strip()
-        if doc:
-            first_para = doc.split("\n\n", 1)[0].replace("\n", " ").strip()
-            if first_para:
-                return first_para
-
-    return fallback
-
-
 def _write_schema_json(*, path: Path, schema: dict[str, Any], schema_id: str, title: str, description: str) -> None:
     import json
 
@@ -86,31 +91,32 @@ def main() -> None:
     if hasattr(launcher_model, "model_rebuild"):
         launcher_model.model_rebuild(force=True, _types_namespace=launcher_module.__dict__)
 
-    # Modules (auto-discovered)
+    # Modules, from the model files (parsed, not imported); each model is imported only to export it.
     tooling_dir = REPO_ROOT / "tooling"
-    module_model_files = _iter_module_model_files(tooling_dir=tooling_dir)
-
-    for py_path in module_model_files:
-        module = _load_module(py_path)
-        model = getattr(module, "Parameters", None)
-        if model is None:
-            # Not a module-parameters model file; ignore.
-            continue
-
-        module_name = _infer_module_name(py_path)
-        module_desc = _module_description(
-            module,
-            fallback="Module parameters schema generated from Pydantic.",
+    registry = ModuleRegistry(build_registry(tooling_dir), tooling_dir)
+
+    for module_name, entry in registry.modules.items():
+        model = registry.model(module_name)
+        module_desc = entry.description or "Module parameters schema generated from Pydantic."
+        _write_schema_json(
+            path=tooling_dir / entry.schema_file,
+            schema=model.model_json_schema(),
+            schema_id=f"https://example.invalid/openscope-params/tooling/{entry.schema_file}",
+            title=f"Module Parameters: {module_name} (Pydantic)",
+            description=f"Generated from Pydantic model {entry.model_file}:Parameters. {module_desc}",
         )
 
+    for file_name, class_name, schema_name, title, description in SUPPORT_MODELS:
+        module = _load_module(tooling_dir / file_name)
+        model = getattr(module, class_name)
         if hasattr(model, "model_rebuild"):
             model.model_rebuild(force=True, _types_namespace=module.__dict__)
         _write_schema_json(
-            path=py_path.with_suffix(".schema.json"),
+            path=tooling_dir / schema_name,
             schema=model.model_json_schema(),
-            schema_id=f"https://example.invalid/openscope-params/tooling/{py_path.stem}.schema.json",
-            title=f"Module Parameters: {module_name} (Pydantic)",
-            description=f"Generated from Pydantic model {py_path.name}:Parameters. {module_desc}",
+            schema_id=f"https://example.invalid/openscope-params/tooling/{schema_name}",
+            title=title,
+            description=description,
         )
 
     _write_schema_json(
@@ -125,6 +131,9 @@ def main() -> None:
         ),
     )
 
+    # Refresh schema hashes in the registry now that every schema is written.
+    write_registry(build_registry(tooling_dir), tooling_dir)
+
     print("Export complete.")
 
 
@@ -0,0 +1,176 @@
+"""Compatibility matrix of param packs x openscope-experimental-launcher releases.
+
+Every pack pins `launcher_version` as a PEP 440 specifier set. The catalog only uses a
+handful of distinct specifiers, so each unique specifier is parsed once and evaluated
+once per version; the result is stored as a bitmask (bit i = compatible with version i)
+and packs just point at their specifier's mask. Packs without `launcher_version` run on
+every release.
+
+The launcher can filter its pack picker at startup with:
+
+    matrix = CompatibilityMatrix.build(payloads_by_name, [launcher.__version__])
+    runnable = matrix.compatible(launcher.__version__)
+
+Requires `packaging` (see requirements-tooling.txt).
+
+Run from repo root:
+    python ./tooling/launcher_compat.py --versions 0.2.6 0.2.7 0.3.0
+    python ./tooling/launcher_compat.py --pypi --candidate 0.3.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from packaging.version import InvalidVersion, Version
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PYPI_URL = "https://pypi.org/pypi/openscope-experimental-launcher/json"
+
+ANY_VERSION = ""
+
+
+@dataclass
+class CompatibilityMatrix:
+    versions: list[Version]
+    # Unique specifier text -> bitmask over `versions`.
+    masks: dict[str, int]
+    # Pack name -> specifier text (ANY_VERSION when unpinned).
+    pack_specifiers: dict[str, str]
+    invalid: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, packs: Mapping[str, dict[str, Any]], versions: Iterable[str | Version]) -> "CompatibilityMatrix":
+        parsed_versions = sorted({v if isinstance(v, Version) else Version(str(v)) for v in versions})
+        pack_specifiers: dict[str, str] = {}
+        for name, payload in packs.items():
+            spec = payload.get("launcher_version") if isinstance(payload, dict) else None
+            pack_specifiers[name] = str(spec).strip() if spec else ANY_VERSION
+
+        masks: dict[str, int] = {}
+        invalid: dict[str, str] = {}
+        full = (1 << len(parsed_versions)) - 1
+        for text in set(pack_specifiers.values()):
+            if text == ANY_VERSION:
+                masks[text] = full
+                continue
+            try:
+                spec_set = SpecifierSet(text)
+            except InvalidSpecifier as exc:
+                invalid[text] = str(exc)
+                masks[text] = 0
+                continue
+            mask = 0
+            for bit, version in enumerate(parsed_versions):
+                if spec_set.contains(version, prereleases=True):
+                    mask |= 1 << bit
+            masks[text] = mask
+        return cls(versions=parsed_versions, masks=masks, pack_specifiers=pack_specifiers, invalid=invalid)
+
+    def _bit(self, version: str | Version) -> int:
+        parsed = version if isinstance(version, Version) else Version(str(version))
+        try:
+            return 1 << self.versions.index(parsed)
+        except ValueError:
+            raise KeyError(f"version {parsed} is not in the matrix") from None
+
+    def compatible(self, version: str | Version) -> list[str]:
+        """Packs that the given launcher version can run."""
+
+        bit = self._bit(version)
+        return [name for name, text in self.pack_specifiers.items() if self.masks[text] & bit]
+
+    def incompatible(self, version: str | Version) -> list[str]:
+        bit = self._bit(version)
+        return [name for name, text in self.pack_specifiers.items() if not self.masks[text] & bit]
+
+    def row(self, pack: str) -> list[bool]:
+        mask = self.masks[self.pack_specifiers[pack]]
+        return [bool(mask & (1 << bit)) for bit in range(len(self.versions))]
+
+
+def load_packs(root: Path) -> dict[str, dict[str, Any]]:
+    packs: dict[str, dict[str, Any]] = {}
+    for path in sorted(root.rglob("*.json")):
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            continue
+        if isinstance(payload, dict) and "$schema" in payload:
+            name = path.relative_to(REPO_ROOT).as_posix() if path.is_relative_to(REPO_ROOT) else str(path)
+            packs[name] = payload
+    return packs
+
+
+def fetch_released_versions(url: str = PYPI_URL, timeout_s: float = 10.0) -> list[str]:
+    with urlopen(url, timeout=timeout_s) as resp:
+        releases = json.loads(resp.read().decode("utf-8")).get("releases", {})
+    versions: list[str] = []
+    for text, files in releases.items():
+        if not files or all(f.get("yanked") for f in files):
+            continue
+        try:
+            Version(text)
+        except InvalidVersion:
+            continue
+        versions.append(text)
+    return versions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Report which packs each launcher release can run")
+    parser.add_argument("--root", type=str, default=str(REPO_ROOT / "packs"), help="Packs root to scan")
+    parser.add_argument("--versions", nargs="*", default=[], help="Launcher versions to include")
+    parser.add_argument("--pypi", action="store_true", help="Also include released versions from PyPI")
+    parser.add_argument("--pypi-url", type=str, default=PYPI_URL, help="PyPI (or mirror) JSON API URL for the launcher")
+    parser.add_argument("--candidate", type=str, default=None, help="Only report packs incompatible with this version")
+    args = parser.parse_args(argv)
+    for flag, values in (("--versions", args.versions), ("--candidate", [args.candidate] if args.candidate else [])):
+        for text in values:
+            try:
+                Version(text)
+            except InvalidVersion:
+                parser.error(f"{flag}: {text!r} is not a valid PEP 440 version")
+
+    versions = list(args.versions)
+    if args.pypi:
+        try:
+            versions += fetch_released_versions(args.pypi_url)
+        except (URLError, ValueError) as exc:
+            print(f"FAIL could not fetch launcher releases from {args.pypi_url}: {exc}")
+            return 2
+    if args.candidate:
+        versions.append(args.candidate)
+    if not versions:
+        parser.error("give --versions, --pypi and/or --candidate")
+
+    matrix = CompatibilityMatrix.build(load_packs(Path(args.root).resolve()), versions)
+    for text, error in sorted(matrix.invalid.items()):
+        print(f"FAIL invalid launcher_version {text!r}: {error}")
+
+    if args.candidate:
+        incompatible = matrix.incompatible(args.candidate)
+        for name in incompatible:
+            print(f"INCOMPATIBLE {name} ({matrix.pack_specifiers[name] or 'any'})")
+        print(f"{len(matrix.pack_specifiers) - len(incompatible)}/{len(matrix.pack_specifiers)} pack(s) run on {args.candidate}.")
+        return 1 if incompatible or matrix.invalid else 0
+
+    width = max((len(name) for name in matrix.pack_specifiers), default=4)
+    header = " ".join(f"{str(v):>8}" for v in matrix.versions)
+    print(f"{'pack':<{width}}  {header}")
+    for name in matrix.pack_specifiers:
+        cells = " ".join(f"{'yes' if ok else '-':>8}" for ok in matrix.row(name))
+        print(f"{name:<{width}}  {cells}")
+    return 1 if matrix.invalid else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,233 @@
+"""Resolved, pre-validated lockfiles for param packs.
+
+`lock` validates each pack (same checks as validate.py), resolves its `$schema` and
+module schemas, substitutes `{rig_param:...}` placeholders for every rig that covers
+the pack, and writes one minified lockfile per pack (and rig):
+
+    locks/<pack path under packs/>[@<rig_id>].lock.json
+
+A lockfile carries the resolved params, the repository URL/commit, and the inputs the
+resolution depended on: the sha256 of every local file (the pack, the rig file, the
+launcher and module schema files), the hash of a remote `$schema` as fetched at lock
+time, and which schema file the module registry assigned to each pipeline module.
+`verify` only re-hashes those local files and re-reads the module registry, so a rig PC
+can check a lock without resolving schemas (no HTTP) or re-validating anything; a remote
+`$schema` stays pinned at its locked hash until `lock` is run again. Runtime placeholders
+such as `{subject_id}` are left for the launcher.
+
+Lockfiles are build artifacts; `locks/` is not committed.
+
+Run from repo root:
+    python ./tooling/lock_packs.py lock
+    python ./tooling/lock_packs.py verify
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from module_registry import ModuleRegistry, load_registry
+from pack_entries import iter_pipeline_entries
+from rig_registry import Rig, RigRegistry
+from validate import REPO_ROOT, _local_schema_path, _resolve_schema, iter_json_files, validate_param
+
+
+LOCK_VERSION = 2
+DEFAULT_LOCKS_DIR = REPO_ROOT / "locks"
+
+
+def _rel(path: Path) -> str:
+    return path.relative_to(REPO_ROOT).as_posix() if path.is_relative_to(REPO_ROOT) else path.as_posix()
+
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_sha256(path: Path) -> str:
+    return _sha256(path.read_bytes())
+
+
+def _schema_input(pack_path: Path, ref: str, inputs: dict[str, Any]) -> None:
+    """Record one schema ref: the local file's hash, or the fetched document's hash."""
+
+    local = _local_schema_path(pack_path, ref)
+    if local is not None:
+        inputs["files"][_rel(local)] = _file_sha256(local)
+    else:
+        inputs["remote"][ref] = _sha256(_canonical(_resolve_schema(pack_path, ref)))
+
+
+def lock_inputs(pack_path: Path, rig: Rig | None, modules: ModuleRegistry) -> dict[str, Any]:
+    """Everything a lock depends on: local file hashes, remote schema hashes, module schema files."""
+
+    inputs: dict[str, Any] = {"files": {}, "remote": {}, "modules": {}}
+    pack_bytes = pack_path.read_bytes()
+    inputs["files"][_rel(pack_path)] = _sha256(pack_bytes)
+    if rig is not None:
+        inputs["files"][_rel(rig.path)] = _file_sha256(rig.path)
+    payload = json.loads(pack_bytes)
+    _schema_input(pack_path, str(payload.get("$schema")), inputs)
+    for _, _, entry in iter_pipeline_entries(payload):
+        ref = entry.get("module_schema")
+        if ref:
+            _schema_input(pack_path, str(ref), inputs)
+            continue
+        module_path = entry.get("module_path")
+        if not isinstance(module_path, str):
+            continue
+        module = modules.get(module_path)
+        inputs["modules"][module_path] = module.schema_file if module is not None else None
+        if module is not None:
+            schema_path = modules.tooling_dir / module.schema_file
+            inputs["files"][_rel(schema_path)] = _file_sha256(schema_path)
+    return {key: dict(sorted(value.items())) for key, value in inputs.items()}
+
+
+def lock_path_for(pack_path: Path, packs_root: Path, locks_dir: Path, rig: Rig | None) -> Path:
+    rel = pack_path.relative_to(packs_root).with_suffix("")
+    suffix = f"@{rig.rig_id}" if rig is not None else ""
+    return locks_dir / rel.parent / f"{rel.name}{suffix}.lock.json"
+
+
+def build_lock(
+    pack_path: Path, rig: Rig | None, registry: RigRegistry, module_schemas: Mapping[str, dict], modules: ModuleRegistry
+) -> dict[str, Any]:
+    validate_param(pack_path, module_schemas)
+    inputs = lock_inputs(pack_path, rig, modules)
+    payload = json.loads(pack_path.read_text(encoding="utf-8"))
+    params = registry.resolve(payload, rig.rig_id) if rig is not None else payload
+    return {
+        "lock_version": LOCK_VERSION,
+        "inputs_sha256": _sha256(_canonical(inputs)),
+        "pack": _rel(pack_path),
+        "rig_id": rig.rig_id if rig is not None else None,
+        "repository_url": payload.get("repository_url"),
+        "repository_commit_hash": payload.get("repository_commit_hash"),
+        "inputs": inputs,
+        "params": params,
+    }
+
+
+def write_lock(path: Path, lock: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(_canonical(lock))
+    os.replace(tmp, path)
+
+
+def verify_lock(lock_path: Path, modules: ModuleRegistry) -> str | None:
+    """Return None when the lock is current, otherwise the reason it is stale.
+
+    Compares the hashes stored in the lock with the current local files; nothing is
+    resolved or fetched.
+    """
+
+    lock = json.loads(lock_path.read_text(encoding="utf-8"))
+    if lock.get("lock_version") != LOCK_VERSION:
+        return f"lock_version {lock.get('lock_version')!r} != {LOCK_VERSION}"
+    inputs = lock.get("inputs") or {}
+    if _sha256(_canonical(inputs)) != lock.get("inputs_sha256"):
+        return "inputs_sha256 does not match the recorded inputs"
+    for module_path, schema_file in inputs.get("modules", {}).items():
+        module = modules.get(module_path)
+        if (module.schema_file if module is not None else None) != schema_file:
+            return f"module {module_path!r} now validates against {module.schema_file if module else None!r}"
+    for rel, digest in inputs.get("files", {}).items():
+        path = REPO_ROOT / rel
+        if not path.is_file():
+            return f"{rel} no longer exists"
+        if _file_sha256(path) != digest:
+            return f"{rel} changed since the lock was written"
+    return None
+
+
+def _targets(paths: list[Path], registry: RigRegistry) -> list[tuple[Path, Rig | None]]:
+    targets: list[tuple[Path, Rig | None]] = []
+    for path in paths:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            targets.append((path, None))
+            continue
+        rigs = registry.rigs_for_pack(_rel(path), payload) if isinstance(payload, dict) else []
+        if rigs:
+            targets.extend((path, rig) for rig in rigs)
+        else:
+            targets.append((path, None))
+    return targets
+
+
+def _cmd_lock(args: argparse.Namespace) -> int:
+    packs_root = Path(args.root).resolve()
+    locks_dir = Path(args.locks_dir).resolve()
+    registry = RigRegistry.load(Path(args.rigs).resolve())
+    modules = load_registry(REPO_ROOT / "tooling")
+    module_schemas = modules.schemas()
+    paths = [Path(args.param).resolve()] if args.param else sorted(iter_json_files(packs_root))
+
+    failures = 0
+    for pack_path, rig in _targets(paths, registry):
+        out = lock_path_for(pack_path, packs_root, locks_dir, rig)
+        try:
+            write_lock(out, build_lock(pack_path, rig, registry, module_schemas, modules))
+            print(f"OK   {_rel(out)}")
+        except Exception as exc:
+            failures += 1
+            print(f"FAIL {_rel(pack_path)}{f' @ {rig.rig_id}' if rig else ''}: {exc}")
+    return 1 if failures else 0
+
+
+def _cmd_verify(args: argparse.Namespace) -> int:
+    locks_dir = Path(args.locks_dir).resolve()
+    modules = load_registry(REPO_ROOT / "tooling")
+    lock_paths = [Path(args.lock).resolve()] if args.lock else sorted(locks_dir.rglob("*.lock.json"))
+    if not lock_paths:
+        print(f"No lockfiles found under {locks_dir}.")
+        return 1
+
+    stale = 0
+    for lock_path in lock_paths:
+        try:
+            reason = verify_lock(lock_path, modules)
+        except Exception as exc:
+            reason = str(exc)
+        if reason:
+            stale += 1
+            print(f"STALE {_rel(lock_path)}: {reason}")
+        else:
+            print(f"OK    {_rel(lock_path)}")
+    return 1 if stale else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Write and verify resolved pack lockfiles")
+    parser.add_argument("--locks-dir", type=str, default=str(DEFAULT_LOCKS_DIR), help="Lockfile directory (default: ./locks)")
+    parser.add_argument("--rigs", type=str, default=str(REPO_ROOT / "rigs"), help="Rig registry directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    lock = sub.add_parser("lock", help="Validate, resolve and lock packs")
+    lock.add_argument("--root", type=str, default=str(REPO_ROOT / "packs"), help="Packs root")
+    lock.add_argument("--param", type=str, default=None, help="Lock a single pack")
+    lock.set_defaults(func=_cmd_lock)
+
+    verify = sub.add_parser("verify", help="Check that lockfiles match the current packs, schemas and rigs")
+    verify.add_argument("--lock", type=str, default=None, help="Verify a single lockfile")
+    verify.set_defaults(func=_cmd_verify)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,224 @@
+"""MATLAB launcher settings checks and a stub shared-engine harness.
+
+`check_matlab_settings` mirrors the `matlab_*` rules of `model_launcher.LauncherParams`
+for the stdlib validator.
+
+The stub engine stands in for a shared MATLAB engine so the attach-or-start policy can be
+exercised without MATLAB: it is a separate process that sleeps for a configurable
+start-up (and warm-up) time, then serves sessions over localhost TCP and advertises
+itself in a registry directory, the way `matlab.engine.shareEngine` names are discovered
+with `matlab.engine.find_matlab()`.
+
+    engine = acquire_engine("slap2_launcher", policy="attach_or_start", registry_dir=tmp)
+    engine.run_session()
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+ENGINE_POLICIES = ("attach", "attach_or_start", "start")
+DEFAULT_POLICY = "attach_or_start"
+
+
+def check_matlab_settings(payload: dict[str, Any]) -> list[str]:
+    """Per-pack rules for matlab_* keys; returns a list of problems."""
+
+    problems: list[str] = []
+    if payload.get("launcher") == "matlab":
+        for key in ("matlab_engine_name", "matlab_entrypoint"):
+            if not payload.get(key):
+                problems.append(f"launcher 'matlab' requires {key}")
+    policy = payload.get("matlab_engine_policy")
+    if policy is not None and policy not in ENGINE_POLICIES:
+        problems.append(f"matlab_engine_policy must be one of {list(ENGINE_POLICIES)}, got {policy!r}")
+    max_sessions = payload.get("matlab_max_sessions_per_engine")
+    if max_sessions is not None and (not isinstance(max_sessions, int) or isinstance(max_sessions, bool) or max_sessions < 1):
+        problems.append("matlab_max_sessions_per_engine must be an integer >= 1")
+    idle = payload.get("matlab_engine_idle_timeout_s")
+    if idle is not None and (not isinstance(idle, (int, float)) or isinstance(idle, bool) or idle <= 0):
+        problems.append("matlab_engine_idle_timeout_s must be a positive number")
+    return problems
+
+
+# ---------------------------------------------------------------------------
+# Stub engine
+# ---------------------------------------------------------------------------
+
+
+def _registry_file(registry_dir: Path, name: str) -> Path:
+    return registry_dir / f"{name}.json"
+
+
+def _serve(name: str, registry_dir: Path, startup_s: float, warmup_s: float, idle_timeout_s: float | None, session_s: float) -> None:
+    time.sleep(startup_s + warmup_s)
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    server.settimeout(idle_timeout_s)
+    registry_dir.mkdir(parents=True, exist_ok=True)
+    entry = _registry_file(registry_dir, name)
+    tmp = entry.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"pid": os.getpid(), "port": server.getsockname()[1]}), encoding="utf-8")
+    os.replace(tmp, entry)
+
+    sessions = 0
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                return
+            with conn:
+                command = conn.makefile("r").readline().strip()
+                if command == "shutdown":
+                    conn.sendall(b"bye\n")
+                    return
+                if command == "session":
+                    time.sleep(session_s)
+                    sessions += 1
+                conn.sendall(f"{sessions}\n".encode("utf-8"))
+    finally:
+        server.close()
+        try:
+            entry.unlink()
+        except FileNotFoundError:
+            pass
+
+
+@dataclass
+class StubEngine:
+    name: str
+    port: int
+    started: bool
+
+    def _send(self, command: str, timeout_s: float = 30.0) -> str:
+        with socket.create_connection(("127.0.0.1", self.port), timeout=timeout_s) as conn:
+            conn.sendall(f"{command}\n".encode("utf-8"))
+            return conn.makefile("r").readline().strip()
+
+    def ping(self) -> int:
+        return int(self._send("ping"))
+
+    def run_session(self) -> int:
+        """Run one (simulated) session; returns the engine's session count."""
+
+        return int(self._send("session"))
+
+    def shutdown(self) -> None:
+        try:
+            self._send("shutdown", timeout_s=5.0)
+        except OSError:
+            pass
+
+
+def find_engine(name: str, registry_dir: Path) -> StubEngine | None:
+    """Attach to a running engine by name, or return None (like matlab.engine.find_matlab)."""
+
+    try:
+        info = json.loads(_registry_file(registry_dir, name).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    engine = StubEngine(name=name, port=int(info["port"]), started=False)
+    try:
+        engine.ping()
+    except OSError:
+        return None
+    return engine
+
+
+def start_engine(
+    name: str,
+    registry_dir: Path,
+    *,
+    startup_s: float,
+    warmup_s: float = 0.0,
+    idle_timeout_s: float | None = None,
+    session_s: float = 0.0,
+    wait_s: float = 600.0,
+) -> StubEngine:
+    """Start a stub engine process and wait until it is shared under `name`."""
+
+    registry_file = _registry_file(registry_dir, name)
+    try:
+        registry_file.unlink()
+    except FileNotFoundError:
+        pass
+    cmd = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--name", name,
+        "--registry-dir", str(registry_dir),
+        "--startup-s", str(startup_s),
+        "--warmup-s", str(warmup_s),
+        "--session-s", str(session_s),
+    ]
+    if idle_timeout_s:
+        cmd += ["--idle-timeout-s", str(idle_timeout_s)]
+    subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + wait_s
+    while time.monotonic() < deadline:
+        engine = find_engine(name, registry_dir)
+        if engine is not None:
+            engine.started = True
+            return engine
+        time.sleep(0.01)
+    raise TimeoutError(f"stub engine {name!r} did not start within {wait_s}s")
+
+
+def acquire_engine(
+    name: str,
+    *,
+    policy: str = DEFAULT_POLICY,
+    registry_dir: Path,
+    max_sessions: int | None = None,
+    **start_kwargs: Any,
+) -> StubEngine:
+    """Resolve `matlab_engine_policy` (and `matlab_max_sessions_per_engine`) to an engine handle."""
+
+    if policy not in ENGINE_POLICIES:
+        raise ValueError(f"unknown matlab_engine_policy {policy!r}")
+    if policy != "start":
+        engine = find_engine(name, registry_dir)
+        if engine is not None and max_sessions is not None and engine.ping() >= max_sessions:
+            # Recycle the engine; the next session gets a fresh one.
+            engine.shutdown()
+            engine = None
+            if policy == "attach":
+                raise RuntimeError(f"shared engine {name!r} reached {max_sessions} session(s) (policy 'attach')")
+        if engine is not None:
+            return engine
+        if policy == "attach":
+            raise RuntimeError(f"no shared engine named {name!r} is running (policy 'attach')")
+    else:
+        running = find_engine(name, registry_dir)
+        if running is not None:
+            running.shutdown()
+    return start_engine(name, registry_dir, **start_kwargs)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run a stub shared MATLAB engine (used by bench_matlab_engine.py)")
+    parser.add_argument("--name", required=True)
+    parser.add_argument("--registry-dir", required=True)
+    parser.add_argument("--startup-s", type=float, default=0.0)
+    parser.add_argument("--warmup-s", type=float, default=0.0)
+    parser.add_argument("--session-s", type=float, default=0.0)
+    parser.add_argument("--idle-timeout-s", type=float, default=None)
+    args = parser.parse_args(argv)
+    _serve(args.name, Path(args.registry_dir), args.startup_s, args.warmup_s, args.idle_timeout_s, args.session_s)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
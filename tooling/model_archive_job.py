@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+"""Pydantic model for queued archive jobs (`<archive_queue_dir>/<state>/<job file>.json`)."""
+
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ArchiveJob(BaseModel):
+    """One session_archiver run handed from the rig's post-acquisition pipeline to the archive worker."""
+
+    model_config = ConfigDict(extra="allow")
+
+    job_version: int = Field(default=1, ge=1, description="Job file format version.")
+    job_id: str = Field(..., description="Unique job identifier; also the stem of the job file name.")
+    created_at: str = Field(..., description="ISO 8601 timestamp when the job was enqueued.")
+    pack: str | None = Field(default=None, description="Pack that enqueued the job (repo-relative path), if known.")
+    priority: int = Field(
+        default=100,
+        ge=0,
+        le=9999,
+        description="Lower values are archived first; jobs with equal priority run in enqueue order.",
+    )
+    state: Literal["queued", "running", "done", "failed"] = Field(
+        default="queued",
+        description="Job state; always matches the spool subdirectory holding the file.",
+    )
+    attempts: int = Field(default=0, ge=0, description="Number of attempts started so far.")
+    max_retries: int = Field(default=3, ge=0, description="Retries after the first failed attempt before the job is failed.")
+    next_attempt_at: str | None = Field(
+        default=None,
+        description="ISO 8601 time before which a retried job is not picked up (exponential backoff).",
+    )
+    last_error: str | None = Field(default=None, description="Error message of the last failed attempt.")
+    worker: str | None = Field(default=None, description="host:pid of the worker running (or last running) the job.")
+    heartbeat_at: str | None = Field(
+        default=None,
+        description="ISO 8601 time the worker last reported progress; stale running jobs are re-queued.",
+    )
+    finished_at: str | None = Field(default=None, description="ISO 8601 time the job reached done or failed.")
+    bytes_copied: int | None = Field(default=None, ge=0, description="Bytes written to network_dir by the last attempt.")
+    module_parameters: dict = Field(
+        ...,
+        description="Resolved session_archiver parameters (placeholders substituted) the worker archives with.",
+    )
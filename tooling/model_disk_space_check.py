@@ -2,7 +2,7 @@ from __future__ import annotations
 
 """Pydantic model for module `disk_space_check` parameters."""
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 MODULE_DESCRIPTION = "Check that the session volume has enough free space before starting acquisition."
@@ -11,9 +11,13 @@ MODULE_DESCRIPTION = "Check that the session volume has enough free space before
 class Parameters(BaseModel):
     model_config = ConfigDict(extra="allow")
 
-    required_free_gb: float = Field(
+    required_free_gb: float | None = Field(
+        default=None,
         gt=0,
-        description="Minimum required free space (GiB).",
+        description=(
+            "Required free space (GiB). Required unless data_rates_mb_per_s is set; in rate-based mode the "
+            "estimate replaces it, and it is only used when no session duration can be found."
+        ),
         examples=[250],
     )
 
@@ -29,3 +33,33 @@ class Parameters(BaseModel):
         default=False,
         description="If true, allow operator prompt to continue even if below threshold.",
     )
+
+    # Rate-based mode: required space = sum(rates) * duration * safety_factor.
+    # See tooling/disk_space_estimator.py for the shared estimator.
+    data_rates_mb_per_s: dict[str, float] | None = Field(
+        default=None,
+        description=(
+            "Declared write rate per data stream in MB/s (e.g. SLAP2 dynamic data, behavior video cameras, "
+            "stimulus logs). When set, the required free space is estimated from rate x duration."
+        ),
+        examples=[{"slap2_dynamic": 400, "behavior_video": 45, "stimulus_log": 0.01}],
+    )
+    session_duration: str | float | None = Field(
+        default=None,
+        description=(
+            "Expected session duration, as seconds or HH:MM:SS. If omitted, it is read from "
+            "script_parameters (stimulus_table_duration, then DueTime)."
+        ),
+        examples=["02:00:00", 7200],
+    )
+    safety_factor: float = Field(
+        default=1.25,
+        ge=1,
+        description="Multiplier applied to the rate-based estimate to cover overhead and overruns.",
+    )
+
+    @model_validator(mode="after")
+    def _check_requirement(self) -> "Parameters":
+        if self.required_free_gb is None and not self.data_rates_mb_per_s:
+            raise ValueError("disk_space_check requires required_free_gb or data_rates_mb_per_s")
+        return self
@@ -2,7 +2,41 @@ from __future__ import annotations
 
 from typing import Annotated, Literal, Union
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class ScriptArtifactCache(BaseModel):
+    """Content-addressed cache for files a script_module call writes (see tooling/script_artifact_cache.py).
+
+    The key covers the placeholder-resolved function_args, so per-session arguments never share an entry.
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    enabled: bool = Field(default=True, description="If false, always run the script function.")
+    outputs: list[str] = Field(
+        ...,
+        min_length=1,
+        description=(
+            "function_args keys that name output files. They are excluded from the cache key; on a cache hit the "
+            "cached files are copied to these paths instead of calling the function."
+        ),
+        examples=[["output_path"]],
+    )
+    cache_dir: str | None = Field(
+        default=None,
+        description="Cache directory; defaults to the launcher's artifact cache under the user profile.",
+    )
+    max_size_gb: float | None = Field(
+        default=None,
+        gt=0,
+        description="Evict least-recently-used entries when the cache exceeds this size (GiB).",
+    )
+    max_age_days: float | None = Field(
+        default=None,
+        gt=0,
+        description="Evict entries not used within this many days.",
+    )
 
 
 class ScriptModuleParameters(BaseModel):
@@ -10,6 +44,112 @@ class ScriptModuleParameters(BaseModel):
 
     function: str | None = Field(default=None, description="Function name to invoke from the script module.")
     function_args: dict | None = Field(default=None, description="Arguments passed to the script function.")
+    execution: Literal["subprocess", "pooled"] | None = Field(
+        default=None,
+        description=(
+            "How to run the call: 'subprocess' starts a fresh interpreter per entry; 'pooled' runs it in a warm "
+            "worker from script_worker_pool (modules stay imported between calls)."
+        ),
+    )
+    timeout_s: float | None = Field(
+        default=None,
+        gt=0,
+        description="Per-call timeout in seconds; a pooled worker that exceeds it is terminated and replaced.",
+    )
+    cache: ScriptArtifactCache | None = Field(
+        default=None,
+        description=(
+            "Optional artifact cache. Key = repository_commit_hash + module_path + function + canonicalized "
+            "function_args (outputs excluded), computed after placeholders such as {subject_id} or {rig_param:...} "
+            "are resolved; requires a pinned repository_commit_hash."
+        ),
+    )
+
+
+class ScriptWorkerPool(BaseModel):
+    """Warm worker pool for `execution: "pooled"` script_module entries (see tooling/script_worker_pool.py)."""
+
+    model_config = ConfigDict(extra="allow")
+
+    max_workers: int = Field(default=1, ge=1, description="Workers per repository commit.")
+    preload_modules: list[str] = Field(
+        default_factory=list,
+        description="Modules imported when a worker starts (e.g. numpy, pandas), before the first call arrives.",
+        examples=[["numpy", "pandas"]],
+    )
+    idle_timeout_s: float | None = Field(
+        default=None,
+        gt=0,
+        description="Shut down workers idle for longer than this; omit to keep them for the launcher's lifetime.",
+    )
+    max_calls_per_worker: int | None = Field(
+        default=None,
+        ge=1,
+        description="Recycle a worker after this many calls to bound state leaking between calls.",
+    )
+
+
+class BonsaiBootstrapCache(BaseModel):
+    """Skip `bonsai_setup_script` when the environment is already bootstrapped (see tooling/bonsai_bootstrap.py)."""
+
+    model_config = ConfigDict(extra="allow")
+
+    enabled: bool = Field(default=True, description="If false, run bonsai_setup_script on every launch.")
+    config_path: str | None = Field(
+        default=None,
+        description="Bonsai.config whose contents select the package set; defaults to Bonsai.config next to bonsai_exe_path.",
+    )
+    stamp_path: str | None = Field(
+        default=None,
+        description=(
+            "Stamp file written after a successful setup; defaults to .bootstrap_stamp.json next to bonsai_exe_path. "
+            "Setup is skipped when it records the same repository_commit_hash + Bonsai.config hash."
+        ),
+    )
+    package_cache_dir: str | None = Field(
+        default=None,
+        description=(
+            "Optional shared package cache. Restored Packages folders are stored here per Bonsai.config hash and "
+            "copied into new checkouts instead of re-running package restore."
+        ),
+        examples=["C:/BonsaiPackageCache"],
+    )
+
+
+class BehaviorVideoCamera(BaseModel):
+    """One behavior-video camera, for the throughput budget (see tooling/video_budget.py)."""
+
+    model_config = ConfigDict(extra="allow")
+
+    name: str = Field(..., description="Camera name as used in script_parameters (e.g. Body, Face, Eye).")
+    exposure_param: str | None = Field(
+        default=None,
+        description="script_parameters key holding the exposure time in microseconds; defaults to ExposureTime<name>.",
+    )
+    frame_rate_param: str | None = Field(
+        default=None,
+        description="script_parameters key holding the frame rate in Hz; defaults to FrameRate<name>.",
+    )
+    width: int | None = Field(..., ge=1, description="Frame width in pixels; null until confirmed on the camera.")
+    height: int | None = Field(..., ge=1, description="Frame height in pixels; null until confirmed on the camera.")
+    bit_depth: Literal[8, 10, 12, 16] | None = Field(
+        default=8,
+        description="Bits per pixel as written (mono); null until confirmed on the camera.",
+    )
+    codec: Literal["raw", "ffv1", "mjpeg", "h264", "h265"] | None = Field(
+        default="raw",
+        description="Encoding used when writing video; selects a nominal compression ratio. Null until confirmed.",
+    )
+    compression_ratio: float | None = Field(
+        default=None,
+        ge=1,
+        description="Measured raw:encoded size ratio; overrides the codec's nominal ratio.",
+    )
+    readout_time_us: float = Field(
+        default=0,
+        ge=0,
+        description="Sensor readout/transfer time that must fit in the frame period next to the exposure.",
+    )
 
 
 class PipelineEntryObject(BaseModel):
@@ -80,6 +220,13 @@ class LauncherParams(BaseModel):
     repository_url: str | None = None
     repository_commit_hash: str | None = None
     local_repository_path: str | None = None
+    repository_cache_dir: str | None = Field(
+        default=None,
+        description=(
+            "Optional shared repository cache populated by tooling/prefetch_repositories.py. When set, the launcher "
+            "checks out repository_commit_hash from its local objects instead of cloning/fetching."
+        ),
+    )
 
     script_path: str | None = None
     script_parameters: dict | None = None
@@ -87,5 +234,148 @@ class LauncherParams(BaseModel):
     pre_acquisition_pipeline: list[PipelineEntry] | None = None
     post_acquisition_pipeline: list[PipelineEntry] | None = None
 
+    # Bonsai launcher: bonsai_setup_script restores Bonsai packages; with a bootstrap cache it
+    # only runs when the pinned commit or Bonsai.config changed.
+    bonsai_exe_path: str | None = Field(
+        default=None,
+        description="Bonsai.exe path, relative to local_repository_path unless absolute.",
+        examples=["bonsai/Bonsai.exe"],
+    )
+    bonsai_setup_script: str | None = Field(
+        default=None,
+        description="Script that bootstraps Bonsai and restores its packages, relative to local_repository_path.",
+        examples=["bonsai/setup.cmd"],
+    )
+    bonsai_bootstrap_cache: BonsaiBootstrapCache | None = Field(
+        default=None,
+        description=(
+            "Bootstrap cache keyed by repository_commit_hash + Bonsai.config hash; requires a pinned "
+            "40-character repository_commit_hash."
+        ),
+    )
+
+    # Behavior-video cameras: exposure/frame rate come from script_parameters; the budget
+    # check compares per-camera and aggregate MB/s with the disk write rate of each rig
+    # running the pack (rig_throughput in rigs/<rig_id>.json).
+    behavior_video_cameras: list[BehaviorVideoCamera] | None = Field(
+        default=None,
+        description="Cameras written by this pack, for the exposure and throughput budget check.",
+    )
+
+    # MATLAB launcher: the session runs in a shared MATLAB engine; starting one takes tens of
+    # seconds, so consecutive sessions should attach to a warm engine.
+    matlab_engine_name: str | None = Field(
+        default=None,
+        description="Name of the shared MATLAB engine (matlab.engine.shareEngine) to attach to or start.",
+        examples=["slap2_launcher"],
+    )
+    matlab_entrypoint: str | None = Field(
+        default=None,
+        description="MATLAB function called in the engine to run the session.",
+        examples=["slap2_launcher"],
+    )
+    matlab_engine_policy: Literal["attach", "attach_or_start", "start"] = Field(
+        default="attach_or_start",
+        description=(
+            "'attach': fail unless a shared engine named matlab_engine_name is running; 'attach_or_start': attach "
+            "if running, otherwise start and share one (default); 'start': always start a fresh engine."
+        ),
+    )
+    matlab_warmup_script: str | None = Field(
+        default=None,
+        description="MATLAB script/function run once when an engine is started (e.g. to add paths and load toolboxes).",
+    )
+    matlab_engine_idle_timeout_s: float | None = Field(
+        default=None,
+        gt=0,
+        description="Shut a launcher-started engine down after this many idle seconds; omit to keep it running.",
+    )
+    matlab_max_sessions_per_engine: int | None = Field(
+        default=None,
+        ge=1,
+        description="Restart the engine after this many sessions to bound memory growth; omit for no limit.",
+    )
+
+    script_worker_pool: ScriptWorkerPool | None = Field(
+        default=None,
+        description=(
+            "Worker pool settings for script_module entries with execution 'pooled'. Workers are isolated per "
+            "local_repository_path + repository_commit_hash."
+        ),
+    )
+
+    # Session sync: one master (usually the behavior/stimulus rig) waits for its slaves
+    # (behavior-videos, imaging) to connect before all sides start acquisition.
+    session_sync_role: Literal["master", "slave"] | None = Field(
+        default=None,
+        description="Session sync role of this launcher; omit to run unsynchronized.",
+    )
+    session_sync_port: int | None = Field(
+        default=None,
+        ge=1,
+        le=65535,
+        description="TCP port the master listens on and slaves connect to.",
+        examples=[50001],
+    )
+    session_sync_expected_slaves: int | None = Field(
+        default=None,
+        ge=0,
+        description="Master only: number of slaves that must connect before the session starts.",
+    )
+    session_sync_bind_host: str | None = Field(
+        default=None,
+        description="Master only: interface to listen on (e.g. 0.0.0.0 for all interfaces).",
+        examples=["0.0.0.0"],
+    )
+    session_sync_master_host: str | None = Field(
+        default=None,
+        description="Slave only: hostname or IP address of the master.",
+    )
+    session_sync_timeout_s: float | None = Field(
+        default=None,
+        gt=0,
+        description="Maximum time to wait for the sync handshake (all slaves connected / master reachable).",
+    )
+    session_sync_heartbeat_interval_s: float | None = Field(
+        default=None,
+        gt=0,
+        description="Interval between heartbeats once connected; a peer missing several heartbeats is treated as lost.",
+    )
+    session_sync_clock_offset_tolerance_ms: float | None = Field(
+        default=None,
+        ge=0,
+        description="Maximum tolerated clock offset between master and slave, measured during the handshake.",
+    )
+
     # Common metadata + notes + archiving keys are left as permissive extras here;
     # module-specific parameter typing lives in per-module Pydantic files.
+
+    @model_validator(mode="after")
+    def _check_session_sync(self) -> "LauncherParams":
+        if self.session_sync_role is None:
+            return self
+        if self.session_sync_port is None:
+            raise ValueError("session_sync_port is required when session_sync_role is set")
+        if self.session_sync_role == "slave" and not self.session_sync_master_host:
+            raise ValueError("session_sync_master_host is required for session_sync_role 'slave'")
+        if self.session_sync_role == "master" and self.session_sync_expected_slaves is None:
+            raise ValueError("session_sync_expected_slaves is required for session_sync_role 'master'")
+        return self
+
+    @model_validator(mode="after")
+    def _check_matlab(self) -> "LauncherParams":
+        if self.launcher == "matlab" and not (self.matlab_engine_name and self.matlab_entrypoint):
+            raise ValueError("launcher 'matlab' requires matlab_engine_name and matlab_entrypoint")
+        return self
+
+    @model_validator(mode="after")
+    def _check_bonsai(self) -> "LauncherParams":
+        cache = self.bonsai_bootstrap_cache
+        if cache is None or not cache.enabled:
+            return self
+        if not self.bonsai_setup_script:
+            raise ValueError("bonsai_bootstrap_cache requires bonsai_setup_script")
+        commit = self.repository_commit_hash or ""
+        if len(commit) != 40 or any(c not in "0123456789abcdefABCDEF" for c in commit):
+            raise ValueError(f"bonsai_bootstrap_cache requires a pinned 40-character repository_commit_hash, got {commit!r}")
+        return self
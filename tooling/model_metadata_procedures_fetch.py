@@ -21,3 +21,16 @@ class Parameters(BaseModel):
         ge=0,
         description="Timeout in seconds for procedures fetch calls.",
     )
+    metadata_cache_dir: str | None = Field(
+        default=None,
+        description=(
+            "Prefetched metadata cache (tooling/prefetch_metadata.py). When set, procedures are read from "
+            "<metadata_cache_dir>/procedures/<subject_id>.json if fresh; metadata_procedures_timeout then only "
+            "applies on a cache miss."
+        ),
+    )
+    metadata_cache_max_age_hours: float = Field(
+        default=24,
+        gt=0,
+        description="Maximum age of cached procedures; surgeries logged since then are only seen after a re-fetch.",
+    )
@@ -18,3 +18,18 @@ class Parameters(BaseModel):
         default=None,
         description="List of observed/allowed projects (advanced/legacy).",
     )
+    metadata_cache_dir: str | None = Field(
+        default=None,
+        description=(
+            "Prefetched metadata cache (tooling/prefetch_metadata.py). When set, the list of valid project names is "
+            "read from <metadata_cache_dir>/project_names/all.json (shared by all subjects) if fresh."
+        ),
+    )
+    metadata_cache_max_age_hours: float = Field(
+        default=24,
+        gt=0,
+        description=(
+            "Maximum age of the cached project-name list; a project added since then fails validation until "
+            "it is fetched again."
+        ),
+    )
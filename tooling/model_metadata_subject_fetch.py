@@ -16,3 +16,15 @@ class Parameters(BaseModel):
         default=None,
         description="Optional mouse identifier if distinct from subject_id.",
     )
+    metadata_cache_dir: str | None = Field(
+        default=None,
+        description=(
+            "Prefetched metadata cache (tooling/prefetch_metadata.py). When set, the subject record is read from "
+            "<metadata_cache_dir>/subject/<subject_id>.json if fresh, instead of calling the subject endpoint."
+        ),
+    )
+    metadata_cache_max_age_hours: float = Field(
+        default=24,
+        gt=0,
+        description="Maximum age of a cached subject record; an older one is fetched from the service again.",
+    )
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+"""Pydantic model for pipeline module telemetry (`launcher_metadata/module_telemetry.jsonl`)."""
+
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# ISO 8601 date-time ending in an explicit offset; naive times cannot be compared across rigs.
+TIMESTAMP_PATTERN = r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:\d{2})$"
+
+
+class ModuleTelemetryRecord(BaseModel):
+    """One pipeline module run. The launcher appends one JSON Lines record per run."""
+
+    model_config = ConfigDict(extra="allow")
+
+    telemetry_version: int = Field(default=1, ge=1, description="Telemetry record format version.")
+    session_uuid: str | None = Field(default=None, description="Session the module ran for.")
+    subject_id: str | None = Field(default=None, description="Subject of the session.")
+    pack: str | None = Field(
+        default=None,
+        description="Pack that defined the pipeline (repo-relative path, POSIX separators).",
+        examples=["packs/projects/predictive_processing/behavior/day1.json"],
+    )
+    rig_id: str | None = Field(default=None, description="Rig the session ran on.")
+    launcher: str | None = Field(default=None, description="Launcher type (bonsai, matlab, python, ...).")
+    launcher_version: str | None = Field(default=None, description="Launcher version that ran the module.")
+    pipeline: Literal["pre_acquisition_pipeline", "post_acquisition_pipeline"] = Field(
+        ..., description="Pipeline the module belongs to."
+    )
+    index: int = Field(..., ge=0, description="Position of the entry in its pipeline.")
+    module_path: str = Field(..., description="module_path of the pipeline entry.", examples=["session_archiver"])
+    module_type: str | None = Field(default=None, description="module_type of the pipeline entry.")
+    started_at: str = Field(
+        ...,
+        pattern=TIMESTAMP_PATTERN,
+        description="ISO 8601 time the module started; must carry a UTC offset (Z or +hh:mm).",
+        examples=["2026-03-02T14:05:11.204+00:00"],
+    )
+    ended_at: str = Field(
+        ...,
+        pattern=TIMESTAMP_PATTERN,
+        description="ISO 8601 time the module finished; must carry a UTC offset (Z or +hh:mm).",
+    )
+    duration_s: float = Field(..., ge=0, description="Wall-clock duration in seconds.")
+    bytes_processed: int | None = Field(
+        default=None,
+        ge=0,
+        description="Bytes read or written by the module (e.g. archived bytes), when it reports them.",
+    )
+    retries: int = Field(default=0, ge=0, description="Retries after the first attempt.")
+    outcome: Literal["success", "failed", "skipped", "aborted"] = Field(..., description="How the module run ended.")
+    error: str | None = Field(default=None, description="Error message when outcome is failed or aborted.")
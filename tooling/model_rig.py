@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+"""Pydantic model for rig registry files (`rigs/<rig_id>.json`)."""
+
+from typing import Annotated
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class RigThroughput(BaseModel):
+    """Sustained write throughput of the rig's acquisition disk."""
+
+    model_config = ConfigDict(extra="allow")
+
+    disk_write_mb_per_s: float | None = Field(
+        ...,
+        gt=0,
+        description="Measured sustained sequential write rate (MB/s); null until it is measured on the rig.",
+    )
+    usable_fraction: float = Field(
+        default=0.7,
+        gt=0,
+        le=1,
+        description="Share of the write rate video may use, leaving headroom for other writers and slow-downs.",
+    )
+
+
+class RigParams(BaseModel):
+    """Rig-specific values substituted into packs as `{rig_param:<key>}`."""
+
+    model_config = ConfigDict(extra="allow")
+
+    schema_: Annotated[
+        str | None,
+        Field(default=None, alias="$schema", description="JSON Schema identifier (relative path within repo)."),
+    ]
+
+    rig_id: str = Field(
+        ...,
+        description="Rig identifier; matches the file name and the packs' rig_id when they set one.",
+        examples=["slap2_behavior"],
+    )
+    description: str | None = Field(default=None, description="Short description of the rig.")
+    pack_globs: list[str] = Field(
+        default_factory=list,
+        description=(
+            "Repo-relative glob patterns (POSIX separators) of packs that run on this rig. Every "
+            "{rig_param:...} placeholder in a matching pack must be defined in rig_params."
+        ),
+        examples=[["packs/projects/predictive_processing/behavior/*.json"]],
+    )
+    rig_params: dict[str, str | int | float | bool | None] = Field(
+        default_factory=dict,
+        description=(
+            "Values for {rig_param:<key>} placeholders. A placeholder that is the whole string takes the value's "
+            "type. null declares a key whose value has not been confirmed on the rig yet; packs using it cannot "
+            "be resolved for this rig until it is set."
+        ),
+        examples=[{"COM_port": "COM3", "DisplayDeviceIndex": 1, "WindowStateIndex": None}],
+    )
+    rig_throughput: RigThroughput | None = Field(
+        default=None,
+        description="Acquisition disk throughput; the aggregate video bandwidth of packs on this rig must fit in it.",
+    )
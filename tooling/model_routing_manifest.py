@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+"""Pydantic models for the SLAP2 routing manifest (`routing_manifest.json[l]`)."""
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class RoutingManifestRecord(BaseModel):
+    """One routed file. In JSON Lines manifests, each line is one record."""
+
+    model_config = ConfigDict(extra="allow")
+
+    source_path: str = Field(
+        ...,
+        description="Path of the file as acquired, relative to the session folder (POSIX separators).",
+        examples=["acquisition_001_DMD1.dat"],
+    )
+    destination_path: str | None = Field(
+        default=None,
+        description="Path the file was routed to, relative to the session folder (POSIX separators).",
+        examples=["dynamic_data/acquisition_001_DMD1.dat"],
+    )
+    category: str | None = Field(
+        default=None,
+        description="Routing category (e.g. 'dynamic', 'structure', 'ref_stack', 'behavior', 'behavior_video').",
+    )
+    size_bytes: int | None = Field(default=None, ge=0, description="File size in bytes at scan time.")
+    mtime_ns: int | None = Field(default=None, ge=0, description="File modification time (ns since epoch) at scan time.")
+    hash_algo: str | None = Field(default=None, description="Algorithm used for content_hash (hashlib name).")
+    content_hash: str | None = Field(default=None, description="Hex digest of the file contents.")
+    annotations: dict | None = Field(
+        default=None,
+        description="Operator/module annotations for this file (e.g. targeted_structure, slap2_mode, target_name).",
+    )
+
+
+class RoutingManifest(BaseModel):
+    """Single-document routing manifest (`manifest_format: "json"`)."""
+
+    model_config = ConfigDict(extra="allow")
+
+    manifest_version: int = Field(default=1, ge=1, description="Manifest format version.")
+    session_folder: str | None = Field(
+        default=None,
+        description="Session folder the record paths are relative to.",
+    )
+    created_at: str | None = Field(default=None, description="ISO 8601 timestamp when the manifest was written.")
+    generator: str | None = Field(
+        default=None,
+        description="Module that wrote the manifest (e.g. 'slap2_meta_annotator').",
+    )
+    files: list[RoutingManifestRecord] = Field(
+        default_factory=list,
+        description="Routed files; duplicate source_path values are allowed and the last record wins.",
+    )
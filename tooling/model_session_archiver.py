@@ -2,9 +2,14 @@ from __future__ import annotations
 
 """Pydantic model for module `session_archiver` parameters."""
 
-from typing import Union
+from typing import Annotated, Literal, Union
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, model_validator
+
+
+# Structural rules (anchoring, '**' segments, character classes) are checked by
+# tooling/archive_patterns.py during validation.
+Pattern = Annotated[str, StringConstraints(min_length=1)]
 
 
 class Parameters(BaseModel):
@@ -19,6 +24,27 @@ class Parameters(BaseModel):
         default=None,
         description="Optional local backup directory used as an intermediate or fallback.",
     )
+    backup_dedup: bool = Field(
+        default=False,
+        description=(
+            "If true, back up into a content-addressed store (backup_store_dir) and hardlink each file into backup_dir, "
+            "so byte-identical files across sessions are stored once."
+        ),
+    )
+    backup_store_dir: str | None = Field(
+        default=None,
+        description="Object store for backup_dedup; must be on the same volume as backup_dir for hardlinks.",
+    )
+    backup_retention_days: int | None = Field(
+        default=None,
+        gt=0,
+        description="Backups older than this many days are removed by `backup_store.py gc` (null: keep forever).",
+    )
+    backup_keep_sessions: int = Field(
+        default=0,
+        ge=0,
+        description="The newest N backed-up sessions are kept by gc regardless of backup_retention_days.",
+    )
     manifest_path: str | None = Field(
         default=None,
         description="Optional path to a manifest file describing what was archived.",
@@ -27,22 +53,103 @@ class Parameters(BaseModel):
         default=None,
         description="Optional path to a routing manifest produced by pre-archiver modules (e.g., slap2_meta_annotator).",
     )
-    include_patterns: Union[str, list[str], None] = Field(
+    include_patterns: Union[Pattern, list[Pattern], None] = Field(
         default=None,
-        description="Glob(s) of files to include (string or list).",
+        description=(
+            "Glob(s) of files to include (string or list), matched against paths relative to session_dir. "
+            "Without '/' a pattern matches the file name at any depth; with '/' it is anchored at session_dir. "
+            "'*' and '?' stay within one directory, '**' (a whole segment) spans directories, a trailing '/' "
+            "means everything below. Omitted: every file."
+        ),
     )
-    exclude_patterns: Union[str, list[str], None] = Field(
+    exclude_patterns: Union[Pattern, list[Pattern], None] = Field(
         default=None,
-        description="Glob(s) of files to exclude (string or list).",
+        description="Glob(s) of files to exclude (string or list); same syntax as include_patterns.",
+    )
+    pattern_case: Literal["auto", "sensitive", "insensitive"] = Field(
+        default="auto",
+        description="Case handling for include/exclude patterns; 'auto' folds case on Windows only.",
+    )
+    bundle_small_files: bool = Field(
+        default=False,
+        description=(
+            "If true, pack files smaller than bundle_threshold_kb into sequential tar bundles under network_dir "
+            "(indexed in the manifest) and copy larger files directly; reduces per-file overhead on SMB shares."
+        ),
+    )
+    bundle_threshold_kb: int = Field(default=256, gt=0, description="Files below this size (KiB) are bundled.")
+    bundle_target_mb: int = Field(default=512, gt=0, description="Target size (MiB) of each tar bundle.")
+    bundle_dir: str = Field(
+        default="_bundles",
+        min_length=1,
+        description="Directory under network_dir (and backup_dir) that holds the bundles.",
+    )
+    archive_mode: Literal["sync", "queued"] = Field(
+        default="sync",
+        description=(
+            "'sync' archives in the pipeline step. 'queued' writes a job file to archive_queue_dir and returns; "
+            "a separate archive worker copies the session in the background."
+        ),
+    )
+    archive_queue_dir: str | None = Field(
+        default=None,
+        description="Spool directory for queued archive jobs (required when archive_mode is 'queued').",
+    )
+    archive_priority: int = Field(
+        default=100,
+        ge=0,
+        le=9999,
+        description="Queue priority of this session's job; lower values are archived first.",
+    )
+    archive_max_mb_per_s: float | None = Field(
+        default=None,
+        gt=0,
+        description="Throttle for the archive worker's writes to network_dir, so archiving does not starve acquisition I/O.",
     )
     checksum_algo: str | None = Field(
         default=None,
         description="Checksum algorithm for verification (e.g. 'md5', 'sha256').",
     )
+    reuse_manifest_hashes: bool = Field(
+        default=True,
+        description=(
+            "If true, reuse content hashes recorded in routing_manifest (when their algorithm matches checksum_algo) "
+            "instead of re-reading source files for verification."
+        ),
+    )
     dry_run: bool = Field(default=False, description="If true, do not write/copy; only log intended operations.")
-    skip_completed: bool = Field(default=True, description="If true, skip items that appear already archived.")
+    skip_completed: bool = Field(
+        default=True,
+        description=(
+            "If true, skip items already archived. With destination_index set this is decided from the index "
+            "(same size and mtime) instead of stat-ing each file on network_dir."
+        ),
+    )
+    destination_index: str | None = Field(
+        default=None,
+        description=(
+            "Opt-in index of archived files (path, size, mtime, digest), e.g. '.archive_index.json', kept in "
+            "network_dir (relative) or at an absolute path and rewritten atomically as files are copied. "
+            "skip_completed then trusts the index, so files removed or changed on network_dir are only re-copied "
+            "after `archive_index.py reconcile`. Null: no index; skip_completed checks network_dir."
+        ),
+    )
     max_retries: int = Field(default=3, ge=0, description="Maximum retries for transient failures (copy/verify).")
     remove_empty_dirs: bool = Field(
         default=False,
         description="If true, remove empty source directories after archiving.",
     )
+
+    @model_validator(mode="after")
+    def _check_queue(self) -> "Parameters":
+        if self.archive_mode == "queued" and not self.archive_queue_dir:
+            raise ValueError("archive_mode 'queued' requires archive_queue_dir")
+        return self
+
+    @model_validator(mode="after")
+    def _check_backup_dedup(self) -> "Parameters":
+        if self.backup_dedup and not self.backup_dir:
+            raise ValueError("backup_dedup requires backup_dir")
+        if self.backup_dedup and not self.backup_store_dir:
+            raise ValueError("backup_dedup requires backup_store_dir")
+        return self
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 """Pydantic model for module `slap2_meta_annotator` parameters."""
 
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, Field
 
 
@@ -87,3 +89,23 @@ class Parameters(BaseModel):
         default=None,
         description="Optional manifest path (absolute or relative to session folder) to override the default under launcher_metadata.",
     )
+    manifest_format: Literal["json", "jsonl"] = Field(
+        default="json",
+        description=(
+            "Manifest format. 'jsonl' appends one record per line as files are routed (see "
+            "model_routing_manifest_record.schema.json), so large sessions stream instead of buffering one document."
+        ),
+    )
+
+    scan_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Number of concurrent workers used to scan the session folder and hash files.",
+    )
+    content_hash_algo: Literal["md5", "sha1", "sha256", "blake2b"] | None = Field(
+        default=None,
+        description=(
+            "If set, compute a content hash per routed file and record it in the manifest; "
+            "session_archiver reuses it when its checksum_algo matches."
+        ),
+    )
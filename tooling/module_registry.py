@@ -0,0 +1,206 @@
+"""Generated module-model registry (`tooling/module_registry.json`).
+
+Maps each launcher module (`module_path` in packs) to its model file, exported schema
+file, schema hash and description, and lists the non-module schemas (launcher, routing
+manifest, rig). validate.py, export_schemas.py, build_docs.py and the pydantic engine
+read this one file instead of globbing `model_*.py` / `model_*.schema.json` themselves.
+
+The registry is built by parsing the model files (no imports): a file defining a
+top-level `Parameters` class is a module model. Schemas and models are loaded lazily,
+only for the modules a caller actually looks up, and a module referenced by a pack but
+missing from the registry is a dict miss that callers report.
+
+`export_schemas.py` rewrites the registry after exporting. This module is dependency-free
+(stdlib only); `model()` needs pydantic because it imports the model file.
+
+Run from repo root:
+    python ./tooling/module_registry.py build
+    python ./tooling/module_registry.py check
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import hashlib
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from typing import Any, Iterator
+
+from pack_entries import LAUNCHER_MODULE, iter_pipeline_entries
+
+
+TOOLING_DIR = Path(__file__).resolve().parent
+REPO_ROOT = TOOLING_DIR.parent
+REGISTRY_FILE = "module_registry.json"
+
+LAUNCHER_MODEL = "model_launcher.py"
+
+
+@dataclass(frozen=True)
+class ModuleEntry:
+    module_path: str
+    model_file: str
+    schema_file: str
+    schema_sha256: str | None
+    description: str | None
+
+
+def _describe(tree: ast.Module) -> str | None:
+    """MODULE_DESCRIPTION if set, else the first module-level string (docstring)."""
+
+    first_string: str | None = None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "MODULE_DESCRIPTION" for t in node.targets):
+            if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                return node.value.value.strip()
+        if first_string is None and isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+            first_string = node.value.value.strip().split("\n\n", 1)[0].replace("\n", " ").strip()
+    return first_string or None
+
+
+def _defines_parameters(tree: ast.Module) -> bool:
+    return any(isinstance(node, ast.ClassDef) and node.name == "Parameters" for node in tree.body)
+
+
+def _sha256(path: Path) -> str | None:
+    return hashlib.sha256(path.read_bytes()).hexdigest() if path.exists() else None
+
+
+def build_registry(tooling_dir: Path = TOOLING_DIR) -> dict[str, Any]:
+    modules: dict[str, dict[str, Any]] = {}
+    support: dict[str, dict[str, Any]] = {}
+    for py_path in sorted(tooling_dir.glob("model_*.py")):
+        tree = ast.parse(py_path.read_text(encoding="utf-8"), filename=str(py_path))
+        schema_file = py_path.with_suffix(".schema.json").name
+        if py_path.name != LAUNCHER_MODEL and _defines_parameters(tree):
+            modules[py_path.stem.removeprefix("model_")] = {
+                "model_file": py_path.name,
+                "schema_file": schema_file,
+                "schema_sha256": _sha256(tooling_dir / schema_file),
+                "description": _describe(tree),
+            }
+    module_schemas = {entry["schema_file"] for entry in modules.values()}
+    for schema_path in sorted(tooling_dir.glob("model_*.schema.json")):
+        if schema_path.name not in module_schemas:
+            support[schema_path.name] = {"schema_sha256": _sha256(schema_path)}
+    return {"modules": modules, "support_schemas": support}
+
+
+def write_registry(registry: dict[str, Any], tooling_dir: Path = TOOLING_DIR) -> Path:
+    path = tooling_dir / REGISTRY_FILE
+    path.write_text(json.dumps(registry, indent=2) + "\n", encoding="utf-8")
+    load_registry.cache_clear()
+    return path
+
+
+class LazySchemas(Mapping):
+    """module_path -> schema dict, reading each schema file on first access."""
+
+    def __init__(self, registry: "ModuleRegistry") -> None:
+        self._registry = registry
+        self._loaded: dict[str, dict] = {}
+
+    def __getitem__(self, module_path: str) -> dict:
+        if module_path not in self._loaded:
+            entry = self._registry.modules[module_path]
+            self._loaded[module_path] = json.loads((self._registry.tooling_dir / entry.schema_file).read_text(encoding="utf-8"))
+        return self._loaded[module_path]
+
+    def __contains__(self, module_path: object) -> bool:
+        return module_path in self._registry.modules
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._registry.modules)
+
+    def __len__(self) -> int:
+        return len(self._registry.modules)
+
+
+class ModuleRegistry:
+    def __init__(self, data: dict[str, Any], tooling_dir: Path) -> None:
+        self.tooling_dir = tooling_dir
+        self.modules = {
+            name: ModuleEntry(
+                module_path=name,
+                model_file=entry["model_file"],
+                schema_file=entry["schema_file"],
+                schema_sha256=entry.get("schema_sha256"),
+                description=entry.get("description"),
+            )
+            for name, entry in (data.get("modules") or {}).items()
+        }
+        self.support_schemas: dict[str, dict[str, Any]] = dict(data.get("support_schemas") or {})
+        self._models: dict[str, Any] = {}
+
+    def get(self, module_path: str) -> ModuleEntry | None:
+        return self.modules.get(module_path)
+
+    def schemas(self) -> LazySchemas:
+        return LazySchemas(self)
+
+    def schema_files(self) -> list[str]:
+        return sorted([entry.schema_file for entry in self.modules.values()] + list(self.support_schemas))
+
+    def model(self, module_path: str):
+        """Import the module's model file on first use and return its `Parameters` class."""
+
+        if module_path not in self._models:
+            py_path = self.tooling_dir / self.modules[module_path].model_file
+            spec = spec_from_file_location(py_path.stem, py_path)
+            if spec is None or spec.loader is None:
+                raise RuntimeError(f"Unable to import {py_path}")
+            module = module_from_spec(spec)
+            spec.loader.exec_module(module)
+            model = module.Parameters
+            model.model_rebuild(force=True, _types_namespace=module.__dict__)
+            self._models[module_path] = model
+        return self._models[module_path]
+
+
+@lru_cache(maxsize=None)
+def load_registry(tooling_dir: Path = TOOLING_DIR) -> ModuleRegistry:
+    path = tooling_dir / REGISTRY_FILE
+    data = json.loads(path.read_text(encoding="utf-8")) if path.exists() else build_registry(tooling_dir)
+    return ModuleRegistry(data, tooling_dir)
+
+
+def unregistered_modules(payload: dict[str, Any], registry: ModuleRegistry) -> list[str]:
+    """launcher_module entries whose module_path has no model in the registry."""
+
+    missing: list[str] = []
+    for _, _, entry in iter_pipeline_entries(payload, module_type=LAUNCHER_MODULE):
+        module_path = entry.get("module_path")
+        if module_path and not entry.get("module_schema") and registry.get(module_path) is None:
+            missing.append(module_path)
+    return list(dict.fromkeys(missing))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build or check the module-model registry")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="Rewrite tooling/module_registry.json from the model files and schemas")
+    sub.add_parser("check", help="Exit 1 if tooling/module_registry.json is out of date")
+    args = parser.parse_args(argv)
+
+    current = build_registry()
+    if args.command == "build":
+        path = write_registry(current)
+        print(f"Wrote {path.relative_to(REPO_ROOT).as_posix()} ({len(current['modules'])} modules)")
+        return 0
+
+    path = TOOLING_DIR / REGISTRY_FILE
+    stored = json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+    if stored != current:
+        print(f"FAIL {REGISTRY_FILE} is out of date; run: python ./tooling/module_registry.py build")
+        return 1
+    print(f"OK  {REGISTRY_FILE} ({len(current['modules'])} modules)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,313 @@
+"""Pipeline module telemetry: writer, reader and cross-session aggregation.
+
+The launcher appends one `model_module_telemetry.schema.json` record per pre/post
+acquisition module run to `<session>/launcher_metadata/module_telemetry.jsonl`:
+
+    with record_module_run(session_dir, pipeline="post_acquisition_pipeline", index=3,
+                           module_path="session_archiver", pack=pack, rig_id=rig_id) as run:
+        run["bytes_processed"] = archive(...)
+        run["retries"] = attempts - 1
+
+The record is written when the block exits, with outcome `failed` and the error if it
+raised (set `run["outcome"] = "skipped"` for modules that decided not to run).
+
+`aggregate` finds telemetry under many session folders and reports count, failures
+and p50/p95 duration per module, per pack x module and per rig x module. Directories
+are listed and telemetry files parsed on one thread pool, which hides per-directory
+latency on network shares. A directory that holds `launcher_metadata/` is a session
+folder, and the scan does not descend into its data. Records with a naive or unparseable
+time, or a non-numeric duration or byte count, are skipped with a WARN.
+
+This module is dependency-free (stdlib only).
+
+Run from repo root:
+    python ./tooling/module_telemetry.py aggregate D:/sessions \\\\allen\\aind\\scratch\\OpenScope\\Slap2\\Data --workers 16
+    python ./tooling/module_telemetry.py aggregate D:/sessions --by module --since 2026-01-01
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+
+TELEMETRY_VERSION = 1
+METADATA_DIR = "launcher_metadata"
+TELEMETRY_FILE = "module_telemetry.jsonl"
+GROUPINGS = {
+    "module": ("module_path",),
+    "pack": ("pack", "module_path"),
+    "rig": ("rig_id", "module_path"),
+}
+
+
+def _iso(value: datetime) -> str:
+    return value.isoformat(timespec="milliseconds")
+
+
+def parse_time(value: Any) -> datetime:
+    """Parse a record timestamp; naive times (no UTC offset) are rejected."""
+
+    if not isinstance(value, str):
+        raise ValueError(f"expected an ISO 8601 string, got {value!r}")
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        raise ValueError(f"{value!r} has no UTC offset")
+    return parsed
+
+
+def record_problem(record: dict[str, Any]) -> str | None:
+    """Why a record cannot be aggregated, or None. Checks the fields `aggregate` reads."""
+
+    for key in ("started_at", "ended_at"):
+        try:
+            parse_time(record.get(key))
+        except ValueError as exc:
+            return f"{key}: {exc}"
+    duration = record.get("duration_s")
+    if isinstance(duration, bool) or not isinstance(duration, (int, float)) or not duration >= 0:
+        return f"duration_s: expected a non-negative number, got {duration!r}"
+    for key in ("bytes_processed", "retries"):
+        value = record.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+            return f"{key}: expected a non-negative integer, got {value!r}"
+    return None
+
+
+def telemetry_path(session_dir: Path) -> Path:
+    return session_dir / METADATA_DIR / TELEMETRY_FILE
+
+
+def append_record(session_dir: Path, record: dict[str, Any]) -> None:
+    path = telemetry_path(session_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+@contextmanager
+def record_module_run(
+    session_dir: Path,
+    *,
+    pipeline: str,
+    index: int,
+    module_path: str,
+    **context: Any,
+) -> Iterator[dict[str, Any]]:
+    """Time a module run and append its telemetry record on exit.
+
+    `context` carries the session-level fields (session_uuid, subject_id, pack, rig_id,
+    launcher, launcher_version, module_type). The yielded dict can set bytes_processed,
+    retries and outcome.
+    """
+
+    run: dict[str, Any] = {"bytes_processed": None, "retries": 0, "outcome": "success", "error": None}
+    started = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    try:
+        yield run
+    except BaseException as exc:
+        run["outcome"] = "aborted" if isinstance(exc, KeyboardInterrupt) else "failed"
+        run["error"] = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        record = {
+            "telemetry_version": TELEMETRY_VERSION,
+            **{k: v for k, v in context.items() if v is not None},
+            "pipeline": pipeline,
+            "index": index,
+            "module_path": module_path,
+            "started_at": _iso(started),
+            "ended_at": _iso(datetime.now(timezone.utc)),
+            "duration_s": round(duration, 6),
+            **{k: v for k, v in run.items() if v is not None},
+        }
+        append_record(session_dir, record)
+
+
+def iter_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Records of one telemetry file; a truncated final line (interrupted append) is skipped."""
+
+    with path.open("r", encoding="utf-8") as f:
+        lines = f.readlines()
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            if line_no == len(lines):
+                return
+            raise RuntimeError(f"{path}:{line_no}: invalid JSON record") from None
+        if isinstance(record, dict):
+            yield record
+
+
+# -- discovery + aggregation -----------------------------------------------------
+
+
+def _list_dir(path: Path) -> tuple[Path | None, list[Path]]:
+    """(telemetry file if path is a session folder, subdirectories to descend into)."""
+
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return None, []
+    subdirs = [Path(e.path) for e in entries if e.is_dir(follow_symlinks=False)]
+    if any(d.name == METADATA_DIR for d in subdirs):
+        candidate = telemetry_path(path)
+        return (candidate if candidate.is_file() else None), []
+    return None, subdirs
+
+
+def _load(path: Path) -> tuple[Path, list[dict[str, Any]], str | None]:
+    try:
+        return path, list(iter_records(path)), None
+    except (OSError, RuntimeError) as exc:
+        return path, [], str(exc)
+
+
+def scan_telemetry(
+    roots: Iterable[Path], *, workers: int = 8, max_depth: int = 6
+) -> Iterator[tuple[Path, list[dict[str, Any]], str | None]]:
+    """Find and parse telemetry files under roots concurrently; yields (path, records, error)."""
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        kinds: dict[Future, tuple[str, int]] = {}
+        for root in roots:
+            if root.is_file():
+                kinds[pool.submit(_load, root)] = ("file", 0)
+            else:
+                kinds[pool.submit(_list_dir, root)] = ("dir", 0)
+        pending = set(kinds)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                kind, depth = kinds.pop(fut)
+                if kind == "file":
+                    yield fut.result()
+                    continue
+                telemetry, subdirs = fut.result()
+                if telemetry is not None:
+                    child = pool.submit(_load, telemetry)
+                    kinds[child] = ("file", depth)
+                    pending.add(child)
+                if depth < max_depth:
+                    for subdir in subdirs:
+                        child = pool.submit(_list_dir, subdir)
+                        kinds[child] = ("dir", depth + 1)
+                        pending.add(child)
+
+
+def _p95(ordered: list[float]) -> float:
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+def aggregate(records: Iterable[dict[str, Any]], by: str) -> list[dict[str, Any]]:
+    """Per-group count, failures, retries, bytes and p50/p95/max duration, slowest p95 first.
+
+    Records must pass `record_problem`; `_cmd_aggregate` drops the ones that do not.
+    """
+
+    keys = GROUPINGS[by]
+    groups: dict[tuple, list[dict[str, Any]]] = defaultdict(list)
+    for record in records:
+        groups[tuple(record.get(k) for k in keys)].append(record)
+    rows: list[dict[str, Any]] = []
+    for group, members in groups.items():
+        durations = sorted(float(r["duration_s"]) for r in members)
+        rows.append(
+            {
+                **dict(zip(keys, group)),
+                "count": len(members),
+                "failures": sum(1 for r in members if r.get("outcome") in ("failed", "aborted")),
+                "retries": sum(int(r.get("retries") or 0) for r in members),
+                "bytes_processed": sum(int(r.get("bytes_processed") or 0) for r in members),
+                "p50_s": round(statistics.median(durations), 3),
+                "p95_s": round(_p95(durations), 3),
+                "max_s": round(durations[-1], 3),
+            }
+        )
+    return sorted(rows, key=lambda row: (-row["p95_s"], [str(row[k]) for k in keys]))
+
+
+def _format_rows(by: str, rows: list[dict[str, Any]]) -> list[str]:
+    label_keys = GROUPINGS[by]
+    labels = [" / ".join(str(row.get(k) or "-") for k in label_keys) for row in rows]
+    width = max([len(label) for label in labels] + [len(by)])
+    lines = [f"{by:<{width}}  {'runs':>6} {'fail':>5} {'retry':>5} {'p50 s':>9} {'p95 s':>9} {'max s':>9} {'GiB':>8}"]
+    for label, row in zip(labels, rows):
+        lines.append(
+            f"{label:<{width}}  {row['count']:>6} {row['failures']:>5} {row['retries']:>5} "
+            f"{row['p50_s']:>9.2f} {row['p95_s']:>9.2f} {row['max_s']:>9.2f} {row['bytes_processed'] / 1024**3:>8.2f}"
+        )
+    return lines
+
+
+def _cmd_aggregate(args: argparse.Namespace) -> int:
+    since = datetime.fromisoformat(args.since) if args.since else None
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    records: list[dict[str, Any]] = []
+    files = 0
+    errors: list[str] = []
+    skipped: list[str] = []
+    start = time.perf_counter()
+    for path, loaded, error in scan_telemetry([Path(r) for r in args.roots], workers=args.workers, max_depth=args.max_depth):
+        files += 1
+        if error:
+            errors.append(error)
+        for number, record in enumerate(loaded, start=1):
+            problem = record_problem(record)
+            if problem is not None:
+                skipped.append(f"{path} record {number}: {problem}")
+                continue
+            if since is not None and parse_time(record["started_at"]) < since:
+                continue
+            records.append(record)
+    elapsed = time.perf_counter() - start
+
+    groupings = args.by or list(GROUPINGS)
+    report = {by: aggregate(records, by) for by in groupings}
+    if args.json:
+        print(json.dumps({"files": files, "records": len(records), "errors": errors, "skipped": skipped, **report}, indent=2))
+        return 1 if errors else 0
+    print(f"{files:,} telemetry file(s), {len(records):,} module run(s) in {elapsed:.2f} s")
+    for by in groupings:
+        print()
+        print("\n".join(_format_rows(by, report[by])))
+    for error in errors + skipped:
+        print(f"WARN {error}")
+    return 1 if errors else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Aggregate pipeline module telemetry across sessions")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    agg = sub.add_parser("aggregate", help="Report p50/p95 module durations per module, pack and rig")
+    agg.add_argument("roots", nargs="+", help="Session folders, directories containing them, or telemetry files")
+    agg.add_argument("--workers", type=int, default=8, help="Threads listing directories and reading files")
+    agg.add_argument("--max-depth", type=int, default=6, help="How deep to look for session folders below each root")
+    agg.add_argument("--by", action="append", choices=list(GROUPINGS), help="Grouping(s) to report (default: all)")
+    agg.add_argument("--since", type=str, default=None, help="Only runs started at or after this ISO date/time")
+    agg.add_argument("--json", action="store_true")
+    agg.set_defaults(func=_cmd_aggregate)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,337 @@
+"""Compact, immutable pack objects for listing and filtering many packs.
+
+`load_pack()` returns a `Pack` and `load_catalog()` a `PackCatalog` (rel path -> Pack)
+for the launcher's pack picker, which holds and filters every pack at once:
+
+    catalog = load_catalog()
+    for rel, pack in catalog.filter(launcher="bonsai", module_path="session_archiver").items():
+        print(rel, pack.description)
+
+`Pack` and `PipelineEntry` use `__slots__` and refuse attribute assignment. The fields
+the picker filters and previews on (`$schema`, launcher, module paths, ...) are kept as
+interned strings, so the values repeated across packs are stored once. Everything else
+(`module_parameters`, `script_parameters`, the remaining top-level keys) is kept as
+compact interned JSON text and only parsed when asked for; `module_parameters` and
+`payload()` return fresh dicts, so callers cannot mutate a shared pack.
+
+Packs are cached by the SHA-256 of the file bytes: re-loading an unchanged file is a
+hash and a dict lookup, and identical files share one `Pack`. Only the latest hash of
+each path is kept, so the cache is bounded by the number of pack files, not by the
+number of edits.
+
+This module is dependency-free (stdlib only).
+
+Run from repo root:
+    python ./tooling/pack_catalog.py list --launcher bonsai
+    python ./tooling/pack_catalog.py stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import hashlib
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Mapping
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Iterator
+
+from pack_entries import PIPELINES
+from repo_paths import REPO_ROOT, iter_json_files, rel_path
+
+
+# digest -> Pack, and resolved path -> the digest last loaded from it.
+_CACHE: dict[str, "Pack"] = {}
+_CACHE_PATHS: dict[Path, str] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+# Top-level keys held as interned strings on Pack; anything else goes into Pack._rest.
+PACK_FIELDS = {
+    "$schema": "schema",
+    "launcher": "launcher",
+    "launcher_version": "launcher_version",
+    "description": "description",
+    "rig_id": "rig_id",
+    "repository_url": "repository_url",
+    "repository_commit_hash": "repository_commit_hash",
+    "script_path": "script_path",
+}
+ENTRY_FIELDS = ("module_type", "module_path", "module_schema")
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _compact(value: Any) -> str | None:
+    if value is None:
+        return None
+    return sys.intern(json.dumps(value, separators=(",", ":"), ensure_ascii=False))
+
+
+def _parse(text: str | None) -> Any:
+    return json.loads(text) if text is not None else None
+
+
+class _Frozen:
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class PipelineEntry(_Frozen):
+    """One pre/post acquisition pipeline entry (object, legacy repo_module or bare string)."""
+
+    __slots__ = ("module_type", "module_path", "module_schema", "_params", "_rest", "_bare")
+
+    def __init__(self, raw: Any) -> None:
+        init = object.__setattr__
+        if isinstance(raw, str):
+            values, params, rest, bare = {"module_path": raw}, None, None, True
+        else:
+            rest_dict = dict(raw) if isinstance(raw, dict) else {"value": raw}
+            values = {name: rest_dict.pop(name, None) for name in ENTRY_FIELDS}
+            params = rest_dict.pop("module_parameters", None)
+            rest, bare = (rest_dict or None), False
+        for name in ENTRY_FIELDS:
+            init(self, name, _intern(values.get(name)))
+        init(self, "_params", _compact(params))
+        init(self, "_rest", _compact(rest))
+        init(self, "_bare", bare)
+
+    @property
+    def module_parameters(self) -> dict[str, Any] | None:
+        return _parse(self._params)
+
+    def to_json(self) -> Any:
+        if self._bare:
+            return self.module_path
+        raw: dict[str, Any] = {name: getattr(self, name) for name in ENTRY_FIELDS if getattr(self, name) is not None}
+        raw.update(_parse(self._rest) or {})
+        if self._params is not None:
+            raw["module_parameters"] = _parse(self._params)
+        return raw
+
+    def __repr__(self) -> str:
+        return f"PipelineEntry(module_type={self.module_type!r}, module_path={self.module_path!r})"
+
+
+class Pack(_Frozen):
+    """Immutable view of one pack file; equal packs (same bytes) compare equal."""
+
+    __slots__ = ("sha256", *PACK_FIELDS.values(), *PIPELINES, "_script_parameters", "_rest")
+
+    def __init__(self, payload: dict[str, Any], sha256: str) -> None:
+        init = object.__setattr__
+        rest = dict(payload)
+        init(self, "sha256", sha256)
+        for key, attr in PACK_FIELDS.items():
+            init(self, attr, _intern(rest.pop(key, None)))
+        for name in PIPELINES:
+            pipeline = rest.pop(name, None)
+            init(self, name, None if pipeline is None else tuple(PipelineEntry(entry) for entry in pipeline))
+        init(self, "_script_parameters", _compact(rest.pop("script_parameters", None)))
+        init(self, "_rest", _compact(rest or None))
+
+    @property
+    def script_parameters(self) -> dict[str, Any] | None:
+        return _parse(self._script_parameters)
+
+    def entries(self) -> Iterator[PipelineEntry]:
+        for name in PIPELINES:
+            yield from getattr(self, name) or ()
+
+    def module_paths(self) -> tuple[str, ...]:
+        return tuple(dict.fromkeys(entry.module_path for entry in self.entries() if entry.module_path))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Top-level pack value by JSON key (parses only the part that holds it)."""
+
+        if key in PACK_FIELDS:
+            value = getattr(self, PACK_FIELDS[key])
+        elif key in PIPELINES:
+            pipeline = getattr(self, key)
+            value = None if pipeline is None else [entry.to_json() for entry in pipeline]
+        elif key == "script_parameters":
+            value = self.script_parameters
+        else:
+            value = (_parse(self._rest) or {}).get(key)
+        return default if value is None else value
+
+    def payload(self) -> dict[str, Any]:
+        """The pack as a fresh dict, equal to `json.loads` of the file."""
+
+        payload: dict[str, Any] = {key: getattr(self, attr) for key, attr in PACK_FIELDS.items() if getattr(self, attr) is not None}
+        payload.update(_parse(self._rest) or {})
+        if self._script_parameters is not None:
+            payload["script_parameters"] = self.script_parameters
+        for name in PIPELINES:
+            if getattr(self, name) is not None:
+                payload[name] = [entry.to_json() for entry in getattr(self, name)]
+        return payload
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Pack) and other.sha256 == self.sha256
+
+    def __hash__(self) -> int:
+        return hash(self.sha256)
+
+    def __repr__(self) -> str:
+        return f"Pack(launcher={self.launcher!r}, sha256={self.sha256[:12]!r})"
+
+
+def load_pack(path: Path) -> Pack:
+    """Load one pack; unchanged (or identical) files return the cached Pack."""
+
+    path = Path(path).resolve()
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    with _CACHE_LOCK:
+        cached = _CACHE.get(digest)
+        if cached is not None:
+            _remember(path, digest)
+            return cached
+    payload = json.loads(data)
+    if not isinstance(payload, dict):
+        raise ValueError(f"{path}: pack must be a JSON object")
+    pack = Pack(payload, digest)
+    with _CACHE_LOCK:
+        pack = _CACHE.setdefault(digest, pack)
+        _remember(path, digest)
+        return pack
+
+
+def _remember(path: Path, digest: str) -> None:
+    """Point `path` at `digest`, dropping its previous Pack unless another path still uses it."""
+
+    previous = _CACHE_PATHS.get(path)
+    _CACHE_PATHS[path] = digest
+    if previous is not None and previous != digest and previous not in _CACHE_PATHS.values():
+        _CACHE.pop(previous, None)
+
+
+def clear_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        _CACHE_PATHS.clear()
+
+
+class PackCatalog(Mapping):
+    """rel path (from the repo root) -> Pack, plus the files that could not be loaded."""
+
+    def __init__(self, packs: dict[str, Pack], problems: list[str] | None = None) -> None:
+        self._packs = packs
+        self.problems = problems or []
+
+    def __getitem__(self, rel: str) -> Pack:
+        return self._packs[rel]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._packs)
+
+    def __len__(self) -> int:
+        return len(self._packs)
+
+    def filter(
+        self,
+        *,
+        launcher: str | None = None,
+        module_path: str | None = None,
+        glob: str | None = None,
+        rig_id: str | None = None,
+    ) -> "PackCatalog":
+        packs = {
+            rel: pack
+            for rel, pack in self._packs.items()
+            if (launcher is None or pack.launcher == launcher)
+            and (rig_id is None or pack.rig_id == rig_id)
+            and (glob is None or fnmatchcase(rel, glob))
+            and (module_path is None or module_path in pack.module_paths())
+        }
+        return PackCatalog(packs)
+
+
+def load_catalog(root: Path = REPO_ROOT / "packs") -> PackCatalog:
+    packs: dict[str, Pack] = {}
+    problems: list[str] = []
+    for path in sorted(iter_json_files(Path(root))):
+        try:
+            packs[rel_path(path)] = load_pack(path)
+        except (OSError, ValueError) as exc:
+            problems.append(f"{rel_path(path)}: {exc}")
+    return PackCatalog(packs, problems)
+
+
+def _measure(build) -> tuple[Any, float, int]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current
+
+
+def _cmd_stats(args: argparse.Namespace) -> int:
+    root = Path(args.root).resolve()
+    paths = sorted(iter_json_files(root))
+
+    def _dicts() -> dict[str, Any]:
+        return {rel_path(path): json.loads(path.read_text(encoding="utf-8")) for path in paths}
+
+    dicts, dict_s, dict_bytes = _measure(_dicts)
+    del dicts
+    clear_cache()
+    catalog, cold_s, catalog_bytes = _measure(lambda: load_catalog(root))
+    _, warm_s, _ = _measure(lambda: load_catalog(root))
+
+    print(f"{len(catalog)} pack(s), {len(set(catalog.values()))} distinct")
+    print(f"dict trees : {dict_bytes / 1024:8.1f} KiB  {dict_s * 1000:7.1f} ms")
+    print(f"catalog    : {catalog_bytes / 1024:8.1f} KiB  {cold_s * 1000:7.1f} ms cold, {warm_s * 1000:.1f} ms warm")
+    for problem in catalog.problems:
+        print(f"FAIL {problem}")
+    return 1 if catalog.problems else 0
+
+
+def _cmd_list(args: argparse.Namespace) -> int:
+    catalog = load_catalog(Path(args.root).resolve())
+    selected = catalog.filter(launcher=args.launcher, module_path=args.module_path, glob=args.glob, rig_id=args.rig_id)
+    for rel, pack in selected.items():
+        print(f"{rel}  [{pack.launcher}] {pack.description or ''}".rstrip())
+    for problem in catalog.problems:
+        print(f"FAIL {problem}")
+    return 1 if catalog.problems else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="List packs from the compact pack catalog")
+    parser.add_argument("--root", type=str, default=str(REPO_ROOT / "packs"), help="Packs root")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    list_cmd = sub.add_parser("list", help="List packs, optionally filtered")
+    list_cmd.add_argument("--launcher", type=str, default=None)
+    list_cmd.add_argument("--module-path", type=str, default=None, help="Only packs whose pipelines run this module")
+    list_cmd.add_argument("--rig-id", type=str, default=None)
+    list_cmd.add_argument("--glob", type=str, default=None, help="fnmatch pattern on the repo-relative path")
+    list_cmd.set_defaults(func=_cmd_list)
+
+    stats = sub.add_parser("stats", help="Compare memory and load time of dict trees vs the catalog")
+    stats.set_defaults(func=_cmd_stats)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
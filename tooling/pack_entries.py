@@ -0,0 +1,63 @@
+"""Shared helpers for reading pack payloads: pipeline entries and pinned commits.
+
+Validation rules and tools that look at "every `session_archiver` entry" or "every
+cached `script_module` entry" walk the pipelines through `iter_pipeline_entries`:
+
+    for pipeline_name, idx, entry in iter_pipeline_entries(payload, module_path="session_archiver"):
+        params = entry.get("module_parameters")
+
+Non-object entries (bare strings, legacy forms) are skipped. A `module_type` filter of
+`launcher_module` also matches entries without a `module_type`, which is the default.
+
+This module is dependency-free (stdlib only).
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable, Iterator
+
+
+PIPELINES = ("pre_acquisition_pipeline", "post_acquisition_pipeline")
+LAUNCHER_MODULE = "launcher_module"
+SCRIPT_MODULE = "script_module"
+
+FULL_COMMIT_RE = re.compile(r"^[0-9a-fA-F]{40}$")
+
+
+def is_pinned_commit(value: Any) -> bool:
+    """True for a full 40-hex commit SHA; branches, tags and short SHAs float."""
+
+    return isinstance(value, str) and bool(FULL_COMMIT_RE.match(value))
+
+
+def entry_matches(entry: Any, *, module_path: str | None = None, module_type: str | None = None) -> bool:
+    """Whether a pipeline entry is an object with this module_path and module_type."""
+
+    if not isinstance(entry, dict):
+        return False
+    if module_path is not None and entry.get("module_path") != module_path:
+        return False
+    if module_type is not None:
+        entry_type = entry.get("module_type") or LAUNCHER_MODULE
+        if entry_type != module_type:
+            return False
+    return True
+
+
+def iter_pipeline_entries(
+    payload: dict[str, Any],
+    *,
+    module_path: str | None = None,
+    module_type: str | None = None,
+    pipelines: Iterable[str] = PIPELINES,
+) -> Iterator[tuple[str, int, dict[str, Any]]]:
+    """Yield (pipeline name, index, entry) for the object entries matching the filters."""
+
+    for pipeline_name in pipelines:
+        pipeline = payload.get(pipeline_name)
+        if not isinstance(pipeline, list):
+            continue
+        for idx, entry in enumerate(pipeline):
+            if entry_matches(entry, module_path=module_path, module_type=module_type):
+                yield pipeline_name, idx, entry
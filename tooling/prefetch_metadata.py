@@ -0,0 +1,259 @@
+"""Prefetch subject/procedures/project metadata for a day's sessions.
+
+Reads a list of subject IDs plus the packs that will be run, works out which
+metadata endpoints those packs hit (via the `metadata_subject_fetch`,
+`metadata_procedures_fetch` and `metadata_project_validator` launcher modules),
+and fetches everything concurrently into the local metadata cache. Launches that
+set `metadata_cache_dir` then read from the cache instead of the network.
+
+Cache layout (one JSON envelope per request):
+    <cache_dir>/subject/<subject_id>.json
+    <cache_dir>/procedures/<subject_id>.json
+    <cache_dir>/project_names/all.json
+
+Run from repo root:
+    python ./tooling/prefetch_metadata.py --subjects 123456 123457 \
+        --pack ./packs/projects/predictive_processing/behavior/day1.json
+
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote
+from urllib.request import urlopen
+
+from pack_entries import LAUNCHER_MODULE, iter_pipeline_entries
+
+
+DEFAULT_SERVICE_URL = "http://aind-metadata-service"
+DEFAULT_CACHE_DIR = Path.home() / ".openscope" / "metadata_cache"
+DEFAULT_TIMEOUT_S = 60.0
+DEFAULT_CONCURRENCY = 8
+
+# launcher_module -> metadata endpoints it queries. Per-subject endpoints take the
+# subject id as the last path segment; the rest are fetched once per run.
+MODULE_ENDPOINTS: dict[str, tuple[str, ...]] = {
+    "metadata_subject_fetch": ("subject",),
+    "metadata_procedures_fetch": ("procedures",),
+    "metadata_project_validator": ("project_names",),
+}
+PER_SUBJECT_ENDPOINTS = {"subject", "procedures"}
+
+
+@dataclass(frozen=True)
+class FetchRequest:
+    endpoint: str
+    key: str
+    url: str
+    timeout_s: float
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    request: FetchRequest
+    ok: bool
+    elapsed_s: float
+    detail: str
+
+
+def cache_path(cache_dir: Path, endpoint: str, key: str) -> Path:
+    """Location of the cached envelope for one endpoint/key pair."""
+
+    safe_key = quote(str(key), safe="-_.")
+    return cache_dir / endpoint / f"{safe_key}.json"
+
+
+def read_cached(cache_dir: Path, endpoint: str, key: str, *, max_age_hours: float | None = None) -> Any | None:
+    """Return cached payload data, or None if missing/stale.
+
+    This is the lookup the launcher modules perform when `metadata_cache_dir` is set.
+    """
+
+    path = cache_path(cache_dir, endpoint, key)
+    try:
+        envelope = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if max_age_hours is not None:
+        fetched_at = envelope.get("fetched_at")
+        if not isinstance(fetched_at, (int, float)) or time.time() - fetched_at > max_age_hours * 3600:
+            return None
+    return envelope.get("data")
+
+
+def _write_cached(cache_dir: Path, request: FetchRequest, data: Any) -> None:
+    path = cache_path(cache_dir, request.endpoint, request.key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    envelope = {"fetched_at": time.time(), "url": request.url, "data": data}
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(envelope), encoding="utf-8")
+    # Atomic replace so a launch reading the cache never sees a partial file.
+    os.replace(tmp, path)
+
+
+def _load_json(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _iter_launcher_modules(payload: dict) -> Iterable[dict]:
+    for _, _, entry in iter_pipeline_entries(payload, module_type=LAUNCHER_MODULE):
+        yield entry
+
+
+def endpoints_for_packs(pack_paths: Iterable[Path]) -> dict[str, float]:
+    """Collect metadata endpoints used by the given packs.
+
+    Returns endpoint -> timeout (seconds); the largest timeout declared across packs wins.
+    """
+
+    endpoints: dict[str, float] = {}
+    for path in pack_paths:
+        payload = _load_json(path)
+        default_timeout = payload.get("metadata_service_timeout")
+        for entry in _iter_launcher_modules(payload):
+            names = MODULE_ENDPOINTS.get(str(entry.get("module_path")))
+            if not names:
+                continue
+            params = entry.get("module_parameters") if isinstance(entry.get("module_parameters"), dict) else {}
+            for name in names:
+                timeout = default_timeout if default_timeout is not None else DEFAULT_TIMEOUT_S
+                if name == "procedures" and params.get("metadata_procedures_timeout") is not None:
+                    timeout = params["metadata_procedures_timeout"]
+                endpoints[name] = max(float(timeout), endpoints.get(name, 0.0))
+    return endpoints
+
+
+def build_requests(
+    *, service_url: str, endpoints: dict[str, float], subject_ids: Iterable[str]
+) -> list[FetchRequest]:
+    """Expand endpoints x subjects into a de-duplicated request list."""
+
+    base = service_url.rstrip("/")
+    unique_subjects = list(dict.fromkeys(str(s).strip() for s in subject_ids if str(s).strip()))
+    requests: list[FetchRequest] = []
+    for endpoint, timeout in sorted(endpoints.items()):
+        if endpoint in PER_SUBJECT_ENDPOINTS:
+            for subject_id in unique_subjects:
+                url = f"{base}/{endpoint}/{quote(subject_id, safe='')}"
+                requests.append(FetchRequest(endpoint=endpoint, key=subject_id, url=url, timeout_s=timeout))
+        else:
+            requests.append(FetchRequest(endpoint=endpoint, key="all", url=f"{base}/{endpoint}", timeout_s=timeout))
+    return requests
+
+
+def _fetch_blocking(request: FetchRequest) -> Any:
+    try:
+        with urlopen(request.url, timeout=request.timeout_s) as resp:
+            body = resp.read().decode("utf-8")
+    except HTTPError as exc:
+        # The metadata service returns partial/invalid records with non-200 codes
+        # (e.g. 406) but still includes a usable body; keep it like the launcher does.
+        body = exc.read().decode("utf-8", errors="replace")
+        try:
+            return json.loads(body)
+        except ValueError:
+            raise exc from None
+    return json.loads(body)
+
+
+async def _fetch_one(request: FetchRequest, *, cache_dir: Path, semaphore: asyncio.Semaphore) -> FetchResult:
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            data = await asyncio.to_thread(_fetch_blocking, request)
+            _write_cached(cache_dir, request, data)
+        except (URLError, OSError, ValueError) as exc:
+            return FetchResult(request=request, ok=False, elapsed_s=time.perf_counter() - start, detail=str(exc))
+        return FetchResult(request=request, ok=True, elapsed_s=time.perf_counter() - start, detail="cached")
+
+
+async def prefetch(
+    requests: list[FetchRequest],
+    *,
+    cache_dir: Path,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_age_hours: float | None = None,
+) -> list[FetchResult]:
+    """Fetch all requests concurrently, skipping entries that are already fresh in the cache."""
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results: list[FetchResult] = []
+    pending: list[FetchRequest] = []
+    for request in requests:
+        if max_age_hours is not None and read_cached(cache_dir, request.endpoint, request.key, max_age_hours=max_age_hours) is not None:
+            results.append(FetchResult(request=request, ok=True, elapsed_s=0.0, detail="fresh"))
+        else:
+            pending.append(request)
+
+    results.extend(await asyncio.gather(*(_fetch_one(r, cache_dir=cache_dir, semaphore=semaphore) for r in pending)))
+    return results
+
+
+def _read_subjects_file(path: Path) -> list[str]:
+    subjects: list[str] = []
+    for raw_line in path.read_text(encoding="utf-8").splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        if line:
+            subjects.extend(part.strip() for part in line.replace(",", " ").split() if part.strip())
+    return subjects
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Warm the local metadata cache for a list of subjects and packs")
+    parser.add_argument("--subjects", nargs="*", default=[], help="Subject IDs to prefetch")
+    parser.add_argument("--subjects-file", type=str, default=None, help="Text file with subject IDs (whitespace/comma separated)")
+    parser.add_argument("--pack", action="append", default=[], help="Pack file to be run today (repeatable)")
+    parser.add_argument("--service-url", type=str, default=DEFAULT_SERVICE_URL, help="Metadata service base URL")
+    parser.add_argument("--cache-dir", type=str, default=str(DEFAULT_CACHE_DIR), help="Local metadata cache directory")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Maximum in-flight requests")
+    parser.add_argument(
+        "--max-age-hours",
+        type=float,
+        default=None,
+        help="Skip entries already cached within this many hours (default: always refetch)",
+    )
+    args = parser.parse_args(argv)
+
+    subjects = list(args.subjects)
+    if args.subjects_file:
+        subjects.extend(_read_subjects_file(Path(args.subjects_file)))
+    if not subjects:
+        parser.error("no subjects given (use --subjects and/or --subjects-file)")
+    if not args.pack:
+        parser.error("no packs given (use --pack)")
+
+    endpoints = endpoints_for_packs(Path(p).resolve() for p in args.pack)
+    if not endpoints:
+        print("Packs do not use any metadata modules; nothing to prefetch.")
+        return 0
+
+    requests = build_requests(service_url=args.service_url, endpoints=endpoints, subject_ids=subjects)
+    cache_dir = Path(args.cache_dir).expanduser().resolve()
+
+    start = time.perf_counter()
+    results = asyncio.run(
+        prefetch(requests, cache_dir=cache_dir, concurrency=args.concurrency, max_age_hours=args.max_age_hours)
+    )
+    elapsed = time.perf_counter() - start
+
+    failures = 0
+    for result in sorted(results, key=lambda r: (r.request.endpoint, r.request.key)):
+        tag = "OK  " if result.ok else "FAIL"
+        failures += 0 if result.ok else 1
+        print(f"{tag} {result.request.endpoint}/{result.request.key} ({result.elapsed_s:.2f}s): {result.detail}")
+
+    print(f"Prefetched {len(results) - failures}/{len(results)} request(s) into {cache_dir} in {elapsed:.2f}s.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
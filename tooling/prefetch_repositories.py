@@ -0,0 +1,204 @@
+"""Prefetch the code repositories pinned by param packs into a shared local cache.
+
+Reads the pack catalog, de-duplicates (repository_url, repository_commit_hash) pairs
+across all packs, and populates:
+
+    <cache_dir>/objects/<repo>.git                 one bare mirror per repository_url
+    <cache_dir>/worktrees/<repo>/<commit>          one detached worktree per pinned commit
+
+Mirrors are fetched in parallel (one worker per repository); worktrees for the same
+repository are created sequentially to avoid git lock contention. Packs pinning a
+floating ref (a branch or tag such as `main` instead of a 40-character commit) are
+flagged: their objects are fetched, but no worktree is created unless
+`--include-floating` is given, in which case the ref is resolved at prefetch time.
+
+Launchers that set `repository_cache_dir` check out from these local objects instead of
+cloning or fetching over the network. Any URL git understands works, including paths
+to local bare repositories.
+
+Run from repo root:
+    python ./tooling/prefetch_repositories.py --cache-dir D:/repo_cache
+    python ./tooling/prefetch_repositories.py --list
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlparse
+
+from pack_entries import is_pinned_commit
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_DIR = Path.home() / ".openscope" / "repo_cache"
+
+
+@dataclass
+class RepoPin:
+    url: str
+    refs: dict[str, list[Path]] = field(default_factory=dict)
+
+    @property
+    def slug(self) -> str:
+        """Stable, filesystem-safe directory name for the repository."""
+
+        parsed = urlparse(self.url)
+        tail = (parsed.path or self.url).rstrip("/").rsplit("/", 1)[-1]
+        tail = re.sub(r"\.git$", "", tail) or "repo"
+        tail = re.sub(r"[^A-Za-z0-9._-]", "_", tail)
+        digest = hashlib.sha256(self.url.encode("utf-8")).hexdigest()[:8]
+        return f"{tail}-{digest}"
+
+
+@dataclass(frozen=True)
+class PrefetchResult:
+    url: str
+    ref: str
+    commit: str | None
+    worktree: Path | None
+    ok: bool
+    detail: str
+
+
+def collect_pins(paths: list[Path]) -> dict[str, RepoPin]:
+    """Map repository_url -> pinned refs -> packs using them."""
+
+    pins: dict[str, RepoPin] = {}
+    for path in paths:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            continue
+        if not isinstance(payload, dict):
+            continue
+        url = payload.get("repository_url")
+        ref = payload.get("repository_commit_hash")
+        if not isinstance(url, str) or not url.strip() or not isinstance(ref, str) or not ref.strip():
+            continue
+        pin = pins.setdefault(url.strip(), RepoPin(url=url.strip()))
+        pin.refs.setdefault(ref.strip(), []).append(path)
+    return pins
+
+
+def _git(*args: str, cwd: Path | None = None) -> str:
+    proc = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {proc.stderr.strip() or proc.stdout.strip()}")
+    return proc.stdout.strip()
+
+
+def _has_commit(bare: Path, commit: str) -> bool:
+    proc = subprocess.run(["git", "cat-file", "-e", f"{commit}^{{commit}}"], cwd=bare, capture_output=True)
+    return proc.returncode == 0
+
+
+def _ensure_mirror(pin: RepoPin, cache_dir: Path) -> Path:
+    bare = cache_dir / "objects" / f"{pin.slug}.git"
+    if not bare.exists():
+        bare.parent.mkdir(parents=True, exist_ok=True)
+        _git("clone", "--mirror", "--quiet", pin.url, str(bare))
+        return bare
+    missing = [ref for ref in pin.refs if not is_pinned_commit(ref) or not _has_commit(bare, ref)]
+    if missing:
+        _git("fetch", "--prune", "--quiet", "origin", cwd=bare)
+    for ref in missing:
+        if is_pinned_commit(ref) and not _has_commit(bare, ref):
+            # Commit not reachable from any advertised ref; ask for it directly.
+            _git("fetch", "--quiet", "origin", ref, cwd=bare)
+    return bare
+
+
+def _ensure_worktree(bare: Path, worktree: Path, commit: str) -> None:
+    if worktree.exists():
+        try:
+            if _git("rev-parse", "HEAD", cwd=worktree) == commit:
+                return
+        except RuntimeError:
+            pass
+        raise RuntimeError(f"{worktree} exists but is not a worktree at {commit}")
+    worktree.parent.mkdir(parents=True, exist_ok=True)
+    _git("worktree", "prune", cwd=bare)
+    _git("worktree", "add", "--detach", "--quiet", str(worktree), commit, cwd=bare)
+
+
+def prefetch_repo(pin: RepoPin, cache_dir: Path, *, include_floating: bool) -> list[PrefetchResult]:
+    results: list[PrefetchResult] = []
+    try:
+        bare = _ensure_mirror(pin, cache_dir)
+    except RuntimeError as exc:
+        return [PrefetchResult(pin.url, ref, None, None, False, str(exc)) for ref in sorted(pin.refs)]
+
+    for ref in sorted(pin.refs):
+        floating = not is_pinned_commit(ref)
+        try:
+            commit = _git("rev-parse", "--verify", f"{ref}^{{commit}}", cwd=bare)
+            if floating and not include_floating:
+                results.append(PrefetchResult(pin.url, ref, commit, None, True, f"floating ref (currently {commit[:12]}); no worktree"))
+                continue
+            worktree = cache_dir / "worktrees" / pin.slug / commit
+            _ensure_worktree(bare, worktree, commit)
+            detail = f"floating ref resolved to {commit[:12]}" if floating else "ready"
+            results.append(PrefetchResult(pin.url, ref, commit, worktree, True, detail))
+        except RuntimeError as exc:
+            results.append(PrefetchResult(pin.url, ref, None, None, False, str(exc)))
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Prefetch pack repositories into a shared bare-object cache")
+    parser.add_argument(
+        "--root",
+        type=str,
+        default=str(REPO_ROOT / "packs"),
+        help="Root directory containing packs (default: ./packs)",
+    )
+    parser.add_argument("--cache-dir", type=str, default=str(DEFAULT_CACHE_DIR), help="Shared repository cache directory")
+    parser.add_argument("--workers", type=int, default=4, help="Repositories fetched in parallel")
+    parser.add_argument("--include-floating", action="store_true", help="Also create worktrees for floating refs")
+    parser.add_argument("--list", action="store_true", help="Only list de-duplicated pins and floating refs")
+    args = parser.parse_args(argv)
+
+    paths = sorted(Path(args.root).resolve().rglob("*.json"))
+    pins = collect_pins(paths)
+
+    floating = [(pin.url, ref, packs) for pin in pins.values() for ref, packs in pin.refs.items() if not is_pinned_commit(ref)]
+    for url, ref, packs in floating:
+        names = ", ".join(p.relative_to(REPO_ROOT).as_posix() if p.is_relative_to(REPO_ROOT) else str(p) for p in packs)
+        print(f"WARN floating ref {ref!r} for {url} in: {names}")
+
+    if args.list:
+        for pin in pins.values():
+            for ref, packs in sorted(pin.refs.items()):
+                print(f"{pin.url} @ {ref} ({len(packs)} pack(s))")
+        return 0
+
+    cache_dir = Path(args.cache_dir).expanduser().resolve()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        batches = list(
+            pool.map(lambda pin: prefetch_repo(pin, cache_dir, include_floating=args.include_floating), pins.values())
+        )
+    elapsed = time.perf_counter() - start
+
+    failures = 0
+    for result in (r for batch in batches for r in batch):
+        failures += 0 if result.ok else 1
+        tag = "OK  " if result.ok else "FAIL"
+        where = f" -> {result.worktree}" if result.worktree else ""
+        print(f"{tag} {result.url} @ {result.ref}: {result.detail}{where}")
+
+    total = sum(len(pin.refs) for pin in pins.values())
+    print(f"Prefetched {total - failures}/{total} pin(s) from {len(pins)} repo(s) in {elapsed:.1f}s; {len(floating)} floating.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
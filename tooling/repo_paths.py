@@ -0,0 +1,29 @@
+"""Repository paths shared by the tooling: the repo root and pack discovery.
+
+Kept separate from validate.py so that launcher-facing libraries (pack_catalog.py) and
+tools that only need paths do not import the validator.
+
+This module is dependency-free (stdlib only).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def iter_json_files(root: Path) -> Iterator[Path]:
+    for path in root.rglob("*.json"):
+        # Skip schema files themselves when validating packs
+        if "schemas" in path.parts:
+            continue
+        yield path
+
+
+def rel_path(path: Path) -> str:
+    """`path` relative to the repo root (posix), or as-is when it lies outside it."""
+
+    return path.relative_to(REPO_ROOT).as_posix() if path.is_relative_to(REPO_ROOT) else path.as_posix()
@@ -0,0 +1,90 @@
+"""Report disk_space_check requirements per pack.
+
+For every pack with a `disk_space_check` entry, prints the static requirement
+(`required_free_gb`), the session duration, the rate-based estimate (when
+`data_rates_mb_per_s` is declared) and the effective requirement the launcher
+will enforce. Uses the shared estimator in `disk_space_estimator.py`.
+
+Run from repo root:
+    python ./tooling/report_disk_space.py
+    python ./tooling/report_disk_space.py --param ./packs/projects/scbc/imaging/matlab_slave_archiver.json
+
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from disk_space_estimator import DiskSpaceEstimate, estimate_pack
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _fmt_gb(value: float | None) -> str:
+    return "-" if value is None else f"{value:,.1f}"
+
+
+def _fmt_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    total = int(round(seconds))
+    return f"{total // 3600:02d}:{(total % 3600) // 60:02d}:{total % 60:02d}"
+
+
+def _describe(estimate: DiskSpaceEstimate) -> str:
+    mode = "rate" if estimate.rate_based else "static"
+    parts = [
+        f"mode={mode}",
+        f"static={_fmt_gb(estimate.static_gb)} GiB",
+        f"duration={_fmt_duration(estimate.duration_s)}",
+    ]
+    if estimate.rate_based:
+        total_rate = sum(estimate.rates_mb_per_s.values())
+        parts.append(f"rate={total_rate:,.2f} MB/s x{estimate.safety_factor:g}")
+        parts.append(f"estimate={_fmt_gb(estimate.estimated_gb)} GiB")
+    parts.append(f"required={_fmt_gb(estimate.required_gb)} GiB")
+    return "  ".join(parts)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Report per-pack disk_space_check requirements")
+    parser.add_argument("--param", type=str, default=None, help="Report a single param file")
+    parser.add_argument(
+        "--root",
+        type=str,
+        default=str(REPO_ROOT / "packs"),
+        help="Root directory containing packs (default: ./packs)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.param:
+        paths = [Path(args.param).resolve()]
+    else:
+        paths = sorted(Path(args.root).resolve().rglob("*.json"))
+
+    reported = 0
+    for path in paths:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError as exc:
+            print(f"SKIP {path}: {exc}")
+            continue
+        if not isinstance(payload, dict):
+            continue
+        for estimate in estimate_pack(payload):
+            reported += 1
+            rel = path.relative_to(REPO_ROOT) if path.is_relative_to(REPO_ROOT) else path
+            print(f"{rel.as_posix()} [pre_acquisition_pipeline[{estimate.pipeline_index}]]")
+            print(f"    {_describe(estimate)}")
+            for note in estimate.notes:
+                print(f"    NOTE: {note}")
+
+    print(f"Reported {reported} disk_space_check entr{'y' if reported == 1 else 'ies'}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,274 @@
+"""Rig registry (`rigs/<rig_id>.json`) and `{rig_param:...}` resolution.
+
+`RigRegistry.load()` reads every rig file once; `index_packs()` then resolves every pack
+for every rig that covers it (a rig covers the packs matched by its `pack_globs`, plus
+packs naming it in `rig_id`) and keeps the result in an index rig_id -> pack -> resolved
+payload, so resolving a pack at launch is a dict lookup:
+
+    registry = RigRegistry.load()
+    registry.index_packs(loaded)
+    payload = registry.resolved("slap2_behavior", "packs/projects/predictive_processing/behavior/day1.json")
+
+A rig param whose value is `null` is declared but not yet confirmed on the rig: packs
+using it are not indexed for that rig and `unset_rig_params` reports them as warnings.
+
+`check_rig_coverage` is the batched validation pass: the placeholders each pack needs are
+collected once per pack, each rig's keys once per rig, and every pack x rig pair is a
+set difference. Packs that use placeholders but are covered by no rig are reported too.
+
+This module is dependency-free (stdlib only).
+
+Run from repo root:
+    python ./tooling/rig_registry.py check
+    python ./tooling/rig_registry.py show --rig-id slap2_behavior
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Iterable
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_RIGS_DIR = REPO_ROOT / "rigs"
+
+RIG_PARAM_RE = re.compile(r"\{rig_param:([A-Za-z0-9_]+)\}")
+
+
+@dataclass(frozen=True)
+class Rig:
+    rig_id: str
+    path: Path
+    pack_globs: tuple[str, ...]
+    params: dict[str, Any]
+    throughput: dict[str, Any] | None = None
+
+
+@dataclass
+class RigRegistry:
+    rigs: dict[str, Rig] = field(default_factory=dict)
+    problems: list[str] = field(default_factory=list)
+    index: dict[str, dict[str, dict[str, Any]]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, rigs_dir: Path = DEFAULT_RIGS_DIR) -> "RigRegistry":
+        registry = cls()
+        for path in sorted(rigs_dir.glob("*.json")):
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError as exc:
+                registry.problems.append(f"{path.name}: invalid JSON ({exc})")
+                continue
+            rig_id = payload.get("rig_id") if isinstance(payload, dict) else None
+            if not isinstance(rig_id, str) or not rig_id:
+                registry.problems.append(f"{path.name}: missing rig_id")
+                continue
+            if rig_id != path.stem:
+                registry.problems.append(f"{path.name}: rig_id {rig_id!r} does not match the file name")
+            if rig_id in registry.rigs:
+                registry.problems.append(f"{path.name}: duplicate rig_id {rig_id!r}")
+                continue
+            params = payload.get("rig_params") if isinstance(payload.get("rig_params"), dict) else {}
+            globs = tuple(g for g in payload.get("pack_globs") or [] if isinstance(g, str))
+            throughput = payload.get("rig_throughput") if isinstance(payload.get("rig_throughput"), dict) else None
+            registry.rigs[rig_id] = Rig(rig_id=rig_id, path=path, pack_globs=globs, params=dict(params), throughput=throughput)
+        return registry
+
+    def params(self, rig_id: str) -> dict[str, Any]:
+        try:
+            return self.rigs[rig_id].params
+        except KeyError:
+            raise KeyError(f"unknown rig_id {rig_id!r}; known: {sorted(self.rigs)}") from None
+
+    def rigs_for_pack(self, rel_path: str, payload: dict[str, Any] | None = None) -> list[Rig]:
+        """Rigs covering a pack: those whose pack_globs match, plus the pack's own rig_id."""
+
+        matched = [rig for rig in self.rigs.values() if any(fnmatchcase(rel_path, g) for g in rig.pack_globs)]
+        rig_id = (payload or {}).get("rig_id")
+        if isinstance(rig_id, str) and rig_id in self.rigs and self.rigs[rig_id] not in matched:
+            matched.append(self.rigs[rig_id])
+        return matched
+
+    def resolve(self, value: Any, rig_id: str) -> Any:
+        """Substitute {rig_param:...} placeholders in `value` (recursively) from one rig."""
+
+        return _substitute(value, self.params(rig_id), rig_id)
+
+    def index_packs(self, loaded: Iterable[tuple[Path, dict[str, Any]]]) -> list[str]:
+        """Resolve every pack for each rig covering it into `index`; returns the pairs that failed."""
+
+        self.index = {rig_id: {} for rig_id in self.rigs}
+        failed: list[str] = []
+        for path, payload in loaded:
+            if not isinstance(payload, dict):
+                continue
+            rel = _rel(path)
+            for rig in self.rigs_for_pack(rel, payload):
+                try:
+                    self.index[rig.rig_id][rel] = self.resolve(payload, rig.rig_id)
+                except KeyError as exc:
+                    failed.append(f"{rel} on rig {rig.rig_id!r}: {exc.args[0]}")
+        return failed
+
+    def resolved(self, rig_id: str, rel_path: str) -> dict[str, Any]:
+        """A pack's payload with this rig's params substituted (see `index_packs`)."""
+
+        try:
+            return self.index[rig_id][rel_path]
+        except KeyError:
+            raise KeyError(f"{rel_path} is not indexed for rig {rig_id!r}") from None
+
+
+def _substitute(value: Any, params: dict[str, Any], rig_id: str) -> Any:
+    if isinstance(value, dict):
+        return {k: _substitute(v, params, rig_id) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_substitute(v, params, rig_id) for v in value]
+    if not isinstance(value, str) or "{rig_param:" not in value:
+        return value
+
+    def _lookup(key: str) -> Any:
+        if key not in params:
+            raise KeyError(f"rig {rig_id!r} does not define rig_param {key!r}")
+        if params[key] is None:
+            raise KeyError(f"rig {rig_id!r} has no confirmed value for rig_param {key!r}")
+        return params[key]
+
+    whole = RIG_PARAM_RE.fullmatch(value)
+    if whole:
+        return _lookup(whole.group(1))
+    return RIG_PARAM_RE.sub(lambda m: str(_lookup(m.group(1))), value)
+
+
+def required_rig_params(value: Any) -> set[str]:
+    """All {rig_param:<key>} keys referenced anywhere in a pack payload."""
+
+    keys: set[str] = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, str) and "{rig_param:" in item:
+            keys.update(RIG_PARAM_RE.findall(item))
+    return keys
+
+
+def _rel(path: Path) -> str:
+    return path.relative_to(REPO_ROOT).as_posix() if path.is_relative_to(REPO_ROOT) else path.as_posix()
+
+
+def check_rig_coverage(loaded: Iterable[tuple[Path, dict[str, Any]]], registry: RigRegistry) -> list[str]:
+    """Batched pack x rig check; returns a list of problems."""
+
+    problems = list(registry.problems)
+    rig_keys = {rig_id: set(rig.params) for rig_id, rig in registry.rigs.items()}
+    for path, payload in loaded:
+        if not isinstance(payload, dict):
+            continue
+        rel = _rel(path)
+        rig_id = payload.get("rig_id")
+        if isinstance(rig_id, str) and rig_id and rig_id not in registry.rigs:
+            problems.append(f"{rel}: rig_id {rig_id!r} is not in the rig registry")
+        needed = required_rig_params(payload)
+        if not needed:
+            continue
+        rigs = registry.rigs_for_pack(rel, payload)
+        if not rigs:
+            problems.append(f"{rel}: uses {sorted(needed)} but no rig in the registry covers it")
+            continue
+        for rig in rigs:
+            missing = needed - rig_keys[rig.rig_id]
+            if missing:
+                problems.append(f"{rel} on rig {rig.rig_id!r}: missing rig_params {sorted(missing)}")
+    return problems
+
+
+def unset_rig_params(loaded: Iterable[tuple[Path, dict[str, Any]]], registry: RigRegistry) -> list[str]:
+    """Per rig, the declared-but-null params its packs use (values still to confirm on the rig)."""
+
+    used: dict[str, set[str]] = {rig_id: set() for rig_id in registry.rigs}
+    for path, payload in loaded:
+        if not isinstance(payload, dict):
+            continue
+        needed = required_rig_params(payload)
+        for rig in registry.rigs_for_pack(_rel(path), payload) if needed else ():
+            used[rig.rig_id] |= needed
+    warnings: list[str] = []
+    for rig_id, rig in sorted(registry.rigs.items()):
+        unset = sorted(key for key in used[rig_id] if key in rig.params and rig.params[key] is None)
+        if unset:
+            warnings.append(f"rig {rig_id!r}: rig_params {unset} have no value yet; packs using them cannot launch on it")
+    return warnings
+
+
+def _load_packs(root: Path) -> list[tuple[Path, dict[str, Any]]]:
+    loaded: list[tuple[Path, dict[str, Any]]] = []
+    for path in sorted(root.rglob("*.json")):
+        try:
+            loaded.append((path, json.loads(path.read_text(encoding="utf-8"))))
+        except ValueError:
+            continue
+    return loaded
+
+
+def _cmd_check(args: argparse.Namespace) -> int:
+    registry = RigRegistry.load(Path(args.rigs_dir))
+    loaded = _load_packs(Path(args.root).resolve())
+    problems = check_rig_coverage(loaded, registry)
+    for problem in problems:
+        print(f"FAIL {problem}")
+    for warning in unset_rig_params(loaded, registry):
+        print(f"WARN {warning}")
+    registry.index_packs(loaded)
+    indexed = sum(len(packs) for packs in registry.index.values())
+    covered = sum(1 for path, payload in loaded if required_rig_params(payload) and registry.rigs_for_pack(_rel(path), payload))
+    print(
+        f"{len(registry.rigs)} rig(s), {covered} pack(s) with rig params covered, "
+        f"{indexed} pack x rig pair(s) resolved, {len(problems)} problem(s)."
+    )
+    return 1 if problems else 0
+
+
+def _cmd_show(args: argparse.Namespace) -> int:
+    registry = RigRegistry.load(Path(args.rigs_dir))
+    try:
+        print(json.dumps(registry.params(args.rig_id), indent=2))
+        if args.param:
+            path = Path(args.param).resolve()
+            for problem in registry.index_packs([(path, json.loads(path.read_text(encoding="utf-8")))]):
+                print(f"FAIL {problem}")
+            print(json.dumps(registry.resolved(args.rig_id, _rel(path)).get("script_parameters") or {}, indent=2))
+    except KeyError as exc:
+        print(f"FAIL {exc.args[0]}")
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check and inspect the rig parameter registry")
+    parser.add_argument("--rigs-dir", type=str, default=str(DEFAULT_RIGS_DIR), help="Rig registry directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    check = sub.add_parser("check", help="Check every pack x rig combination for missing rig params")
+    check.add_argument("--root", type=str, default=str(REPO_ROOT / "packs"))
+    check.set_defaults(func=_cmd_check)
+
+    show = sub.add_parser("show", help="Print a rig's params (and a pack's resolved script_parameters)")
+    show.add_argument("--rig-id", type=str, required=True)
+    show.add_argument("--param", type=str, default=None)
+    show.set_defaults(func=_cmd_show)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,414 @@
+"""Reference reader/writer and concurrent scanner for SLAP2 routing manifests.
+
+Two on-disk formats are supported (see `model_slap2_meta_annotator.Parameters.manifest_format`):
+
+- `json`: one JSON document, either a list of records or an object with a `files` list.
+- `jsonl`: JSON Lines; one `RoutingManifestRecord` object per line, appended as files are routed.
+
+`iter_manifest_records` streams either format without holding a JSONL manifest in memory,
+so `session_archiver` can walk manifests with tens of thousands of records and reuse their
+`content_hash` values instead of re-reading files. `RoutingManifestIndex` loads a manifest
+into compact columns with hash indexes for O(1) routing lookups.
+
+A manifest may hold several records for one source_path (a file re-routed or re-scanned
+is appended again); the later record replaces the earlier one everywhere: in the index,
+in `hashes_by_source`, in `summary` and in `validate.py --manifest`.
+
+This module is dependency-free (stdlib only).
+
+Run from repo root:
+    python ./tooling/routing_manifest.py scan <session_dir> --workers 8 --hash sha256 --out manifest.jsonl
+    python ./tooling/routing_manifest.py summary manifest.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from sys import intern
+from typing import Any, Iterable, Iterator
+
+
+HASH_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def manifest_format_for(path: Path) -> str:
+    """Infer the manifest format from the file suffix (`.jsonl` -> jsonl, else json)."""
+
+    return "jsonl" if path.suffix.lower() in {".jsonl", ".ndjson"} else "json"
+
+
+def iter_manifest_records(path: Path, *, manifest_format: str | None = None) -> Iterator[dict[str, Any]]:
+    """Yield manifest records one at a time.
+
+    JSON Lines manifests are read line by line; a truncated final line (e.g. a writer
+    interrupted mid-append) is skipped rather than failing the whole read.
+    """
+
+    fmt = manifest_format or manifest_format_for(path)
+    if fmt == "jsonl":
+        bad_line: int | None = None
+        with path.open("r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                if bad_line is not None:
+                    raise RuntimeError(f"{path}:{bad_line}: invalid JSON record")
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Tolerated only if it turns out to be a partial trailing append.
+                    bad_line = line_no
+                    continue
+                if not isinstance(record, dict):
+                    raise RuntimeError(f"{path}:{line_no}: manifest record must be an object")
+                yield record
+        return
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    records = data.get("files") if isinstance(data, dict) else data
+    if not isinstance(records, list):
+        raise RuntimeError(f"{path}: expected a list of records or an object with a 'files' list")
+    for record in records:
+        if isinstance(record, dict):
+            yield record
+
+
+def append_manifest_records(path: Path, records: Iterable[dict[str, Any]]) -> int:
+    """Append records to a JSON Lines manifest, flushing each line. Returns the count written."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with path.open("a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            f.flush()
+            count += 1
+    return count
+
+
+def hash_file(path: Path, algo: str) -> str:
+    digest = hashlib.new(algo)
+    with path.open("rb") as f:
+        while chunk := f.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _scan_dir(path: Path) -> tuple[list[os.DirEntry], list[Path]]:
+    files: list[os.DirEntry] = []
+    subdirs: list[Path] = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(Path(entry.path))
+            elif entry.is_file(follow_symlinks=False):
+                files.append(entry)
+    return files, subdirs
+
+
+def _file_record(entry: os.DirEntry, root: Path, hash_algo: str | None) -> dict[str, Any]:
+    stat = entry.stat(follow_symlinks=False)
+    record: dict[str, Any] = {
+        "source_path": Path(entry.path).relative_to(root).as_posix(),
+        "size_bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    if hash_algo:
+        record["hash_algo"] = hash_algo
+        record["content_hash"] = hash_file(Path(entry.path), hash_algo)
+    return record
+
+
+def scan_session(
+    root: Path,
+    *,
+    workers: int = 1,
+    hash_algo: str | None = None,
+    exclude_dirs: Iterable[str] = ("launcher_metadata",),
+) -> Iterator[dict[str, Any]]:
+    """Scan a session folder concurrently, yielding a record per file as soon as it is ready.
+
+    Directory listing and per-file stat/hash work share one thread pool of `workers` threads;
+    records are yielded in completion order, not path order.
+    """
+
+    root = root.resolve()
+    excluded = {root / name for name in exclude_dirs}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        root_future = pool.submit(_scan_dir, root)
+        kinds: dict[Future, str] = {root_future: "dir"}
+        pending: set[Future] = {root_future}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                kind = kinds.pop(fut)
+                if kind == "file":
+                    yield fut.result()
+                    continue
+                files, subdirs = fut.result()
+                for subdir in subdirs:
+                    if subdir in excluded:
+                        continue
+                    child = pool.submit(_scan_dir, subdir)
+                    kinds[child] = "dir"
+                    pending.add(child)
+                for entry in files:
+                    child = pool.submit(_file_record, entry, root, hash_algo)
+                    kinds[child] = "file"
+                    pending.add(child)
+
+
+def hashes_by_source(path: Path, *, hash_algo: str) -> dict[str, str]:
+    """Map source_path -> content_hash for records hashed with `hash_algo` (archiver reuse)."""
+
+    hashes: dict[str, str] = {}
+    for r in iter_manifest_records(path):
+        if not r.get("source_path"):
+            continue
+        source = str(r["source_path"])
+        if r.get("hash_algo") == hash_algo and r.get("content_hash"):
+            hashes[source] = str(r["content_hash"])
+        else:
+            # A later record without a matching hash supersedes the earlier one.
+            hashes.pop(source, None)
+    return hashes
+
+
+def normalize_manifest_path(value: str) -> str:
+    """Normalize a manifest path for lookups: POSIX separators, no leading './' or trailing '/'."""
+
+    text = str(value).replace("\\", "/")
+    while text.startswith("./"):
+        text = text[2:]
+    return text.rstrip("/")
+
+
+class RoutingManifestIndex:
+    """Columnar, indexed view of a routing manifest.
+
+    Records are stored column-wise (one list per field, strings interned) rather than as one
+    dict per file, and three hash indexes answer the archiver's questions in O(1):
+
+    - `lookup(source_path)`: routing for one file
+    - `in_destination_dir(dir)`: files routed directly into a directory
+    - `with_annotation(key, value)`: files carrying a scalar annotation value
+    """
+
+    __slots__ = (
+        "source_path",
+        "destination_path",
+        "category",
+        "size_bytes",
+        "mtime_ns",
+        "hash_algo",
+        "content_hash",
+        "annotations",
+        "extra",
+        "_by_source",
+        "_by_destination_dir",
+        "_by_annotation",
+    )
+
+    def __init__(self) -> None:
+        self.source_path: list[str] = []
+        self.destination_path: list[str | None] = []
+        self.category: list[str | None] = []
+        self.size_bytes: list[int | None] = []
+        self.mtime_ns: list[int | None] = []
+        self.hash_algo: list[str | None] = []
+        self.content_hash: list[str | None] = []
+        self.annotations: list[dict[str, Any] | None] = []
+        self.extra: list[dict[str, Any] | None] = []
+        self._by_source: dict[str, int] = {}
+        # Row sets as insertion-ordered dicts, so replacing a record unindexes in O(1).
+        self._by_destination_dir: dict[str, dict[int, None]] = {}
+        self._by_annotation: dict[tuple[str, Any], dict[int, None]] = {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict[str, Any]]) -> "RoutingManifestIndex":
+        index = cls()
+        for record in records:
+            index.add(record)
+        return index
+
+    @classmethod
+    def from_path(cls, path: Path) -> "RoutingManifestIndex":
+        return cls.from_records(iter_manifest_records(path))
+
+    def __len__(self) -> int:
+        return len(self.source_path)
+
+    def __contains__(self, source_path: str) -> bool:
+        return normalize_manifest_path(source_path) in self._by_source
+
+    def add(self, record: dict[str, Any]) -> int:
+        """Add one record; a later record for the same source_path replaces the earlier one."""
+
+        source = intern(normalize_manifest_path(record["source_path"]))
+        destination = record.get("destination_path")
+        destination = intern(normalize_manifest_path(destination)) if destination else None
+        annotations = record.get("annotations") if isinstance(record.get("annotations"), dict) else None
+
+        row = self._by_source.get(source)
+        if row is not None:
+            self._unindex(row)
+        else:
+            row = len(self.source_path)
+            for column in (
+                self.source_path,
+                self.destination_path,
+                self.category,
+                self.size_bytes,
+                self.mtime_ns,
+                self.hash_algo,
+                self.content_hash,
+                self.annotations,
+                self.extra,
+            ):
+                column.append(None)
+
+        self.source_path[row] = source
+        self.destination_path[row] = destination
+        self.category[row] = intern(str(record["category"])) if record.get("category") else None
+        self.size_bytes[row] = record.get("size_bytes")
+        self.mtime_ns[row] = record.get("mtime_ns")
+        self.hash_algo[row] = intern(str(record["hash_algo"])) if record.get("hash_algo") else None
+        self.content_hash[row] = record.get("content_hash")
+        self.annotations[row] = annotations
+        self.extra[row] = {k: v for k, v in record.items() if k not in _RECORD_COLUMNS} or None
+
+        self._by_source[source] = row
+        if destination:
+            self._by_destination_dir.setdefault(intern(_parent_dir(destination)), {})[row] = None
+        for key, value in _scalar_annotations(annotations):
+            self._by_annotation.setdefault((key, value), {})[row] = None
+        return row
+
+    def _unindex(self, row: int) -> None:
+        destination = self.destination_path[row]
+        if destination:
+            _discard(self._by_destination_dir, _parent_dir(destination), row)
+        for key, value in _scalar_annotations(self.annotations[row]):
+            _discard(self._by_annotation, (key, value), row)
+
+    def record(self, row: int) -> dict[str, Any]:
+        """Materialize one row back into a record dict (omitting empty fields)."""
+
+        record = {
+            "source_path": self.source_path[row],
+            "destination_path": self.destination_path[row],
+            "category": self.category[row],
+            "size_bytes": self.size_bytes[row],
+            "mtime_ns": self.mtime_ns[row],
+            "hash_algo": self.hash_algo[row],
+            "content_hash": self.content_hash[row],
+            "annotations": self.annotations[row],
+        }
+        return {**{k: v for k, v in record.items() if v is not None}, **(self.extra[row] or {})}
+
+    def lookup(self, source_path: str) -> dict[str, Any] | None:
+        row = self._by_source.get(normalize_manifest_path(source_path))
+        return None if row is None else self.record(row)
+
+    def destination_for(self, source_path: str) -> str | None:
+        row = self._by_source.get(normalize_manifest_path(source_path))
+        return None if row is None else self.destination_path[row]
+
+    def in_destination_dir(self, destination_dir: str) -> list[dict[str, Any]]:
+        rows = self._by_destination_dir.get(normalize_manifest_path(destination_dir), {})
+        return [self.record(row) for row in rows]
+
+    def with_annotation(self, key: str, value: Any) -> list[dict[str, Any]]:
+        return [self.record(row) for row in self._by_annotation.get((key, value), {})]
+
+
+# Record fields with their own column; anything else is kept per row in `extra`.
+_RECORD_COLUMNS = frozenset(
+    ("source_path", "destination_path", "category", "size_bytes", "mtime_ns", "hash_algo", "content_hash", "annotations")
+)
+
+
+def _parent_dir(destination: str) -> str:
+    return destination.rsplit("/", 1)[0] if "/" in destination else ""
+
+
+def _scalar_annotations(annotations: dict[str, Any] | None) -> Iterator[tuple[str, Any]]:
+    for key, value in (annotations or {}).items():
+        if isinstance(value, (str, int, float, bool)) or value is None:
+            yield key, value
+
+
+def _discard(index: dict[Any, dict[int, None]], key: Any, row: int) -> None:
+    rows = index.get(key)
+    if rows is not None:
+        rows.pop(row, None)
+        if not rows:
+            del index[key]
+
+
+def _cmd_scan(args: argparse.Namespace) -> int:
+    start = time.perf_counter()
+    records = scan_session(Path(args.session_dir), workers=args.workers, hash_algo=args.hash)
+    if args.out:
+        out = Path(args.out)
+        if out.exists() and not args.append:
+            out.unlink()
+        count = append_manifest_records(out, records)
+    else:
+        count = sum(1 for _ in records)
+    elapsed = time.perf_counter() - start
+    print(f"Scanned {count} file(s) with {args.workers} worker(s) in {elapsed:.2f}s.")
+    return 0
+
+
+def _cmd_summary(args: argparse.Namespace) -> int:
+    count = 0
+    # Later records for a source_path replace earlier ones; keep only what summary needs.
+    latest: dict[str, tuple[int, bool, str]] = {}
+    for record in iter_manifest_records(Path(args.manifest)):
+        count += 1
+        latest[normalize_manifest_path(record.get("source_path") or "")] = (
+            int(record.get("size_bytes") or 0),
+            bool(record.get("content_hash")),
+            str(record.get("category") or "-"),
+        )
+    total_bytes = sum(size for size, _, _ in latest.values())
+    hashed = sum(1 for _, has_hash, _ in latest.values() if has_hash)
+    by_category: dict[str, int] = {}
+    for _, _, category in latest.values():
+        by_category[category] = by_category.get(category, 0) + 1
+    print(f"{count} record(s) for {len(latest)} file(s), {total_bytes / 1024**3:.2f} GiB, {hashed} hashed")
+    for category in sorted(by_category):
+        print(f"  {category}: {by_category[category]}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Scan sessions into / summarize SLAP2 routing manifests")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scan = sub.add_parser("scan", help="Concurrently scan a session folder into a JSON Lines manifest")
+    scan.add_argument("session_dir", type=str)
+    scan.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Scan/hash worker threads")
+    scan.add_argument("--hash", type=str, default=None, choices=["md5", "sha1", "sha256", "blake2b"])
+    scan.add_argument("--out", type=str, default=None, help="JSON Lines manifest to write (omit to only time the scan)")
+    scan.add_argument("--append", action="store_true", help="Append to --out instead of replacing it")
+    scan.set_defaults(func=_cmd_scan)
+
+    summary = sub.add_parser("summary", help="Stream a manifest and print counts per category")
+    summary.add_argument("manifest", type=str)
+    summary.set_defaults(func=_cmd_summary)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
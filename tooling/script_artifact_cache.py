@@ -0,0 +1,317 @@
+"""Content-addressed artifact cache for `script_module` pipeline entries.
+
+A script_module entry opts in with `module_parameters.cache` (see
+`model_launcher.ScriptArtifactCache`). The cache key is
+
+    sha256(repository_commit_hash, module_path, function, canonical(function_args minus outputs))
+
+where canonical() is sorted-key, compact JSON. Identical calls (same commit, function and
+arguments, e.g. the predictive_processing stimulus tables with `seed: 42`) therefore share
+one entry, and the launcher copies the cached outputs into place instead of regenerating.
+
+The key is computed on placeholder-resolved arguments: a non-output argument such as
+`{subject_id}` or `{rig_param:...}` must be substituted first, otherwise every session
+would share one key and restore another session's artifact. `cache_key` raises
+ValueError for arguments that still hold a placeholder; `keys --var name=value`
+substitutes them.
+
+Layout:
+    <cache_dir>/<key[:2]>/<key>/entry.json   key inputs, output file names, timestamps
+    <cache_dir>/<key[:2]>/<key>/<output>     one file per `outputs` name
+
+This module is dependency-free (stdlib only).
+
+Run from repo root:
+    python ./tooling/script_artifact_cache.py keys --param ./packs/projects/predictive_processing/behavior/day1.json
+    python ./tooling/script_artifact_cache.py keys --param <pack> --var subject_id=123456 --var rig_param:COM_port=COM3
+    python ./tooling/script_artifact_cache.py evict --cache-dir D:/artifact_cache --max-size-gb 20 --max-age-days 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from pack_entries import SCRIPT_MODULE, is_pinned_commit, iter_pipeline_entries
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".openscope" / "artifact_cache"
+ENTRY_FILE = "entry.json"
+
+# `{subject_id}`, `{output_session_folder}`, `{rig_param:COM_port}`, ...
+PLACEHOLDER_RE = re.compile(r"\{([^{}]+)\}")
+
+
+def canonicalize_args(function_args: dict[str, Any] | None, *, exclude: Iterable[str] = ()) -> str:
+    excluded = set(exclude)
+    args = {k: v for k, v in (function_args or {}).items() if k not in excluded}
+    return json.dumps(args, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def unresolved_args(function_args: dict[str, Any] | None, outputs: Iterable[str]) -> list[str]:
+    """Non-output argument names whose values still contain a placeholder."""
+
+    excluded = set(outputs)
+    return sorted(
+        name
+        for name, value in (function_args or {}).items()
+        if name not in excluded and PLACEHOLDER_RE.search(json.dumps(value, ensure_ascii=False))
+    )
+
+
+def substitute_placeholders(value: Any, variables: dict[str, str]) -> Any:
+    """Replace `{name}` placeholders (recursively) with `variables[name]`; unknown names are kept."""
+
+    if isinstance(value, dict):
+        return {k: substitute_placeholders(v, variables) for k, v in value.items()}
+    if isinstance(value, list):
+        return [substitute_placeholders(v, variables) for v in value]
+    if isinstance(value, str):
+        return PLACEHOLDER_RE.sub(lambda m: variables.get(m.group(1), m.group(0)), value)
+    return value
+
+
+def cache_key(
+    *,
+    repository_commit_hash: str,
+    module_path: str,
+    function: str | None,
+    function_args: dict[str, Any] | None,
+    outputs: Iterable[str],
+) -> str:
+    """Key over placeholder-resolved `function_args`; raises ValueError if any non-output arg is unresolved."""
+
+    outputs = list(outputs)
+    unresolved = unresolved_args(function_args, outputs)
+    if unresolved:
+        raise ValueError(f"function_args {unresolved} still contain placeholders; resolve them before keying")
+    material = "\n".join(
+        [
+            repository_commit_hash.lower(),
+            module_path.replace("\\", "/"),
+            function or "",
+            canonicalize_args(function_args, exclude=outputs),
+        ]
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def entry_dir(cache_dir: Path, key: str) -> Path:
+    return cache_dir / key[:2] / key
+
+
+def _touch(entry: Path) -> None:
+    meta_path = entry / ENTRY_FILE
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["last_used_at"] = time.time()
+    tmp = entry / f".{ENTRY_FILE}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+    tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    os.replace(tmp, meta_path)
+
+
+def restore(cache_dir: Path, key: str, destinations: dict[str, Path]) -> bool:
+    """Copy cached outputs to `destinations` (output name -> path). Returns False on a miss."""
+
+    entry = entry_dir(cache_dir, key)
+    if not (entry / ENTRY_FILE).exists():
+        return False
+    for name in destinations:
+        if not (entry / name).is_file():
+            return False
+    for name, dest in destinations.items():
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(entry / name, dest)
+    _touch(entry)
+    return True
+
+
+def store(cache_dir: Path, key: str, outputs: dict[str, Path], *, inputs: dict[str, Any]) -> Path:
+    """Store freshly generated outputs (output name -> path) under `key`.
+
+    Writes into a temporary sibling directory and renames it into place, so concurrent
+    launches never observe a half-written entry.
+    """
+
+    entry = entry_dir(cache_dir, key)
+    if (entry / ENTRY_FILE).exists():
+        return entry
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    staging = entry.parent / f".{key}.{os.getpid()}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+    for name, src in outputs.items():
+        shutil.copy2(src, staging / name)
+    now = time.time()
+    meta = {"key": key, "inputs": inputs, "outputs": sorted(outputs), "created_at": now, "last_used_at": now}
+    (staging / ENTRY_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    try:
+        os.replace(staging, entry)
+    except OSError:
+        # Another launch stored the same entry first; theirs is equivalent.
+        shutil.rmtree(staging, ignore_errors=True)
+    return entry
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    path: Path
+    size_bytes: int
+    last_used_at: float
+
+
+def iter_entries(cache_dir: Path) -> list[CacheEntry]:
+    entries: list[CacheEntry] = []
+    for meta_path in cache_dir.glob(f"*/*/{ENTRY_FILE}"):
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        size = sum(p.stat().st_size for p in meta_path.parent.iterdir() if p.is_file())
+        entries.append(CacheEntry(path=meta_path.parent, size_bytes=size, last_used_at=float(meta.get("last_used_at", 0))))
+    return entries
+
+
+def evict(cache_dir: Path, *, max_size_bytes: int | None = None, max_age_s: float | None = None) -> list[CacheEntry]:
+    """Remove entries older than `max_age_s`, then least-recently-used until under `max_size_bytes`."""
+
+    now = time.time()
+    entries = sorted(iter_entries(cache_dir), key=lambda e: e.last_used_at)
+    evicted: list[CacheEntry] = []
+    kept: list[CacheEntry] = []
+    for entry in entries:
+        if max_age_s is not None and now - entry.last_used_at > max_age_s:
+            evicted.append(entry)
+        else:
+            kept.append(entry)
+    if max_size_bytes is not None:
+        total = sum(e.size_bytes for e in kept)
+        while kept and total > max_size_bytes:
+            entry = kept.pop(0)
+            total -= entry.size_bytes
+            evicted.append(entry)
+    for entry in evicted:
+        shutil.rmtree(entry.path, ignore_errors=True)
+    return evicted
+
+
+def iter_cached_script_entries(payload: dict[str, Any]) -> Iterable[tuple[str, int, dict[str, Any]]]:
+    """Yield (pipeline name, index, entry) for script_module entries with an enabled cache block."""
+
+    for pipeline_name, idx, entry in iter_pipeline_entries(payload, module_type=SCRIPT_MODULE):
+        params = entry.get("module_parameters")
+        if not isinstance(params, dict) or params.get("cache") is None:
+            continue
+        cache = params["cache"]
+        if isinstance(cache, dict) and cache.get("enabled", True) is False:
+            continue
+        yield pipeline_name, idx, entry
+
+
+def check_cache_contract(payload: dict[str, Any]) -> list[str]:
+    """Validation rules for cached script_module entries; returns a list of problems."""
+
+    problems: list[str] = []
+    for pipeline_name, idx, entry in iter_cached_script_entries(payload):
+        where = f"{pipeline_name}[{idx}]"
+        params = entry["module_parameters"]
+        cache = params["cache"]
+        if not isinstance(cache, dict):
+            problems.append(f"{where}: cache must be an object")
+            continue
+        if not is_pinned_commit(payload.get("repository_commit_hash")):
+            problems.append(
+                f"{where}: cache requires a pinned 40-character repository_commit_hash, "
+                f"got {payload.get('repository_commit_hash')!r}"
+            )
+        if not params.get("function"):
+            problems.append(f"{where}: cache requires module_parameters.function")
+        outputs = cache.get("outputs")
+        function_args = params.get("function_args") if isinstance(params.get("function_args"), dict) else {}
+        if not isinstance(outputs, list) or not outputs or not all(isinstance(o, str) for o in outputs):
+            problems.append(f"{where}: cache.outputs must be a non-empty list of function_args keys")
+        else:
+            missing = [o for o in outputs if o not in function_args]
+            if missing:
+                problems.append(f"{where}: cache.outputs not found in function_args: {missing}")
+        for key in ("max_size_gb", "max_age_days"):
+            value = cache.get(key)
+            if value is not None and (not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0):
+                problems.append(f"{where}: cache.{key} must be a positive number")
+    return problems
+
+
+def _cmd_keys(args: argparse.Namespace) -> int:
+    payload = json.loads(Path(args.param).read_text(encoding="utf-8"))
+    variables = dict(item.split("=", 1) for item in args.var or [])
+    failures = 0
+    for pipeline_name, idx, entry in iter_cached_script_entries(payload):
+        params = entry["module_parameters"]
+        label = f"{pipeline_name}[{idx}] {entry.get('module_path')}:{params.get('function')}"
+        try:
+            key = cache_key(
+                repository_commit_hash=str(payload.get("repository_commit_hash") or ""),
+                module_path=str(entry.get("module_path")),
+                function=params.get("function"),
+                function_args=substitute_placeholders(params.get("function_args"), variables),
+                outputs=params["cache"].get("outputs") or [],
+            )
+        except ValueError as exc:
+            failures += 1
+            print(f"{label}: {exc} (pass --var name=value)")
+            continue
+        print(f"{label} -> {key}")
+    return 1 if failures else 0
+
+
+def _cmd_evict(args: argparse.Namespace) -> int:
+    evicted = evict(
+        Path(args.cache_dir),
+        max_size_bytes=int(args.max_size_gb * 1024**3) if args.max_size_gb is not None else None,
+        max_age_s=args.max_age_days * 86400 if args.max_age_days is not None else None,
+    )
+    freed = sum(e.size_bytes for e in evicted)
+    print(f"Evicted {len(evicted)} entr{'y' if len(evicted) == 1 else 'ies'} ({freed / 1024**2:.1f} MiB).")
+    return 0
+
+
+def _cmd_stats(args: argparse.Namespace) -> int:
+    entries = iter_entries(Path(args.cache_dir))
+    total = sum(e.size_bytes for e in entries)
+    print(f"{len(entries)} entr{'y' if len(entries) == 1 else 'ies'}, {total / 1024**2:.1f} MiB in {args.cache_dir}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect and maintain the script_module artifact cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    keys = sub.add_parser("keys", help="Print cache keys for a pack's cached script_module entries")
+    keys.add_argument("--param", type=str, required=True)
+    keys.add_argument("--var", action="append", help="Placeholder value, e.g. subject_id=123456 or rig_param:COM_port=COM3")
+    keys.set_defaults(func=_cmd_keys)
+
+    ev = sub.add_parser("evict", help="Evict entries by age and/or total size")
+    ev.add_argument("--cache-dir", type=str, default=str(DEFAULT_CACHE_DIR))
+    ev.add_argument("--max-size-gb", type=float, default=None)
+    ev.add_argument("--max-age-days", type=float, default=None)
+    ev.set_defaults(func=_cmd_evict)
+
+    stats = sub.add_parser("stats", help="Print entry count and total size")
+    stats.add_argument("--cache-dir", type=str, default=str(DEFAULT_CACHE_DIR))
+    stats.set_defaults(func=_cmd_stats)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
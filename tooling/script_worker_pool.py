@@ -0,0 +1,269 @@
+"""Reference warm worker pool for `execution: "pooled"` script_module entries.
+
+Each (local_repository_path, repository_commit_hash) pair gets its own set of worker
+processes, so modules imported from one commit never serve a call for another. Workers
+import `preload_modules` at start-up and keep script modules imported between calls;
+a call that exceeds its timeout terminates the worker, which is replaced on demand.
+
+The API is synchronous and thread-safe:
+
+    with ScriptWorkerPool(preload_modules=["numpy"]) as pool:
+        pool.call(repo_path, commit, "code/gen.py", "generate_single_session_csv", {"seed": 42}, timeout_s=120)
+
+This module is dependency-free (stdlib only).
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any
+
+
+class ScriptCallError(RuntimeError):
+    """The script function raised; carries the worker-side traceback."""
+
+
+class ScriptCallTimeout(TimeoutError):
+    """The script function did not return within its timeout."""
+
+
+def _load_script(path: Path, cache: dict[Path, tuple[float, Any]]):
+    mtime = path.stat().st_mtime
+    cached = cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    spec = importlib.util.spec_from_file_location(f"_pooled_{len(cache)}_{path.stem}", path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Unable to import {path}")
+    module = importlib.util.module_from_spec(spec)
+    # Like `python script.py`: the script's own directory is importable, so sibling
+    # helper modules resolve the same way as in an unpooled run.
+    script_dir = str(path.parent)
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    spec.loader.exec_module(module)
+    cache[path] = (mtime, module)
+    return module
+
+
+def _worker_main(conn: Connection, repo_path: str, preload_modules: list[str]) -> None:
+    if repo_path and repo_path not in sys.path:
+        sys.path.insert(0, repo_path)
+    for name in preload_modules:
+        importlib.import_module(name)
+    conn.send(("ready", None))
+
+    scripts: dict[Path, tuple[float, Any]] = {}
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        script_path, function, kwargs = message
+        try:
+            path = Path(script_path)
+            if not path.is_absolute():
+                path = Path(repo_path) / path
+            module = _load_script(path.resolve(), scripts)
+            result = getattr(module, function)(**(kwargs or {}))
+            conn.send(("ok", result))
+        except BaseException:
+            conn.send(("error", traceback.format_exc()))
+
+
+@dataclass
+class _Worker:
+    process: Any
+    conn: Connection
+    calls: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self, *, graceful: bool = True) -> None:
+        if graceful and self.alive():
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=2)
+            except (OSError, EOFError):
+                pass
+        if self.alive():
+            self.process.terminate()
+            self.process.join(timeout=2)
+        self.conn.close()
+
+
+class ScriptWorkerPool:
+    def __init__(
+        self,
+        *,
+        max_workers: int = 1,
+        preload_modules: list[str] | None = None,
+        idle_timeout_s: float | None = None,
+        max_calls_per_worker: int | None = None,
+        start_timeout_s: float = 120.0,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.preload_modules = list(preload_modules or [])
+        self.idle_timeout_s = idle_timeout_s
+        self.max_calls_per_worker = max_calls_per_worker
+        self.start_timeout_s = start_timeout_s
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, str], queue.LifoQueue[_Worker]] = {}
+        self._counts: dict[tuple[str, str], int] = {}
+
+    @classmethod
+    def from_params(cls, params: dict[str, Any] | None) -> "ScriptWorkerPool":
+        """Build a pool from a pack's `script_worker_pool` object."""
+
+        params = params or {}
+        return cls(
+            max_workers=int(params.get("max_workers", 1)),
+            preload_modules=list(params.get("preload_modules") or []),
+            idle_timeout_s=params.get("idle_timeout_s"),
+            max_calls_per_worker=params.get("max_calls_per_worker"),
+        )
+
+    def __enter__(self) -> "ScriptWorkerPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _spawn(self, key: tuple[str, str]) -> _Worker:
+        parent, child = self._ctx.Pipe()
+        process = self._ctx.Process(target=_worker_main, args=(child, key[0], self.preload_modules), daemon=True)
+        process.start()
+        child.close()
+        if not parent.poll(self.start_timeout_s):
+            process.terminate()
+            raise ScriptCallTimeout(f"worker for {key} did not start within {self.start_timeout_s}s")
+        try:
+            parent.recv()
+        except EOFError:
+            process.join(timeout=2)
+            raise RuntimeError(f"worker for {key} exited during start-up (exit code {process.exitcode})") from None
+        return _Worker(process=process, conn=parent)
+
+    def warm(self, repo_path: str, commit: str, count: int | None = None) -> None:
+        """Start workers for a repository commit ahead of the first call."""
+
+        key = (str(repo_path), str(commit))
+        for _ in range(count or self.max_workers):
+            with self._lock:
+                if self._counts.get(key, 0) >= self.max_workers:
+                    return
+                self._counts[key] = self._counts.get(key, 0) + 1
+                idle = self._idle.setdefault(key, queue.LifoQueue())
+            try:
+                idle.put(self._spawn(key))
+            except BaseException:
+                self._discard(key)
+                raise
+
+    def _acquire(self, key: tuple[str, str]) -> _Worker:
+        with self._lock:
+            idle = self._idle.setdefault(key, queue.LifoQueue())
+            spawn = idle.empty() and self._counts.get(key, 0) < self.max_workers
+            if spawn:
+                self._counts[key] = self._counts.get(key, 0) + 1
+        if spawn:
+            try:
+                return self._spawn(key)
+            except BaseException:
+                self._discard(key)
+                raise
+        worker = idle.get()
+        if worker.alive():
+            return worker
+        # Died while idle (crash or external kill); replace it.
+        worker.stop(graceful=False)
+        self._discard(key)
+        return self._acquire(key)
+
+    def _discard(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            self._counts[key] = max(0, self._counts.get(key, 0) - 1)
+
+    def _release(self, key: tuple[str, str], worker: _Worker) -> None:
+        worker.calls += 1
+        worker.last_used = time.monotonic()
+        if self.max_calls_per_worker and worker.calls >= self.max_calls_per_worker:
+            worker.stop()
+            self._discard(key)
+            return
+        self._idle[key].put(worker)
+
+    def call(
+        self,
+        repo_path: str,
+        commit: str,
+        script_path: str,
+        function: str,
+        kwargs: dict[str, Any] | None = None,
+        *,
+        timeout_s: float | None = None,
+    ) -> Any:
+        """Run `function(**kwargs)` from `script_path` in a warm worker for (repo_path, commit)."""
+
+        key = (str(repo_path), str(commit))
+        self.reap_idle()
+        worker = self._acquire(key)
+        try:
+            worker.conn.send((script_path, function, kwargs or {}))
+            if not worker.conn.poll(timeout_s):
+                raise ScriptCallTimeout(f"{script_path}:{function} exceeded {timeout_s}s")
+            status, value = worker.conn.recv()
+        except BaseException:
+            worker.stop(graceful=False)
+            self._discard(key)
+            raise
+        self._release(key, worker)
+        if status == "error":
+            raise ScriptCallError(f"{script_path}:{function} failed in worker:\n{value}")
+        return value
+
+    def reap_idle(self) -> None:
+        """Stop workers idle for longer than idle_timeout_s."""
+
+        if not self.idle_timeout_s:
+            return
+        now = time.monotonic()
+        for key, idle in list(self._idle.items()):
+            keep: list[_Worker] = []
+            while True:
+                try:
+                    worker = idle.get_nowait()
+                except queue.Empty:
+                    break
+                if now - worker.last_used > self.idle_timeout_s:
+                    worker.stop()
+                    self._discard(key)
+                else:
+                    keep.append(worker)
+            for worker in reversed(keep):
+                idle.put(worker)
+
+    def close(self) -> None:
+        for key, idle in list(self._idle.items()):
+            while True:
+                try:
+                    worker = idle.get_nowait()
+                except queue.Empty:
+                    break
+                worker.stop()
+                self._discard(key)
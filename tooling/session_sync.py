@@ -0,0 +1,109 @@
+"""Session sync settings checks (dependency-free).
+
+Mirrors the `session_sync_*` rules of `model_launcher.LauncherParams` for the stdlib
+validator, and adds cross-pack consistency checks: packs in the same group (a project
+under `packs/projects/<project>/`, or a `packs/shared/<group>/` directory) must agree on
+sync ports and master host, and no master may expect more slaves than the group provides.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+
+@dataclass(frozen=True)
+class SyncSettings:
+    path: Path
+    group: str
+    role: str
+    port: int | None
+    expected_slaves: int | None
+    master_host: str | None
+
+
+def check_pack_sync(payload: dict[str, Any]) -> list[str]:
+    """Per-pack rules; returns a list of problems (empty if OK or sync is not used)."""
+
+    role = payload.get("session_sync_role")
+    if role is None:
+        return []
+    problems: list[str] = []
+    if role not in {"master", "slave"}:
+        problems.append(f"session_sync_role must be 'master' or 'slave', got {role!r}")
+    port = payload.get("session_sync_port")
+    if port is None:
+        problems.append("session_sync_port is required when session_sync_role is set")
+    elif not isinstance(port, int) or isinstance(port, bool) or not 1 <= port <= 65535:
+        problems.append(f"session_sync_port must be an integer in 1..65535, got {port!r}")
+    if role == "slave" and not payload.get("session_sync_master_host"):
+        problems.append("session_sync_master_host is required for session_sync_role 'slave'")
+    if role == "master":
+        expected = payload.get("session_sync_expected_slaves")
+        if not isinstance(expected, int) or isinstance(expected, bool) or expected < 0:
+            problems.append("session_sync_expected_slaves (integer >= 0) is required for session_sync_role 'master'")
+    return problems
+
+
+def sync_group(path: Path, packs_root: Path) -> str:
+    """Group key for cross-pack checks: `projects/<project>` or `shared/<group>`."""
+
+    try:
+        parts = path.relative_to(packs_root).parts
+    except ValueError:
+        return str(path.parent)
+    return "/".join(parts[:2]) if len(parts) > 2 else "/".join(parts[:-1])
+
+
+def collect_sync_settings(packs: Iterable[tuple[Path, dict[str, Any]]], packs_root: Path) -> list[SyncSettings]:
+    settings: list[SyncSettings] = []
+    for path, payload in packs:
+        role = payload.get("session_sync_role")
+        if role not in {"master", "slave"}:
+            continue
+        settings.append(
+            SyncSettings(
+                path=path,
+                group=sync_group(path, packs_root),
+                role=role,
+                port=payload.get("session_sync_port"),
+                expected_slaves=payload.get("session_sync_expected_slaves"),
+                master_host=payload.get("session_sync_master_host"),
+            )
+        )
+    return settings
+
+
+def check_sync_consistency(packs: Iterable[tuple[Path, dict[str, Any]]], packs_root: Path) -> list[str]:
+    """Cross-pack checks; returns a list of problems (one line each)."""
+
+    by_group: dict[str, list[SyncSettings]] = {}
+    for setting in collect_sync_settings(packs, packs_root):
+        by_group.setdefault(setting.group, []).append(setting)
+
+    problems: list[str] = []
+    for group, settings in sorted(by_group.items()):
+        masters = [s for s in settings if s.role == "master"]
+        slaves = [s for s in settings if s.role == "slave"]
+        master_ports = {s.port for s in masters}
+
+        if len(master_ports) > 1:
+            problems.append(f"{group}: masters disagree on session_sync_port: {sorted(map(str, master_ports))}")
+        for slave in slaves:
+            if masters and slave.port not in master_ports:
+                problems.append(
+                    f"{group}: {slave.path.name} connects to port {slave.port}, but masters listen on {sorted(map(str, master_ports))}"
+                )
+        hosts = {s.master_host for s in slaves}
+        if len(hosts) > 1:
+            problems.append(f"{group}: slaves disagree on session_sync_master_host: {sorted(map(str, hosts))}")
+        for master in masters:
+            if isinstance(master.expected_slaves, int) and master.expected_slaves > len(slaves):
+                problems.append(
+                    f"{group}: {master.path.name} expects {master.expected_slaves} slave(s), "
+                    f"but the group only has {len(slaves)} slave pack(s)"
+                )
+        if slaves and not masters:
+            problems.append(f"{group}: {len(slaves)} slave pack(s) but no master pack")
+    return problems
@@ -0,0 +1,422 @@
+"""Dry-run simulator for pre/post acquisition pipelines: estimated launch and teardown time.
+
+Every pipeline entry of a pack is replaced by a cost model instead of being run. A cost
+model is a function `(step, profile) -> StepCost` registered for a `module_path`:
+
+    @cost_model("session_archiver")
+    def archiver_cost(step: Step, profile: CostProfile) -> StepCost: ...
+
+Entries without a registered model cost `profile.default_step_s`. `--plugin file.py`
+imports extra models (or replaces the built-in ones) before the run. The built-in models
+use the `CostProfile` numbers (network round-trip time and bandwidth, local disk and hash
+rates, HTTP request latency, script start-up), which `--profile profile.json` or
+`--set key=value` override.
+
+The session's data volume comes from the pack's data-rate profile: the
+`disk_space_check` rates and session duration (`disk_space_estimator.py`, without the
+safety factor), else the `behavior_video_cameras` bandwidth (`video_budget.py`) over
+the session duration, else `profile.default_session_gb`. A pack that declares rates or
+cameras but no duration uses `profile.default_session_duration_s`; packs that fall back
+to `default_session_gb` are listed after the report.
+
+Each step counts toward one of three totals:
+
+- critical: the launcher waits for it (pipelines run their entries in order);
+- operator: it waits for a person (`wait_for_user_input`, the experiment notes editor,
+  `*_prompt` entries), which is excluded from the critical path unless
+  `--operator-wait count`;
+- background: it runs after the launcher returns (`archive_mode: "queued"` hands the
+  copy to the archive worker), so it is reported but never on the critical path.
+
+This module is dependency-free (stdlib only).
+
+Run from repo root:
+    python ./tooling/simulate_pipeline.py
+    python ./tooling/simulate_pipeline.py --param ./packs/projects/predictive_processing/behavior/day1.json --steps
+    python ./tooling/simulate_pipeline.py --set network_mb_per_s=40 --operator-wait count --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import math
+import sys
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable
+
+from disk_space_estimator import BYTES_PER_GIB, BYTES_PER_MB, estimate_pack, session_duration_s
+from pack_catalog import PIPELINES, Pack, PipelineEntry, load_catalog, load_pack
+from repo_paths import REPO_ROOT
+from video_budget import analyze_video_budget
+
+
+CRITICAL = "critical"
+OPERATOR = "operator"
+BACKGROUND = "background"
+DEFAULT_VOLUME = "profile default"
+PIPELINE_LABELS = {"pre_acquisition_pipeline": "pre", "post_acquisition_pipeline": "post"}
+
+
+@dataclass(frozen=True)
+class CostProfile:
+    """Site numbers the built-in cost models use; override per run with --profile/--set."""
+
+    network_rtt_s: float = 0.002
+    network_mb_per_s: float = 100.0
+    disk_mb_per_s: float = 400.0
+    hash_mb_per_s: float = 600.0
+    http_request_s: float = 0.5
+    round_trips_per_file: int = 4
+    files_per_gb: float = 2.0
+    small_files: int = 200
+    small_file_kb: float = 16.0
+    local_step_s: float = 0.05
+    script_start_s: float = 3.0
+    script_pooled_s: float = 0.2
+    annotator_s: float = 5.0
+    operator_wait_s: float = 60.0
+    default_step_s: float = 2.0
+    default_session_gb: float = 10.0
+    default_session_duration_s: float = 3600.0
+
+    @classmethod
+    def load(cls, path: Path | None, overrides: list[str] | None = None) -> "CostProfile":
+        values: dict[str, Any] = {}
+        if path is not None:
+            loaded = json.loads(path.read_text(encoding="utf-8"))
+            if not isinstance(loaded, dict):
+                raise ValueError(f"{path}: cost profile must be a JSON object")
+            values.update(loaded)
+        for item in overrides or []:
+            key, sep, value = item.partition("=")
+            if not sep:
+                raise ValueError(f"--set {item!r}: expected key=value")
+            values[key.strip()] = value.strip()
+        types = {f.name: type(f.default) for f in fields(cls)}
+        unknown = sorted(set(values) - set(types))
+        if unknown:
+            raise ValueError(f"unknown cost profile key(s): {', '.join(unknown)}")
+        parsed: dict[str, Any] = {}
+        for key, value in values.items():
+            try:
+                number = types[key](value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{key}: expected {types[key].__name__}, got {value!r}") from None
+            if not math.isfinite(number) or number <= 0:
+                raise ValueError(f"{key}: must be a positive number, got {value!r}")
+            parsed[key] = number
+        return cls(**parsed)
+
+
+@dataclass(frozen=True)
+class SessionVolume:
+    bytes: float
+    source: str
+
+
+@dataclass(frozen=True)
+class Step:
+    """One pipeline entry as a cost model sees it."""
+
+    pack: str
+    payload: dict[str, Any]
+    pipeline: str
+    index: int
+    entry: PipelineEntry
+    params: dict[str, Any]
+    volume: SessionVolume
+
+
+@dataclass(frozen=True)
+class StepCost:
+    seconds: float
+    kind: str = CRITICAL
+    note: str = ""
+
+
+@dataclass
+class StepResult:
+    pipeline: str
+    index: int
+    module_path: str
+    seconds: float
+    kind: str
+    note: str
+
+
+@dataclass
+class PackSimulation:
+    pack: str
+    volume_gb: float
+    volume_source: str
+    steps: list[StepResult] = field(default_factory=list)
+    totals: dict[str, float] = field(default_factory=dict)
+
+    def critical_path_s(self, pipeline: str | None = None, *, count_operator: bool = False) -> float:
+        kinds = (CRITICAL, OPERATOR) if count_operator else (CRITICAL,)
+        return sum(s.seconds for s in self.steps if s.kind in kinds and (pipeline is None or s.pipeline == pipeline))
+
+
+CostModel = Callable[[Step, CostProfile], StepCost]
+
+COST_MODELS: dict[str, CostModel] = {}
+
+
+def cost_model(*module_paths: str) -> Callable[[CostModel], CostModel]:
+    """Register a cost model for one or more module_paths (later registrations win)."""
+
+    def register(func: CostModel) -> CostModel:
+        for module_path in module_paths:
+            COST_MODELS[module_path] = func
+        return func
+
+    return register
+
+
+def load_plugin(path: Path) -> None:
+    """Import a Python file that registers cost models with `cost_model(...)`."""
+
+    spec = importlib.util.spec_from_file_location(f"simulate_pipeline_plugin_{path.stem}", path)
+    if spec is None or spec.loader is None:
+        raise ValueError(f"{path}: cannot import cost model plugin")
+    spec.loader.exec_module(importlib.util.module_from_spec(spec))
+
+
+# -- built-in cost models --------------------------------------------------------
+
+
+def _transfer_s(num_bytes: float, files: float, mb_per_s: float, profile: CostProfile) -> float:
+    """Copy time over the network: bandwidth plus per-file round trips."""
+
+    return num_bytes / BYTES_PER_MB / mb_per_s + files * profile.round_trips_per_file * profile.network_rtt_s
+
+
+@cost_model("disk_space_check")
+def _local_cost(step: Step, profile: CostProfile) -> StepCost:
+    return StepCost(profile.local_step_s)
+
+
+@cost_model(
+    "metadata_subject_fetch",
+    "metadata_procedures_fetch",
+    "metadata_project_validator",
+    "metadata_protocol_validator",
+)
+def _metadata_cost(step: Step, profile: CostProfile) -> StepCost:
+    return StepCost(profile.http_request_s, note="1 metadata request")
+
+
+@cost_model("instrument_json_fetch")
+def _instrument_json_cost(step: Step, profile: CostProfile) -> StepCost:
+    # A recursive search lists the source tree; assume a few dozen directories.
+    listings = 25 if step.params.get("instrument_json_recursive") else 1
+    return StepCost((listings + 2) * profile.round_trips_per_file * profile.network_rtt_s, note=f"{listings} listing(s)")
+
+
+@cost_model("wait_for_user_input")
+def _operator_cost(step: Step, profile: CostProfile) -> StepCost:
+    return StepCost(profile.operator_wait_s, OPERATOR, "waits for the operator")
+
+
+@cost_model("experiment_notes_editor")
+def _notes_editor_cost(step: Step, profile: CostProfile) -> StepCost:
+    if step.params.get("experiment_notes_launch_editor"):
+        return StepCost(profile.operator_wait_s, OPERATOR, "operator edits notes")
+    return StepCost(profile.local_step_s)
+
+
+@cost_model("experiment_notes_finalize")
+def _notes_finalize_cost(step: Step, profile: CostProfile) -> StepCost:
+    return StepCost(profile.local_step_s + _transfer_s(0, 1, profile.network_mb_per_s, profile))
+
+
+@cost_model("slap2_meta_annotator", "slap2_behavior_annotator", "slap2_behaviorvideo_annotator", "slap2_stimuli_p3_annotator")
+def _annotator_cost(step: Step, profile: CostProfile) -> StepCost:
+    return StepCost(profile.annotator_s)
+
+
+@cost_model("behavior_videos_flatten")
+def _flatten_cost(step: Step, profile: CostProfile) -> StepCost:
+    files = step.volume.bytes / BYTES_PER_GIB * profile.files_per_gb
+    return StepCost(profile.local_step_s + files * profile.local_step_s, note=f"{files:,.0f} rename(s)")
+
+
+@cost_model("session_archiver")
+def _archiver_cost(step: Step, profile: CostProfile) -> StepCost:
+    params = step.params
+    if params.get("dry_run"):
+        return StepCost(profile.local_step_s, note="dry run")
+
+    num_bytes = step.volume.bytes
+    data_files = num_bytes / BYTES_PER_GIB * profile.files_per_gb
+    small_bytes = profile.small_files * profile.small_file_kb * 1024
+    remote_files = data_files + profile.small_files
+    if params.get("bundle_small_files"):
+        remote_files = data_files + math.ceil(small_bytes / (int(params.get("bundle_target_mb", 512)) * 1024 * 1024))
+    rate = profile.network_mb_per_s
+    if params.get("archive_max_mb_per_s"):
+        rate = min(rate, float(params["archive_max_mb_per_s"]))
+
+    seconds = _transfer_s(num_bytes + small_bytes, remote_files, rate, profile)
+    notes = [f"{(num_bytes + small_bytes) / BYTES_PER_GIB:,.1f} GiB in {remote_files:,.0f} remote file(s)"]
+    if params.get("checksum_algo"):
+        seconds += num_bytes / BYTES_PER_MB / profile.hash_mb_per_s
+        notes.append(str(params["checksum_algo"]))
+    if params.get("backup_dir"):
+        if params.get("backup_dedup"):
+            seconds += num_bytes / BYTES_PER_MB / profile.hash_mb_per_s
+            notes.append("dedup backup")
+        else:
+            seconds += num_bytes / BYTES_PER_MB / profile.disk_mb_per_s
+            notes.append("backup copy")
+    if params.get("archive_mode") == "queued":
+        return StepCost(seconds, BACKGROUND, "; ".join(["queued", *notes]))
+    return StepCost(seconds, note="; ".join(notes))
+
+
+def _script_cost(step: Step, profile: CostProfile) -> StepCost:
+    pooled = step.params.get("execution") == "pooled"
+    return StepCost(profile.script_pooled_s if pooled else profile.script_start_s, note="pooled" if pooled else "subprocess")
+
+
+def _default_cost(step: Step, profile: CostProfile) -> StepCost:
+    if step.entry.module_path and step.entry.module_path.endswith("_prompt"):
+        return StepCost(profile.operator_wait_s, OPERATOR, "waits for the operator")
+    return StepCost(profile.default_step_s, note="no cost model; default")
+
+
+def _select_model(entry: PipelineEntry) -> CostModel:
+    if entry.module_type == "script_module":
+        return COST_MODELS.get(entry.module_path or "", _script_cost)
+    return COST_MODELS.get(entry.module_path or "", _default_cost)
+
+
+# -- simulation ------------------------------------------------------------------
+
+
+def session_volume(payload: dict[str, Any], profile: CostProfile) -> SessionVolume:
+    """Bytes a session is expected to write, from the pack's data-rate profile."""
+
+    for estimate in estimate_pack(payload):
+        if estimate.rate_based:
+            duration, note = estimate.duration_s, ""
+            if duration is None:
+                duration, note = profile.default_session_duration_s, ", profile duration"
+            rate = sum(estimate.rates_mb_per_s.values())
+            return SessionVolume(rate * BYTES_PER_MB * duration, f"disk_space_check rates{note}")
+    video = analyze_video_budget(payload)
+    if video.aggregate_mb_per_s:
+        duration, note = session_duration_s(payload, {}), ""
+        if duration is None:
+            duration, note = profile.default_session_duration_s, ", profile duration"
+        return SessionVolume(video.aggregate_mb_per_s * BYTES_PER_MB * duration, f"behavior_video_cameras{note}")
+    return SessionVolume(profile.default_session_gb * BYTES_PER_GIB, DEFAULT_VOLUME)
+
+
+def simulate_pack(rel: str, pack: Pack, profile: CostProfile) -> PackSimulation:
+    payload = pack.payload()
+    volume = session_volume(payload, profile)
+    sim = PackSimulation(rel, round(volume.bytes / BYTES_PER_GIB, 2), volume.source)
+    for pipeline in PIPELINES:
+        for index, entry in enumerate(getattr(pack, pipeline) or ()):
+            params = entry.module_parameters
+            step = Step(rel, payload, pipeline, index, entry, params if isinstance(params, dict) else {}, volume)
+            cost = _select_model(entry)(step, profile)
+            sim.steps.append(StepResult(pipeline, index, entry.module_path or "?", round(cost.seconds, 3), cost.kind, cost.note))
+    for kind in (CRITICAL, OPERATOR, BACKGROUND):
+        sim.totals[kind] = round(sum(s.seconds for s in sim.steps if s.kind == kind), 3)
+    return sim
+
+
+def _fmt_s(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    total = int(round(seconds))
+    return f"{total // 3600:d}:{(total % 3600) // 60:02d}:{total % 60:02d}"
+
+
+def _cmd_report(args: argparse.Namespace, sims: list[PackSimulation], profile: CostProfile) -> None:
+    count_operator = args.operator_wait == "count"
+    width = max([len(sim.pack) for sim in sims] + [4])
+    print(f"{'pack':<{width}}  {'launch':>8} {'teardown':>9} {'critical':>9} {'operator':>9} {'bg':>8}  {'GiB':>7}  slowest step")
+    for sim in sims:
+        pre = sim.critical_path_s(PIPELINES[0], count_operator=count_operator)
+        post = sim.critical_path_s(PIPELINES[1], count_operator=count_operator)
+        on_path = [s for s in sim.steps if s.kind == CRITICAL or (count_operator and s.kind == OPERATOR)]
+        slowest = max(on_path, key=lambda s: s.seconds, default=None)
+        print(
+            f"{sim.pack:<{width}}  {_fmt_s(pre):>8} {_fmt_s(post):>9} {_fmt_s(pre + post):>9} "
+            f"{_fmt_s(sim.totals[OPERATOR]):>9} {_fmt_s(sim.totals[BACKGROUND]):>8}  {sim.volume_gb:>7,.1f}  "
+            + (f"{slowest.module_path} ({_fmt_s(slowest.seconds)})" if slowest else "-")
+        )
+        if args.steps:
+            for s in sim.steps:
+                marker = "" if s.kind == CRITICAL else f" [{s.kind}]"
+                print(f"    {PIPELINE_LABELS[s.pipeline]}[{s.index}] {s.module_path:<40} {_fmt_s(s.seconds):>9}{marker}  {s.note}".rstrip())
+    defaulted = [sim.pack for sim in sims if sim.volume_source == DEFAULT_VOLUME]
+    if defaulted:
+        print(f"{len(defaulted)} pack(s) without a data-rate profile use default_session_gb ({profile.default_session_gb:g} GiB):")
+        for pack in defaulted:
+            print(f"    {pack}")
+    print(
+        f"Simulated {len(sims)} pack(s); operator waits "
+        + ("counted on" if count_operator else "excluded from")
+        + " the critical path."
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Estimate pre/post acquisition pipeline time per pack without running it")
+    parser.add_argument("--param", type=str, default=None, help="Simulate a single param file")
+    parser.add_argument(
+        "--root",
+        type=str,
+        default=str(REPO_ROOT / "packs"),
+        help="Root directory containing packs (default: ./packs)",
+    )
+    parser.add_argument("--profile", type=str, default=None, help="JSON file overriding CostProfile values")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="Override one CostProfile value")
+    parser.add_argument("--plugin", action="append", default=[], help="Python file registering extra cost models")
+    parser.add_argument(
+        "--operator-wait",
+        choices=["exclude", "count"],
+        default="exclude",
+        help="Whether operator waits count toward the critical path",
+    )
+    parser.add_argument("--steps", action="store_true", help="Print every simulated step")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        profile = CostProfile.load(Path(args.profile) if args.profile else None, args.set)
+    except (OSError, ValueError) as exc:
+        print(f"FAIL cost profile: {exc}")
+        return 2
+    # Plugins import this module by name; make that the running module, not a second copy.
+    sys.modules.setdefault("simulate_pipeline", sys.modules[__name__])
+    for plugin in args.plugin:
+        load_plugin(Path(plugin))
+
+    if args.param:
+        path = Path(args.param).resolve()
+        rel = path.relative_to(REPO_ROOT).as_posix() if path.is_relative_to(REPO_ROOT) else path.as_posix()
+        packs, problems = {rel: load_pack(path)}, []
+    else:
+        catalog = load_catalog(Path(args.root).resolve())
+        packs, problems = dict(catalog), catalog.problems
+    sims = [simulate_pack(rel, pack, profile) for rel, pack in packs.items() if any(getattr(pack, p) for p in PIPELINES)]
+
+    if args.json:
+        print(json.dumps({"profile": asdict(profile), "packs": [asdict(sim) for sim in sims], "problems": problems}, indent=2))
+    else:
+        _cmd_report(args, sims, profile)
+        for problem in problems:
+            print(f"SKIP {problem}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,6 +8,8 @@ Behavior:
 - Ensures a `disk_space_check` launcher_module exists in `pre_acquisition_pipeline`.
 - If `wait_for_user_input` is present, inserts `disk_space_check` immediately before it.
 - If `disk_space_check` exists, updates its parameters.
+- Entries in rate-based mode (`data_rates_mb_per_s` declared) are sized per pack and left untouched;
+  see `report_disk_space.py`.
 - Removes legacy/unsupported `required_free_bytes` if present.
 
 Run from repo root:
@@ -21,6 +23,8 @@ import json
 from pathlib import Path
 from typing import Any
 
+from pack_entries import LAUNCHER_MODULE, entry_matches
+
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 PACKS_ROOT = REPO_ROOT / "packs"
@@ -51,19 +55,11 @@ def _classify_required_gb(path: Path) -> int | None:
 
 
 def _is_disk_space_check_entry(entry: Any) -> bool:
-    return (
-        isinstance(entry, dict)
-        and entry.get("module_type", "launcher_module") == "launcher_module"
-        and entry.get("module_path") == "disk_space_check"
-    )
+    return entry_matches(entry, module_path="disk_space_check", module_type=LAUNCHER_MODULE)
 
 
 def _is_wait_for_user_input_entry(entry: Any) -> bool:
-    return (
-        isinstance(entry, dict)
-        and entry.get("module_type", "launcher_module") == "launcher_module"
-        and entry.get("module_path") == "wait_for_user_input"
-    )
+    return entry_matches(entry, module_path="wait_for_user_input", module_type=LAUNCHER_MODULE)
 
 
 def _ensure_disk_space_check(pipeline: list[Any], required_free_gb: int) -> None:
@@ -74,6 +70,9 @@ def _ensure_disk_space_check(pipeline: list[Any], required_free_gb: int) -> None
             if not isinstance(params, dict):
                 params = {}
             params.pop("required_free_bytes", None)
+            if params.get("data_rates_mb_per_s"):
+                entry["module_parameters"] = params
+                return
             params["required_free_gb"] = required_free_gb
             entry["module_parameters"] = params
             return
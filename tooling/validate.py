@@ -1,12 +1,30 @@
 import argparse
+import importlib
 import json
 import sys
+from collections.abc import Mapping
 from pathlib import Path
 from urllib.parse import urlparse
 from urllib.request import urlopen
 
+from module_registry import load_registry, unregistered_modules
+from pack_entries import LAUNCHER_MODULE, iter_pipeline_entries
+from repo_paths import REPO_ROOT, iter_json_files
 
-REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Cross-field checks as (module, function), imported on first use so that startup
+# stays flat and a check never drags in the worker code that lives next to it.
+CROSS_FIELD_CHECKS = (
+    ("session_sync", "check_pack_sync"),
+    ("script_artifact_cache", "check_cache_contract"),
+    ("matlab_engine", "check_matlab_settings"),
+    ("bonsai_bootstrap", "check_bonsai_settings"),
+    ("video_budget", "check_video_budget"),
+    ("archive_patterns", "check_archive_patterns"),
+    ("archive_queue", "check_archive_queue"),
+    ("backup_store", "check_backup_store"),
+    ("disk_space_estimator", "check_disk_space_check"),
+)
 
 
 def _is_url(value: str) -> bool:
@@ -21,18 +39,15 @@ def _load_json(path: Path) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def _load_module_schemas(tooling_dir: Path) -> dict[str, dict]:
-    schemas: dict[str, dict] = {}
-    for path in sorted(tooling_dir.glob("model_*.schema.json")):
-        if path.name == "model_launcher.schema.json":
-            continue
-        data = _load_json(path)
-        name = path.stem.removeprefix("model_")
-        schemas[name] = data
-    return schemas
+def _load_module_schemas(tooling_dir: Path):
+    """module_path -> schema, from the module registry; schema files are read on first use."""
 
+    return load_registry(tooling_dir).schemas()
+
+
+def _local_schema_path(param_path: Path, schema_ref: str) -> Path | None:
+    """Local file a schema ref resolves to; None for a remote URL without a local copy."""
 
-def _resolve_schema(param_path: Path, schema_ref: str) -> dict:
     # Local relative path (common for repo-contained validation)
     if not _is_url(schema_ref) and not schema_ref.startswith("file://"):
         ref = schema_ref.strip()
@@ -51,22 +66,17 @@ def _resolve_schema(param_path: Path, schema_ref: str) -> dict:
 
         for schema_path in candidates:
             if schema_path.exists():
-                return _load_json(schema_path)
+                return schema_path
 
         raise FileNotFoundError(f"Schema file not found: {candidates[0]}")
 
-    # Remote HTTP(S) URL
     if _is_url(schema_ref):
         parsed = urlparse(schema_ref)
         if parsed.netloc == "raw.githubusercontent.com" and parsed.path.endswith("/tooling/model_launcher.schema.json"):
             local = REPO_ROOT / "tooling" / "model_launcher.schema.json"
             if local.exists():
-                return _load_json(local)
-        with urlopen(schema_ref) as resp:
-            if resp.status != 200:
-                raise RuntimeError(f"Unable to fetch schema URL {schema_ref!r}: HTTP {resp.status}")
-            data = resp.read().decode("utf-8")
-            return json.loads(data)
+                return local
+        return None
 
     # file:// refs not yet supported
     raise RuntimeError(
@@ -75,6 +85,19 @@ def _resolve_schema(param_path: Path, schema_ref: str) -> dict:
     )
 
 
+def _resolve_schema(param_path: Path, schema_ref: str) -> dict:
+    local = _local_schema_path(param_path, schema_ref)
+    if local is not None:
+        return _load_json(local)
+
+    # Remote HTTP(S) URL
+    with urlopen(schema_ref) as resp:
+        if resp.status != 200:
+            raise RuntimeError(f"Unable to fetch schema URL {schema_ref!r}: HTTP {resp.status}")
+        data = resp.read().decode("utf-8")
+        return json.loads(data)
+
+
 def _validate_object_against_schema(payload: dict, schema: dict) -> None:
     required = schema.get("required", [])
     for key in required:
@@ -114,70 +137,200 @@ def _validate_object_against_schema(payload: dict, schema: dict) -> None:
             raise RuntimeError(f"Key {key!r} expected type {expected!r}, got {type(value).__name__}")
 
 
-def validate_param(param_path: Path, module_schemas: dict[str, dict]) -> int:
-    payload = _load_json(param_path)
+def cross_field_problems(payload: dict) -> list[str]:
+    """Cross-field rules the plain schema check cannot express (shared by both engines)."""
+
+    problems: list[str] = []
+    for module_name, func_name in CROSS_FIELD_CHECKS:
+        problems += getattr(importlib.import_module(module_name), func_name)(payload)
+    return problems
+
+
+def validate_param(param_path: Path, module_schemas: Mapping[str, dict]) -> int:
+    return validate_payload(_load_json(param_path), param_path, module_schemas)
+
+
+def validate_payload(
+    payload: dict,
+    param_path: Path,
+    module_schemas: Mapping[str, dict],
+    *,
+    resolve_schema=_resolve_schema,
+) -> int:
+    """Validate an already-loaded pack; `param_path` anchors relative schema refs.
+
+    `resolve_schema(param_path, ref)` can be swapped for a caching resolver (see
+    validation_service.py).
+    """
+
     schema_ref = payload.get("$schema")
     if not schema_ref:
         raise RuntimeError(f"Missing $schema in {param_path}")
-    schema = _resolve_schema(param_path, str(schema_ref))
+    schema = resolve_schema(param_path, str(schema_ref))
 
     # Minimal, dependency-free validation: ensure required keys exist and basic types match.
     # This is intentionally lightweight so it runs on rigs without extra packages.
     _validate_object_against_schema(payload, schema)
 
+    problems = cross_field_problems(payload)
+    if problems:
+        raise RuntimeError("; ".join(problems))
+
     # Validate pipeline module entries against their module schemas when possible.
-    def _validate_pipeline(pipeline):
-        if not isinstance(pipeline, list):
-            return
-        for entry in pipeline:
-            if not isinstance(entry, dict):
-                continue
-            module_path = entry.get("module_path")
-            module_type = entry.get("module_type")
-            if module_type and module_type != "launcher_module":
+    for _, _, entry in iter_pipeline_entries(payload, module_type=LAUNCHER_MODULE):
+        module_path = entry.get("module_path")
+        params = entry.get("module_parameters")
+        if not isinstance(params, dict):
+            continue
+
+        # Optional override per entry
+        schema_ref = entry.get("module_schema")
+        if schema_ref:
+            module_schema = resolve_schema(param_path, str(schema_ref))
+        else:
+            if not module_path:
                 continue
-            params = entry.get("module_parameters")
-            if not isinstance(params, dict):
+            module_schema = module_schemas.get(module_path)
+            if not module_schema:
                 continue
 
-            # Optional override per entry
-            schema_ref = entry.get("module_schema")
-            if schema_ref:
-                module_schema = _resolve_schema(param_path, str(schema_ref))
-            else:
-                if not module_path:
-                    continue
-                module_schema = module_schemas.get(module_path)
-                if not module_schema:
-                    continue
+        _validate_object_against_schema(params, module_schema)
+    return 0
 
-            _validate_object_against_schema(params, module_schema)
 
-    _validate_pipeline(payload.get("pre_acquisition_pipeline"))
-    _validate_pipeline(payload.get("post_acquisition_pipeline"))
-    return 0
+def validate_manifest(manifest_path: Path, tooling_dir: Path) -> int:
+    """Validate a routing manifest (JSON document or JSON Lines) against the manifest schemas.
 
+    Several records may share a source_path; the later one replaces the earlier one, as in
+    `routing_manifest.RoutingManifestIndex`. Returns the number of records checked.
+    """
 
-def iter_json_files(root: Path):
-    for path in root.rglob("*.json"):
-        # Skip schema files themselves when validating packs
-        if "schemas" in path.parts:
-            continue
-        yield path
+    from routing_manifest import iter_manifest_records, manifest_format_for
+
+    record_schema = _load_json(tooling_dir / "model_routing_manifest_record.schema.json")
+    if manifest_format_for(manifest_path) == "json":
+        document = _load_json(manifest_path)
+        if isinstance(document, dict):
+            _validate_object_against_schema(document, _load_json(tooling_dir / "model_routing_manifest.schema.json"))
+
+    count = 0
+    for count, record in enumerate(iter_manifest_records(manifest_path), start=1):
+        try:
+            _validate_object_against_schema(record, record_schema)
+        except RuntimeError as exc:
+            raise RuntimeError(f"record {count}: {exc}") from None
+    return count
+
+
+def validate_telemetry(telemetry_path: Path, tooling_dir: Path) -> int:
+    """Validate a module telemetry file (JSON Lines) against the telemetry record schema.
+
+    Returns the number of records checked.
+    """
+
+    from module_telemetry import iter_records, parse_time
+
+    record_schema = _load_json(tooling_dir / "model_module_telemetry.schema.json")
+    count = 0
+    for count, record in enumerate(iter_records(telemetry_path), start=1):
+        try:
+            _validate_object_against_schema(record, record_schema)
+            started = parse_time(record["started_at"])
+            ended = parse_time(record["ended_at"])
+        except (RuntimeError, ValueError) as exc:
+            raise RuntimeError(f"record {count}: {exc}") from None
+        if ended < started:
+            raise RuntimeError(f"record {count}: ended_at is before started_at")
+    return count
+
+
+def _validate_with_pydantic(paths: list[Path], tooling_dir: Path, batch_size: int) -> int:
+    from validate_pydantic import PydanticEngine, iter_batches
+
+    engine = PydanticEngine(tooling_dir)
+    failures = 0
+    loaded: list[tuple[Path, dict]] = []
+    for path in paths:
+        try:
+            loaded.append((path, _load_json(path)))
+        except Exception as exc:
+            failures += 1
+            print(f"FAIL {path}: {exc}")
+    for batch in iter_batches(loaded, batch_size):
+        results = engine.validate_batch([payload for _, payload in batch])
+        for (path, payload), problems in zip(batch, results):
+            if isinstance(payload, dict):
+                try:
+                    problems = problems + cross_field_problems(payload)
+                except Exception as exc:
+                    # A malformed pack must fail on its own, as with the stdlib engine.
+                    problems = problems + [f"{type(exc).__name__}: {exc}"]
+            if problems:
+                failures += 1
+                print(f"FAIL {path}: {'; '.join(dict.fromkeys(problems))}")
+            else:
+                print(f"OK  {path}")
+    return failures
 
 
 def main(argv=None) -> int:
     parser = argparse.ArgumentParser(description="Validate OpenScope param packs against their $schema")
     parser.add_argument("--param", type=str, default=None, help="Validate a single param file")
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help="Validate a routing manifest (routing_manifest.json or .jsonl) instead of packs",
+    )
+    parser.add_argument(
+        "--telemetry",
+        type=str,
+        default=None,
+        help="Validate a module telemetry file (launcher_metadata/module_telemetry.jsonl) instead of packs",
+    )
     parser.add_argument(
         "--root",
         type=str,
         default=str(REPO_ROOT / "packs"),
         help="Root directory containing packs (default: ./packs)",
     )
+    parser.add_argument(
+        "--engine",
+        choices=["stdlib", "pydantic"],
+        default="stdlib",
+        help="stdlib: dependency-free schema checks (rigs); pydantic: validate with the Pydantic models (CI)",
+    )
+    parser.add_argument("--batch-size", type=int, default=64, help="Packs per batch with --engine pydantic")
+    parser.add_argument(
+        "--rigs",
+        type=str,
+        default=str(REPO_ROOT / "rigs"),
+        help="Rig registry directory checked against the packs (default: ./rigs)",
+    )
     args = parser.parse_args(argv)
 
     tooling_dir = REPO_ROOT / "tooling"
+
+    if args.manifest:
+        manifest_path = Path(args.manifest).resolve()
+        try:
+            count = validate_manifest(manifest_path, tooling_dir)
+        except Exception as exc:
+            print(f"FAIL {manifest_path}: {exc}")
+            return 1
+        print(f"OK  {manifest_path} ({count} record(s))")
+        return 0
+
+    if args.telemetry:
+        telemetry_path = Path(args.telemetry).resolve()
+        try:
+            count = validate_telemetry(telemetry_path, tooling_dir)
+        except Exception as exc:
+            print(f"FAIL {telemetry_path}: {exc}")
+            return 1
+        print(f"OK  {telemetry_path} ({count} record(s))")
+        return 0
+
     module_schemas = _load_module_schemas(tooling_dir)
 
     if args.param:
@@ -189,13 +342,63 @@ def main(argv=None) -> int:
             return 0
 
     failures = 0
+    if args.engine == "pydantic":
+        failures += _validate_with_pydantic(paths, tooling_dir, args.batch_size)
+    else:
+        for path in paths:
+            try:
+                validate_param(path, module_schemas)
+                print(f"OK  {path}")
+            except Exception as exc:
+                failures += 1
+                print(f"FAIL {path}: {exc}")
+
+    registry = load_registry(tooling_dir)
     for path in paths:
         try:
-            validate_param(path, module_schemas)
-            print(f"OK  {path}")
-        except Exception as exc:
+            payload = _load_json(path)
+        except Exception:
+            continue
+        if isinstance(payload, dict):
+            for module_path in unregistered_modules(payload, registry):
+                print(f"WARN {path}: module {module_path!r} has no model in the module registry; parameters not validated")
+
+    if not args.param:
+        from rig_registry import RigRegistry, check_rig_coverage, unset_rig_params
+        from session_sync import check_sync_consistency
+        from video_budget import check_video_throughput, unconfirmed_video_values
+
+        # Cross-pack checks only make sense over a whole catalog.
+        packs_root = Path(args.root).resolve()
+        loaded = []
+        for path in paths:
+            try:
+                loaded.append((path, _load_json(path)))
+            except Exception:
+                continue
+        for problem in check_sync_consistency(loaded, packs_root):
             failures += 1
-            print(f"FAIL {path}: {exc}")
+            print(f"FAIL session sync: {problem}")
+
+        rigs_dir = Path(args.rigs).resolve()
+        for path in sorted(rigs_dir.glob("*.json")):
+            try:
+                validate_param(path, module_schemas)
+                print(f"OK  {path}")
+            except Exception as exc:
+                failures += 1
+                print(f"FAIL {path}: {exc}")
+        rig_registry = RigRegistry.load(rigs_dir)
+        for problem in check_rig_coverage(loaded, rig_registry):
+            failures += 1
+            print(f"FAIL rig params: {problem}")
+        for warning in unset_rig_params(loaded, rig_registry):
+            print(f"WARN rig params: {warning}")
+        for problem in check_video_throughput(loaded, rig_registry):
+            failures += 1
+            print(f"FAIL video budget: {problem}")
+        for warning in unconfirmed_video_values(loaded, rig_registry):
+            print(f"WARN video budget: {warning}")
 
     return 1 if failures else 0
 
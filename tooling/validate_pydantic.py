@@ -0,0 +1,113 @@
+"""Full-fidelity pack validation with the Pydantic models (`validate.py --engine pydantic`).
+
+The stdlib engine in validate.py only checks `required` keys and basic types of the
+exported JSON Schemas. This engine validates against the models themselves
+(`model_launcher.LauncherParams` and each module's `Parameters`), so constraints,
+enums, nested models and model validators all apply.
+
+Model files are looked up in the module registry and imported on first use; each
+TypeAdapter is built once per process.
+Packs are validated in batches through a `list[LauncherParams]` adapter; pipeline
+entries are then grouped by `module_path` (and `script_module` entries by type) and
+each group is validated through its module's `list[Parameters]` adapter, so the number
+of pydantic-core calls grows with the number of modules, not with the number of entries.
+
+Requires pydantic (see requirements-tooling.txt); rigs keep using the stdlib engine.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from typing import Any, Iterable
+
+from pydantic import TypeAdapter, ValidationError
+
+from module_registry import load_registry
+from pack_entries import SCRIPT_MODULE, iter_pipeline_entries
+
+
+def _load_module(py_path: Path):
+    spec = spec_from_file_location(py_path.stem, py_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to import {py_path}")
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _format_errors(exc: ValidationError) -> dict[int, list[str]]:
+    """Group a list adapter's errors by batch index (loc[0])."""
+
+    grouped: dict[int, list[str]] = defaultdict(list)
+    for error in exc.errors(include_url=False):
+        loc = error["loc"]
+        index = int(loc[0]) if loc and isinstance(loc[0], int) else -1
+        path = ".".join(str(part) for part in loc[1:])
+        # Model-validator messages read the same as the stdlib checks; drop pydantic's prefix.
+        message = error["msg"].removeprefix("Value error, ")
+        grouped[index].append(f"{path}: {message}" if path else message)
+    return grouped
+
+
+class PydanticEngine:
+    def __init__(self, tooling_dir: Path) -> None:
+        launcher = _load_module(tooling_dir / "model_launcher.py")
+        for model in (launcher.LauncherParams, launcher.ScriptModuleParameters):
+            model.model_rebuild(force=True, _types_namespace=launcher.__dict__)
+        self.packs_adapter = TypeAdapter(list[launcher.LauncherParams])
+        self.module_adapters: dict[str, TypeAdapter] = {
+            SCRIPT_MODULE: TypeAdapter(list[launcher.ScriptModuleParameters]),
+        }
+        self.registry = load_registry(tooling_dir)
+
+    def _adapter(self, key: str) -> TypeAdapter:
+        # Module models are imported on first use, so only modules the packs use are loaded.
+        if key not in self.module_adapters:
+            self.module_adapters[key] = TypeAdapter(list[self.registry.model(key)])
+        return self.module_adapters[key]
+
+    def _entry_groups(self, payloads: list[Any]) -> dict[str, list[tuple[int, str, Any]]]:
+        """module key -> [(batch index, entry location, module_parameters)]."""
+
+        groups: dict[str, list[tuple[int, str, Any]]] = defaultdict(list)
+        for index, payload in enumerate(payloads):
+            if not isinstance(payload, dict):
+                continue
+            for pipeline_name, idx, entry in iter_pipeline_entries(payload):
+                if not isinstance(entry.get("module_parameters"), dict):
+                    continue
+                module_type = entry.get("module_type")
+                if module_type == SCRIPT_MODULE:
+                    key = SCRIPT_MODULE
+                elif module_type in (None, "launcher_module") and self.registry.get(entry.get("module_path")):
+                    key = entry["module_path"]
+                else:
+                    continue
+                groups[key].append((index, f"{pipeline_name}[{idx}]", entry["module_parameters"]))
+        return groups
+
+    def validate_batch(self, payloads: list[Any]) -> list[list[str]]:
+        """Validate a batch of pack payloads; returns one problem list per payload."""
+
+        problems: list[list[str]] = [[] for _ in payloads]
+        try:
+            self.packs_adapter.validate_python(payloads)
+        except ValidationError as exc:
+            for index, messages in _format_errors(exc).items():
+                problems[index].extend(messages)
+
+        for key, members in self._entry_groups(payloads).items():
+            try:
+                self._adapter(key).validate_python([params for _, _, params in members])
+            except ValidationError as exc:
+                for member_index, messages in _format_errors(exc).items():
+                    index, where, _ = members[member_index]
+                    problems[index].extend(f"{where}.module_parameters ({key}) {m}" for m in messages)
+        return problems
+
+
+def iter_batches(items: list[Any], size: int) -> Iterable[list[Any]]:
+    for start in range(0, len(items), max(1, size)):
+        yield items[start : start + max(1, size)]
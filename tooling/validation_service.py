@@ -0,0 +1,333 @@
+"""Long-running local validation service for the launcher and editor integrations.
+
+Keeps the module schemas, resolved `$schema` documents, the rig registry and the parsed
+pack catalog in memory, and serves them over HTTP on localhost:
+
+    GET  /health
+    GET  /validate?path=packs/shared/core/session_sync_master.json
+    POST /validate            {"path": ...}  or  {"payload": {...}, "path": <anchor for relative refs>}
+    GET  /resolve?path=...&rig_id=slap2_behavior
+    GET  /query?launcher=bonsai&glob=packs/projects/*/behavior/*.json
+    GET  /metrics
+
+Paths are resolved against the repo root and must stay under it (or under the packs
+root); anything else, and request bodies or payloads that are not JSON objects, get a
+400. Validation runs the same checks as validate.py (`validate_payload`). Packs are re-read
+when their mtime/size changes (checked with one stat per access), and a watcher thread
+polls the schema and rig files every `--poll-s` seconds; a change there drops the
+schema cache and every cached validation result. `/metrics` reports request counts and
+p50/p95 latency per endpoint.
+
+This module is dependency-free (stdlib only).
+
+Run from repo root:
+    python ./tooling/validation_service.py --port 8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Mapping
+from fnmatch import fnmatchcase
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from module_registry import REGISTRY_FILE, load_registry
+from rig_registry import RigRegistry
+from validate import REPO_ROOT, _load_module_schemas, _resolve_schema, iter_json_files, validate_payload
+
+
+DEFAULT_PORT = 8765
+
+Stamp = tuple[int, int]
+
+
+def _stamp(path: Path) -> Stamp | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _rel(path: Path) -> str:
+    return path.relative_to(REPO_ROOT).as_posix() if path.is_relative_to(REPO_ROOT) else path.as_posix()
+
+
+class ValidationService:
+    def __init__(self, *, packs_root: Path, rigs_dir: Path, tooling_dir: Path = REPO_ROOT / "tooling") -> None:
+        self.packs_root = packs_root
+        self.rigs_dir = rigs_dir
+        self.tooling_dir = tooling_dir
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._watched: dict[Path, Stamp | None] = {}
+        self._schema_cache: dict[tuple[str, str], dict] = {}
+        self._packs: dict[Path, tuple[Stamp, dict[str, Any]]] = {}
+        self._results: dict[Path, tuple[Stamp, int, list[str]]] = {}
+        self._pack_paths: list[Path] = []
+        self._module_schemas: Mapping[str, dict] = {}
+        self._registry = RigRegistry()
+        self._latencies: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=2000))
+        self._counts: dict[str, int] = defaultdict(int)
+        self.refresh()
+
+    # -- cache maintenance -------------------------------------------------
+
+    def _watch_list(self) -> list[Path]:
+        return (
+            [self.tooling_dir / REGISTRY_FILE]
+            + sorted(self.tooling_dir.glob("model_*.schema.json"))
+            + sorted(self.rigs_dir.glob("*.json"))
+        )
+
+    def refresh(self) -> bool:
+        """Reload schemas/rigs if any watched file changed; rescan the pack list. Returns True on reload."""
+
+        watched = {path: _stamp(path) for path in self._watch_list()}
+        pack_paths = sorted(iter_json_files(self.packs_root))
+        with self._lock:
+            self._pack_paths = pack_paths
+            for stale in set(self._packs) - set(pack_paths):
+                self._packs.pop(stale, None)
+                self._results.pop(stale, None)
+            if watched == self._watched:
+                return False
+            self._watched = watched
+            load_registry.cache_clear()
+            self._module_schemas = _load_module_schemas(self.tooling_dir)
+            self._registry = RigRegistry.load(self.rigs_dir)
+            self._schema_cache.clear()
+            self._results.clear()
+            self._generation += 1
+            return True
+
+    def watch(self, poll_s: float, stop: threading.Event) -> None:
+        while not stop.wait(poll_s):
+            try:
+                self.refresh()
+            except Exception:
+                # A half-written file during an editor save; retry on the next poll.
+                continue
+
+    def _resolve_schema(self, param_path: Path, ref: str) -> dict:
+        key = (str(param_path.parent), ref)
+        with self._lock:
+            cached = self._schema_cache.get(key)
+        if cached is None:
+            cached = _resolve_schema(param_path, ref)
+            with self._lock:
+                self._schema_cache[key] = cached
+        return cached
+
+    def _pack(self, path: Path) -> tuple[Stamp, dict[str, Any]]:
+        stamp = _stamp(path)
+        if stamp is None:
+            raise FileNotFoundError(f"pack not found: {path}")
+        with self._lock:
+            cached = self._packs.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        with self._lock:
+            self._packs[path] = (stamp, payload)
+        return stamp, payload
+
+    # -- operations --------------------------------------------------------
+
+    def _problems(self, payload: dict[str, Any], anchor: Path) -> list[str]:
+        try:
+            validate_payload(payload, anchor, self._module_schemas, resolve_schema=self._resolve_schema)
+        except Exception as exc:
+            return [str(exc)]
+        return []
+
+    def validate(self, *, path: Path | None = None, payload: dict[str, Any] | None = None) -> dict[str, Any]:
+        if payload is not None:
+            if not isinstance(payload, dict):
+                raise ValueError("payload must be a JSON object")
+            anchor = path or (self.packs_root / "unsaved.json")
+            problems = self._problems(payload, anchor)
+            return {"ok": not problems, "problems": problems, "cached": False}
+        if path is None:
+            raise ValueError("give a path or a payload")
+        stamp, loaded = self._pack(path)
+        with self._lock:
+            generation = self._generation
+            cached = self._results.get(path)
+        if cached is not None and cached[:2] == (stamp, generation):
+            return {"ok": not cached[2], "problems": cached[2], "cached": True}
+        problems = self._problems(loaded, path)
+        with self._lock:
+            self._results[path] = (stamp, generation, problems)
+        return {"ok": not problems, "problems": problems, "cached": False}
+
+    def resolve(self, path: Path, rig_id: str | None) -> dict[str, Any]:
+        _, payload = self._pack(path)
+        rig_id = rig_id or payload.get("rig_id")
+        if not rig_id:
+            rigs = self._registry.rigs_for_pack(_rel(path), payload)
+            rig_id = rigs[0].rig_id if len(rigs) == 1 else None
+        params = self._registry.resolve(payload, rig_id) if rig_id else payload
+        return {"pack": _rel(path), "rig_id": rig_id, "params": params}
+
+    def query(self, filters: dict[str, str], glob: str | None) -> list[dict[str, Any]]:
+        with self._lock:
+            paths = list(self._pack_paths)
+        matches: list[dict[str, Any]] = []
+        for path in paths:
+            rel = _rel(path)
+            if glob and not fnmatchcase(rel, glob):
+                continue
+            try:
+                _, payload = self._pack(path)
+            except (OSError, ValueError):
+                continue
+            if all(str(payload.get(key)) == value for key, value in filters.items()):
+                matches.append(
+                    {
+                        "pack": rel,
+                        "launcher": payload.get("launcher"),
+                        "launcher_version": payload.get("launcher_version"),
+                        "description": payload.get("description"),
+                    }
+                )
+        return matches
+
+    # -- metrics -----------------------------------------------------------
+
+    def record(self, endpoint: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self._counts[endpoint] += 1
+            self._latencies[endpoint].append(elapsed_ms)
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            endpoints: dict[str, Any] = {}
+            for endpoint, samples in self._latencies.items():
+                ordered = sorted(samples)
+                p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+                endpoints[endpoint] = {
+                    "count": self._counts[endpoint],
+                    "p50_ms": round(statistics.median(ordered), 3),
+                    "p95_ms": round(p95, 3),
+                }
+            return {
+                "generation": self._generation,
+                "packs": len(self._pack_paths),
+                "cached_packs": len(self._packs),
+                "cached_results": len(self._results),
+                "endpoints": endpoints,
+            }
+
+
+def _make_handler(service: ValidationService):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args: Any) -> None:
+            return
+
+        def _send(self, status: int, body: Any) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _path_arg(self, value: Any) -> Path | None:
+            if not value:
+                return None
+            if not isinstance(value, str):
+                raise ValueError("path must be a string")
+            path = Path(value)
+            resolved = (path if path.is_absolute() else REPO_ROOT / path).resolve()
+            if not (resolved.is_relative_to(REPO_ROOT) or resolved.is_relative_to(service.packs_root)):
+                raise ValueError(f"path must be inside the repository: {value}")
+            return resolved
+
+        def _dispatch(self, method: str) -> None:
+            start = time.perf_counter()
+            url = urlparse(self.path)
+            endpoint = url.path.rstrip("/") or "/"
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            try:
+                if endpoint == "/health":
+                    status, body = 200, {"ok": True}
+                elif endpoint == "/validate" and method == "POST":
+                    length = int(self.headers.get("Content-Length") or 0)
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                    if not isinstance(request, dict):
+                        raise ValueError("request body must be a JSON object")
+                    status, body = 200, service.validate(
+                        path=self._path_arg(request.get("path")), payload=request.get("payload")
+                    )
+                elif endpoint == "/validate":
+                    status, body = 200, service.validate(path=self._path_arg(query.get("path")))
+                elif endpoint == "/resolve":
+                    path = self._path_arg(query.get("path"))
+                    if path is None:
+                        raise ValueError("path is required")
+                    status, body = 200, service.resolve(path, query.get("rig_id"))
+                elif endpoint == "/query":
+                    glob = query.pop("glob", None)
+                    status, body = 200, {"packs": service.query(query, glob)}
+                elif endpoint == "/metrics":
+                    status, body = 200, service.metrics()
+                else:
+                    status, body = 404, {"error": f"unknown endpoint {endpoint}"}
+            except FileNotFoundError as exc:
+                status, body = 404, {"error": str(exc)}
+            except (KeyError, ValueError) as exc:
+                status, body = 400, {"error": str(exc)}
+            except Exception as exc:
+                status, body = 500, {"error": str(exc)}
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if status != 404:
+                service.record(endpoint, elapsed_ms)
+            if isinstance(body, dict):
+                body.setdefault("elapsed_ms", round(elapsed_ms, 3))
+            self._send(status, body)
+
+        def do_GET(self) -> None:
+            self._dispatch("GET")
+
+        def do_POST(self) -> None:
+            self._dispatch("POST")
+
+    return Handler
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve pack validation, resolution and queries from a warm cache")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--root", type=str, default=str(REPO_ROOT / "packs"), help="Packs root")
+    parser.add_argument("--rigs", type=str, default=str(REPO_ROOT / "rigs"), help="Rig registry directory")
+    parser.add_argument("--poll-s", type=float, default=1.0, help="Schema/rig change polling interval")
+    args = parser.parse_args(argv)
+
+    service = ValidationService(packs_root=Path(args.root).resolve(), rigs_dir=Path(args.rigs).resolve())
+    stop = threading.Event()
+    watcher = threading.Thread(target=service.watch, args=(args.poll_s, stop), daemon=True)
+    watcher.start()
+    server = ThreadingHTTPServer((args.host, args.port), _make_handler(service))
+    print(f"Validation service on http://{args.host}:{server.server_address[1]} ({service.metrics()['packs']} packs)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,297 @@
+"""Exposure and bandwidth budget for behavior-video packs (`behavior_video_cameras`).
+
+For every declared camera the exposure (microseconds) and frame rate (Hz) are read from
+`script_parameters` (`ExposureTime<name>` / `FrameRate<name>` unless overridden) and
+checked against
+
+    exposure_us + readout_time_us <= 1e6 / frame_rate        (otherwise frames are dropped)
+
+The written bandwidth per camera is
+
+    width * height * bit_depth / 8 * frame_rate / compression_ratio   [bytes/s]
+
+with a nominal compression ratio per codec unless `compression_ratio` is measured. The
+aggregate across cameras must fit in `rig_throughput.disk_write_mb_per_s *
+rig_throughput.usable_fraction` of every rig running the pack; the throughput comes from
+the rig registry (`rigs/<rig_id>.json`, see rig_registry.py), so `check_video_throughput`
+runs over the whole catalog. MB here is 10^6 bytes, as in disk_space_estimator.py.
+
+Values that are still placeholders (e.g. `{rig_param:...}`) or `null` (not yet confirmed
+on the camera or rig) cannot be checked and are reported as notes rather than problems;
+`unconfirmed_video_values` lists them for validate.py.
+
+This module is dependency-free (stdlib only).
+
+Run from repo root:
+    python ./tooling/video_budget.py
+    python ./tooling/video_budget.py --param ./packs/projects/predictive_processing/behavior-videos/shared_cameras.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from repo_paths import REPO_ROOT, rel_path
+from rig_registry import RigRegistry
+
+
+DEFAULT_RIGS_DIR = REPO_ROOT / "rigs"
+
+BYTES_PER_MB = 1_000_000
+
+# Nominal raw:encoded ratios for mono behavior video; conservative on purpose.
+CODEC_COMPRESSION = {"raw": 1.0, "ffv1": 2.0, "mjpeg": 8.0, "h264": 20.0, "h265": 30.0}
+
+# Camera fields that are null until confirmed on the camera.
+CAMERA_FIELDS = ("width", "height", "bit_depth", "codec")
+
+
+@dataclass(frozen=True)
+class CameraBudget:
+    name: str
+    exposure_us: float | None
+    frame_rate_hz: float | None
+    frame_period_us: float | None
+    mb_per_s: float | None
+
+
+@dataclass
+class VideoBudget:
+    cameras: list[CameraBudget] = field(default_factory=list)
+    aggregate_mb_per_s: float = 0.0
+    budget_mb_per_s: float | None = None
+    problems: list[str] = field(default_factory=list)
+    notes: list[str] = field(default_factory=list)
+
+
+def _number(value: Any) -> float | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip())
+    except ValueError:
+        return None
+
+
+def _positive(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+def _is_placeholder(value: Any) -> bool:
+    return isinstance(value, str) and "{" in value
+
+
+def analyze_video_budget(payload: dict[str, Any], throughput: dict[str, Any] | None = None) -> VideoBudget:
+    """Per-camera exposure and bandwidth; the aggregate is checked against `throughput` when given."""
+
+    budget = VideoBudget()
+    cameras = payload.get("behavior_video_cameras")
+    if not cameras:
+        return budget
+    if not isinstance(cameras, list):
+        budget.problems.append("behavior_video_cameras must be a list")
+        return budget
+    script_parameters = payload.get("script_parameters") if isinstance(payload.get("script_parameters"), dict) else {}
+
+    seen: set[str] = set()
+    for idx, camera in enumerate(cameras):
+        if not isinstance(camera, dict) or not camera.get("name"):
+            budget.problems.append(f"behavior_video_cameras[{idx}] must be an object with a name")
+            continue
+        name = str(camera["name"])
+        if name in seen:
+            budget.problems.append(f"camera {name}: duplicate name")
+        seen.add(name)
+
+        exposure_key = camera.get("exposure_param") or f"ExposureTime{name}"
+        rate_key = camera.get("frame_rate_param") or f"FrameRate{name}"
+        exposure = _number(script_parameters.get(exposure_key))
+        rate = _number(script_parameters.get(rate_key))
+        if exposure_key not in script_parameters:
+            budget.problems.append(f"camera {name}: script_parameters.{exposure_key} is missing")
+        elif exposure is None:
+            budget.notes.append(f"camera {name}: {exposure_key}={script_parameters[exposure_key]!r} not checked")
+        if rate_key not in script_parameters:
+            budget.problems.append(f"camera {name}: script_parameters.{rate_key} is missing")
+        elif rate is None:
+            budget.notes.append(f"camera {name}: {rate_key}={script_parameters[rate_key]!r} not checked")
+        elif rate <= 0:
+            budget.problems.append(f"camera {name}: {rate_key} must be positive, got {rate:g}")
+            rate = None
+
+        period = 1e6 / rate if rate else None
+        readout = _number(camera.get("readout_time_us")) or 0.0
+        if exposure is not None and period is not None and exposure + readout > period:
+            budget.problems.append(
+                f"camera {name}: exposure {exposure:g} us + readout {readout:g} us exceeds the "
+                f"{period:,.0f} us frame period at {rate:g} Hz"
+            )
+
+        bit_depth = camera.get("bit_depth", 8)
+        codec = camera.get("codec", "raw")
+        ratio = camera.get("compression_ratio")
+        if ratio is None and codec is not None:
+            ratio = CODEC_COMPRESSION.get(str(codec), 1.0)
+        # null = declared but not confirmed on the camera yet.
+        unconfirmed = [key for key in CAMERA_FIELDS if key in camera and camera[key] is None]
+        usable = not unconfirmed
+        if unconfirmed:
+            budget.notes.append(f"camera {name}: {', '.join(unconfirmed)} not confirmed yet; bandwidth not checked")
+        if _is_placeholder(bit_depth):
+            budget.notes.append(f"camera {name}: bit_depth={bit_depth!r} not checked")
+            usable = False
+        elif bit_depth is not None and (not _positive(bit_depth) or not isinstance(bit_depth, int)):
+            budget.problems.append(f"camera {name}: bit_depth must be a positive integer, got {bit_depth!r}")
+            usable = False
+        if _is_placeholder(ratio):
+            budget.notes.append(f"camera {name}: compression_ratio={ratio!r} not checked")
+            usable = False
+        elif ratio is not None and not _positive(ratio):
+            budget.problems.append(f"camera {name}: compression_ratio must be a positive number, got {ratio!r}")
+            usable = False
+
+        mb_per_s = None
+        width, height = camera.get("width"), camera.get("height")
+        if usable and rate is not None and _positive(width) and _positive(height):
+            bytes_per_frame = width * height * bit_depth / 8
+            mb_per_s = bytes_per_frame * rate / ratio / BYTES_PER_MB
+            budget.aggregate_mb_per_s += mb_per_s
+        budget.cameras.append(CameraBudget(name, exposure, rate, period, mb_per_s))
+
+    if throughput is not None:
+        budget.problems += throughput_problems(budget, throughput)
+    return budget
+
+
+def throughput_problems(budget: VideoBudget, throughput: dict[str, Any]) -> list[str]:
+    """Per-camera and aggregate bandwidth against one rig's disk; sets `budget.budget_mb_per_s`.
+
+    A `null` disk_write_mb_per_s is not measured yet: nothing is checked.
+    """
+
+    if throughput.get("disk_write_mb_per_s") is None:
+        return []
+    if not _positive(throughput.get("disk_write_mb_per_s")):
+        return [f"rig_throughput.disk_write_mb_per_s must be a positive number, got {throughput.get('disk_write_mb_per_s')!r}"]
+    fraction = throughput.get("usable_fraction", 0.7)
+    if not _positive(fraction) or fraction > 1:
+        return [f"rig_throughput.usable_fraction must be in (0, 1], got {fraction!r}"]
+    budget.budget_mb_per_s = float(throughput["disk_write_mb_per_s"]) * fraction
+    problems: list[str] = []
+    for camera in budget.cameras:
+        if camera.mb_per_s is not None and camera.mb_per_s > budget.budget_mb_per_s:
+            problems.append(
+                f"camera {camera.name}: {camera.mb_per_s:,.1f} MB/s alone exceeds the "
+                f"{budget.budget_mb_per_s:,.1f} MB/s disk budget"
+            )
+    if budget.aggregate_mb_per_s > budget.budget_mb_per_s:
+        problems.append(
+            f"aggregate video bandwidth {budget.aggregate_mb_per_s:,.1f} MB/s exceeds the "
+            f"{budget.budget_mb_per_s:,.1f} MB/s disk budget"
+        )
+    return problems
+
+
+def check_video_budget(payload: dict[str, Any]) -> list[str]:
+    """Per-pack rules for behavior_video_cameras (exposure, camera fields); returns a list of problems."""
+
+    return analyze_video_budget(payload).problems
+
+
+def check_video_throughput(loaded: Iterable[tuple[Path, dict[str, Any]]], registry: RigRegistry) -> list[str]:
+    """Catalog pass: every video pack x covering rig with a rig_throughput; returns a list of problems."""
+
+    problems: list[str] = []
+    for path, payload in loaded:
+        if not isinstance(payload, dict) or not payload.get("behavior_video_cameras"):
+            continue
+        rel = rel_path(path)
+        budget = analyze_video_budget(payload)
+        for rig in registry.rigs_for_pack(rel, payload):
+            if rig.throughput is not None:
+                problems += [f"{rel} on rig {rig.rig_id!r}: {p}" for p in throughput_problems(budget, rig.throughput)]
+    return problems
+
+
+def unconfirmed_video_values(loaded: Iterable[tuple[Path, dict[str, Any]]], registry: RigRegistry) -> list[str]:
+    """Packs with null camera fields and rigs with a null disk write rate; returns warnings."""
+
+    warnings: list[str] = []
+    unmeasured: set[str] = set()
+    for path, payload in loaded:
+        if not isinstance(payload, dict) or not payload.get("behavior_video_cameras"):
+            continue
+        cameras = payload["behavior_video_cameras"] if isinstance(payload["behavior_video_cameras"], list) else []
+        pending = [
+            str(camera.get("name"))
+            for camera in cameras
+            if isinstance(camera, dict) and any(key in camera and camera[key] is None for key in CAMERA_FIELDS)
+        ]
+        if pending:
+            warnings.append(f"{rel_path(path)}: cameras {pending} have fields not confirmed yet; their bandwidth is not checked")
+        for rig in registry.rigs_for_pack(rel_path(path), payload):
+            if rig.throughput is not None and rig.throughput.get("disk_write_mb_per_s") is None:
+                unmeasured.add(rig.rig_id)
+    warnings += [
+        f"rig {rig_id!r}: rig_throughput.disk_write_mb_per_s has no value yet; video bandwidth of its packs is not checked"
+        for rig_id in sorted(unmeasured)
+    ]
+    return warnings
+
+
+def _format(path: Path, budget: VideoBudget, rig_id: str | None) -> list[str]:
+    status = "FAIL" if budget.problems else "OK  "
+    lines = [f"{status} {rel_path(path)}" + (f" on rig {rig_id}" if rig_id else "")]
+    for camera in budget.cameras:
+        exposure = f"{camera.exposure_us:,.0f} us" if camera.exposure_us is not None else "?"
+        period = f"{camera.frame_period_us:,.0f} us" if camera.frame_period_us is not None else "?"
+        rate = f"{camera.mb_per_s:,.1f} MB/s" if camera.mb_per_s is not None else "?"
+        lines.append(f"    {camera.name:<8} exposure {exposure:>10} / period {period:>10}  {rate:>12}")
+    budget_text = f" of {budget.budget_mb_per_s:,.1f} MB/s budget" if budget.budget_mb_per_s is not None else ""
+    lines.append(f"    total {budget.aggregate_mb_per_s:,.1f} MB/s{budget_text}")
+    lines.extend(f"    - {problem}" for problem in budget.problems)
+    lines.extend(f"    note: {note}" for note in budget.notes)
+    return lines
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Report exposure and bandwidth budgets for behavior-video packs")
+    parser.add_argument("--root", type=str, default=str(REPO_ROOT / "packs"), help="Packs root to scan")
+    parser.add_argument("--param", type=str, default=None, help="Report a single pack")
+    parser.add_argument("--rigs", type=str, default=str(DEFAULT_RIGS_DIR), help="Rig registry providing rig_throughput")
+    args = parser.parse_args(argv)
+
+    registry = RigRegistry.load(Path(args.rigs).resolve())
+    paths = [Path(args.param).resolve()] if args.param else sorted(Path(args.root).resolve().rglob("*.json"))
+    failures = 0
+    reported = 0
+    for path in paths:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            continue
+        if not isinstance(payload, dict) or not payload.get("behavior_video_cameras"):
+            continue
+        rigs = [rig for rig in registry.rigs_for_pack(rel_path(path), payload) if rig.throughput is not None]
+        for rig in rigs or [None]:
+            budget = analyze_video_budget(payload, rig.throughput if rig else None)
+            if rig is None:
+                budget.notes.append("no rig in the registry with a rig_throughput covers this pack; aggregate bandwidth not checked")
+            elif rig.throughput.get("disk_write_mb_per_s") is None:
+                budget.notes.append(f"rig {rig.rig_id}: disk_write_mb_per_s not measured yet; aggregate bandwidth not checked")
+            reported += 1
+            failures += 1 if budget.problems else 0
+            print("\n".join(_format(path, budget, rig.rig_id if rig else None)))
+    if not reported:
+        print("No packs declare behavior_video_cameras.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())